@@ -0,0 +1,68 @@
+import os
+import json
+from typing import List
+
+APPLICATION_INFO_FILE = "软件申请信息.json"
+DEVELOPMENT_INFO_FILE = "软件开发信息.json"
+CODE_MATERIAL_FILE = "程序鉴别材料.pdf"
+TRIMMED_MATERIAL_DIR = "截取材料"
+
+CLASS_ITEMS = ["应用软件", "嵌入式软件", "中间件", "操作系统"]
+
+
+def applicationInfo(acquisition: str, fullName: str, abbreviation: str, version: str, scope: str) -> dict:
+    return {
+        "权利取得方式": acquisition,
+        "软件全称": fullName,
+        "软件简称": abbreviation,
+        "版本号": version,
+        "权利范围": scope,
+    }
+
+
+def developmentInfo(category: str, origin: str, devForm: str, finishDate: str, publishState: str, owner: str) -> dict:
+    return {
+        "软件分类": category,
+        "软件说明": origin,
+        "开发方式": devForm,
+        "开发完成日期": finishDate,
+        "发表状态": publishState,
+        "著作权人": owner,
+    }
+
+
+def checkApplicationInfo(info: dict) -> List[str]:
+    errors = []
+    if info["权利取得方式"] != "原始取得":
+        errors.append("请检查【权利取得方式】是否填写正确！")
+    if not info["软件全称"]:
+        errors.append("请检查【软件全称】是否填写正确！")
+    elif len(info["软件简称"]) > len(info["软件全称"]):
+        errors.append("软件简称字数多于软件全称，可能发生补正！")
+    if not info["版本号"]:
+        errors.append("请检查【版本号】是否填写正确！")
+    if info["权利范围"] != "全部权利":
+        errors.append("请检查【权利范围】是否填写正确！")
+    return errors
+
+
+def checkDevelopmentInfo(info: dict) -> List[str]:
+    errors = []
+    if info["软件分类"] not in CLASS_ITEMS:
+        errors.append("请检查【软件分类】是否填写正确！")
+    if info["软件说明"] != "原创":
+        errors.append("请检查【软件说明】是否填写正确！")
+    if info["开发方式"] != "单独开发":
+        errors.append("请检查【开发方式】是否填写正确！")
+    if not info["开发完成日期"]:
+        errors.append("请检查【开发完成日期】是否填写正确！")
+    if info["发表状态"] != "未发表":
+        errors.append("请检查【发表状态】是否填写正确！")
+    return errors
+
+
+def writeInfoFile(directory: str, fileName: str, info: dict) -> str:
+    path = os.path.join(directory, fileName)
+    with open(path, "w+", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=4)
+    return path
@@ -0,0 +1,33 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Coroutine
+
+
+class AsyncRunner:
+    """ Runs an asyncio event loop on a daemon thread so coroutines never block the Qt event loop """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="AsyncRunner", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def call(self, callback, *args) -> None:
+        self.loop.call_soon_threadsafe(callback, *args)
+
+
+_runner = None
+
+
+def runner() -> AsyncRunner:
+    global _runner
+    if _runner is None:
+        _runner = AsyncRunner()
+    return _runner
@@ -0,0 +1,165 @@
+import os
+import re
+from typing import Callable, Dict, Iterator, List, Tuple
+
+BINARY = "binary"
+MINIFIED = "minified"
+GENERATED = "generated"
+VENDORED = "vendored"
+
+CATEGORY_LABELS = {
+    BINARY: "二进制文件",
+    MINIFIED: "压缩代码",
+    GENERATED: "自动生成",
+    VENDORED: "第三方代码",
+}
+
+PREFIX_SIZE = 8192
+POOL_THRESHOLD = 256
+CHUNK_SIZE = 256
+MINIFIED_MEAN_LINE = 300
+MINIFIED_MAX_LINE = 2000
+CONTROL_RATIO = 0.1
+
+VENDORED_DIRS = {
+    "node_modules", "bower_components", "vendor", "vendors", "third_party", "thirdparty",
+    "third-party", "external", "site-packages", "venv", ".venv", "Pods", "Carthage",
+}
+SKIPPED_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules"}
+LOCK_FILES = {
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock",
+    "Cargo.lock", "composer.lock", "Gemfile.lock", "go.sum", "uv.lock",
+}
+GENERATED_SUFFIXES = (
+    "_pb2.py", "_pb2_grpc.py", ".pb.go", ".pb.cc", ".pb.h", ".g.dart", ".freezed.dart",
+    ".designer.cs", ".g.cs", "_generated.go", "_generated.py", "_generated.ts",
+)
+MINIFIED_SUFFIXES = (".min.js", ".min.css", ".min.mjs", "-min.js", ".bundle.js")
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".pdf", ".zip", ".gz", ".7z", ".rar",
+    ".exe", ".dll", ".so", ".dylib", ".a", ".o", ".obj", ".class", ".jar", ".pyc", ".wasm",
+    ".mp3", ".mp4", ".wav", ".avi", ".mov", ".ttf", ".otf", ".woff", ".woff2", ".db", ".sqlite",
+}
+
+_generatedRe = re.compile(
+    rb"^[ \t]*(?:#|//|/\*|\*|<!--|--|;|%)[^\n]*"
+    rb"(?:generated by|do not edit|do not modify|auto-?generated|@generated|this file was generated)",
+    re.IGNORECASE | re.MULTILINE
+)
+_controlBytes = bytes(set(range(32)) - {8, 9, 10, 12, 13, 27})
+
+
+def classifyName(name: str) -> str:
+    lowered = name.lower()
+    if name in LOCK_FILES or lowered.endswith(GENERATED_SUFFIXES):
+        return GENERATED
+    if lowered.endswith(MINIFIED_SUFFIXES):
+        return MINIFIED
+    if os.path.splitext(lowered)[1] in BINARY_EXTENSIONS:
+        return BINARY
+    return ""
+
+
+def classifyPrefix(data: bytes) -> str:
+    if not data:
+        return ""
+    if b"\0" in data or len(data.translate(None, _controlBytes)) < len(data) * (1 - CONTROL_RATIO):
+        return BINARY
+    if _generatedRe.search(data, 0, 2048):
+        return GENERATED
+
+    lines = data.split(b"\n")
+    complete = lines[:-1] if len(lines) > 1 else lines
+    longest = max(len(line) for line in complete)
+    if longest > MINIFIED_MAX_LINE or (len(data) >= 1024 and len(data) / len(lines) > MINIFIED_MEAN_LINE):
+        return MINIFIED
+    return ""
+
+
+def classifyFile(path: str) -> str:
+    category = classifyName(os.path.basename(path))
+    if category:
+        return category
+    try:
+        with open(path, "rb") as f:
+            return classifyPrefix(f.read(PREFIX_SIZE))
+    except OSError:
+        return ""
+
+
+def _classifyFiles(paths: List[str]) -> List[str]:
+    return [classifyFile(path) for path in paths]
+
+
+def walkProject(root: str, vendored: List[str]) -> Iterator[Tuple[str, int, int]]:
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in VENDORED_DIRS:
+                                vendored.append(entry.path)
+                            elif entry.name not in SKIPPED_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def classifyProject(
+    root: str,
+    workers: int = None,
+    progress: Callable[[Tuple[int, int]], None] = None,
+    cancelled: Callable[[], bool] = None) -> Dict[str, str]:
+    """ Returns {path: category} for every file or directory that is not ordinary source """
+    vendored = []
+    pending = list(walkProject(root, vendored))
+    results = {}
+    done = 0
+    if progress:
+        progress((done, len(pending)))
+
+    chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+    if len(pending) < POOL_THRESHOLD:
+        classified = (_classifyFiles([path for path, _, _ in chunk]) for chunk in chunks)
+        executor = None
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        classified = executor.map(_classifyFiles, [[path for path, _, _ in chunk] for chunk in chunks])
+
+    try:
+        for chunk, categories in zip(chunks, classified):
+            for (path, _, _), category in zip(chunk, categories):
+                results[path] = category
+            done += len(chunk)
+            if progress:
+                progress((done, len(pending)))
+            if cancelled and cancelled():
+                break
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    flagged = {path: category for path, category in results.items() if category}
+    flagged.update(dict.fromkeys(vendored, VENDORED))
+    return flagged
+
+
+def categoryFor(path: str, classification: Dict[str, str], root: str = "") -> str:
+    while path and path != root:
+        if path in classification:
+            return classification[path]
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return ""
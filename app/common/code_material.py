@@ -0,0 +1,156 @@
+import os
+from collections import deque
+from itertools import islice
+from typing import Callable, Dict, Iterator, List
+
+from app.common.classifier import SKIPPED_DIRS, categoryFor
+from app.common.languages import languageForPath
+from app.common.pdf_writer import PdfWriter
+
+LINES_PER_PAGE = 50
+HEAD_PAGES = 30
+TAIL_PAGES = 30
+MAX_COLUMNS = 80
+BLOCK_SIZE = 64 * 1024
+
+
+def orderedSourceFiles(root: str, classification: Dict[str, str] = None) -> List[str]:
+    files = []
+    for current, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SKIPPED_DIRS)
+        files.extend(os.path.join(current, name) for name in sorted(names) if languageForPath(name))
+    if classification:
+        files = [path for path in files if not categoryFor(path, classification, root)]
+    return files
+
+
+def wrapLine(line: str) -> List[str]:
+    line = "".join(c for c in line.expandtabs(4) if c.isprintable())
+    if not line.strip():
+        return []
+
+    parts, start, width = [], 0, 0
+    for i, c in enumerate(line):
+        w = 1 if ord(c) < 128 else 2
+        if width + w > MAX_COLUMNS:
+            parts.append(line[start:i])
+            start, width = i, 0
+        width += w
+    parts.append(line[start:])
+    return parts
+
+
+def forwardLines(path: str) -> Iterator[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                yield from wrapLine(line.rstrip("\r\n"))
+    except OSError:
+        return
+
+
+def backwardLines(path: str) -> Iterator[str]:
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            size = min(BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size) + remainder
+            lines = chunk.split(b"\n")
+            remainder = lines.pop(0)
+            for raw in reversed(lines):
+                yield from reversed(wrapLine(raw.decode("utf-8", errors="replace").rstrip("\r")))
+        yield from reversed(wrapLine(remainder.decode("utf-8", errors="replace").rstrip("\r")))
+
+
+def generateCodeMaterial(
+    root: str,
+    outputPath: str,
+    title: str = "",
+    classification: Dict[str, str] = None,
+    progress: Callable[[int], None] = None,
+    cancelled: Callable[[], bool] = None) -> str:
+    files = orderedSourceFiles(root, classification)
+    tmpPath = outputPath + ".tmp"
+    try:
+        _writeMaterial(files, tmpPath, title, progress, cancelled)
+    except BaseException:
+        if os.path.exists(tmpPath):
+            os.remove(tmpPath)
+        raise
+
+    os.replace(tmpPath, outputPath)
+    return outputPath
+
+
+def _writeMaterial(files: List[str], path: str, title: str, progress: Callable, cancelled: Callable) -> None:
+    headLimit = HEAD_PAGES * LINES_PER_PAGE
+    tailLimit = TAIL_PAGES * LINES_PER_PAGE
+
+    with open(path, "wb") as f:
+        writer = PdfWriter(f)
+        pageNumber = 0
+
+        def flush(page: List[str]) -> None:
+            nonlocal pageNumber
+            pageNumber += 1
+            writer.addPage(page, title, str(pageNumber))
+            if progress:
+                progress(pageNumber)
+
+        page = []
+        written = 0
+        headFile = len(files)
+        headLinesInFile = 0
+        for index, filePath in enumerate(files):
+            if cancelled and cancelled():
+                raise InterruptedError("cancelled")
+            headLinesInFile = 0
+            for line in forwardLines(filePath):
+                if written == headLimit:
+                    break
+                page.append(line)
+                written += 1
+                headLinesInFile += 1
+                if len(page) == LINES_PER_PAGE:
+                    flush(page)
+                    page = []
+            if written == headLimit:
+                headFile = index
+                break
+
+        tail = deque(maxlen=tailLimit)
+        if headFile < len(files):
+            for index in range(len(files) - 1, headFile - 1, -1):
+                if cancelled and cancelled():
+                    raise InterruptedError("cancelled")
+                if index == headFile:
+                    remaining = tailLimit - len(tail)
+                    # the file holding the end of the head is read once more, keeping only what the tail needs
+                    if remaining:
+                        lines = deque(islice(forwardLines(files[index]), headLinesInFile, None), maxlen=remaining)
+                        tail.extendleft(reversed(lines))
+                    break
+                for line in backwardLines(files[index]):
+                    if len(tail) == tailLimit:
+                        break
+                    tail.appendleft(line)
+                if len(tail) == tailLimit:
+                    break
+
+        for line in tail:
+            page.append(line)
+            if len(page) == LINES_PER_PAGE:
+                flush(page)
+                page = []
+        if page:
+            flush(page)
+
+        writer.close()
@@ -0,0 +1,76 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict
+
+from app.common.paths import CACHE_DIR
+from app.common.project_index import ProjectIndex
+
+DEFAULT_BUDGET = 16 * 1024 * 1024
+
+
+def projectFingerprint(root: str, context: Dict[str, str], sourceFingerprint: str = None) -> str:
+    """ Combines the form context with the project's source digest, taken from its index when not given """
+    digest = hashlib.sha256(json.dumps(context, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    if root:
+        if sourceFingerprint is None:
+            with ProjectIndex(root) as index:
+                index.update()
+                sourceFingerprint = index.fingerprint()
+        digest.update(sourceFingerprint.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CompletionCache:
+    """ Disk-backed LRU of model completions, bounded by the total size of stored text """
+
+    def __init__(self, path: str = os.path.join(CACHE_DIR, "completions.sqlite"), budget: int = DEFAULT_BUDGET) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed)")
+        self.db.commit()
+
+    @staticmethod
+    def makeKey(model: str, baseUrl: str, promptVersion: int, fingerprint: str, field: str) -> str:
+        return hashlib.sha256(json.dumps([model, baseUrl, promptVersion, fingerprint, field]).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str:
+        with self.lock:
+            row = self.db.execute("SELECT value FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE completions SET accessed = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO completions (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()))
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+            while total > self.budget:
+                row = self.db.execute("SELECT key, size FROM completions ORDER BY accessed LIMIT 1").fetchone()
+                if row is None:
+                    break
+                self.db.execute("DELETE FROM completions WHERE key = ?", (row[0],))
+                total -= row[1]
+            self.db.commit()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.db.execute("DELETE FROM completions")
+            self.db.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
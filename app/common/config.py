@@ -7,6 +7,9 @@ class Config(qfw.QConfig):
     base_url = qfw.ConfigItem("API", "BaseUrl", "https://apis.iflow.cn/v1")
     model_name = qfw.ConfigItem("API", "ModelName", "qwen-max")
     api_key = qfw.ConfigItem("API", "ApiKey", "sk-xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+    requests_per_second = qfw.RangeConfigItem("API", "RequestsPerSecond", 2, qfw.RangeValidator(1, 50))
+    tokens_per_minute = qfw.RangeConfigItem("API", "TokensPerMinute", 60000, qfw.RangeValidator(1000, 10000000))
+    workspace_folder = qfw.ConfigItem("Folders", "Workspace", "workspaces")
     theme = qfw.OptionsConfigItem(
         "UI", "Theme", qfw.Theme.AUTO, qfw.OptionsValidator(qfw.Theme), serializer=qfw.EnumSerializer(qfw.Theme))
 
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import threading
+
+DEBOUNCE = 0.5
+MAX_DELAY = 5.0
+
+
+def writeText(path: str, text: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmpPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpPath, path)
+    except BaseException:
+        if os.path.exists(tmpPath):
+            os.remove(tmpPath)
+        raise
+
+
+def writeJson(path: str, data, indent: int = 2) -> None:
+    writeText(path, json.dumps(data, ensure_ascii=False, indent=indent, separators=None if indent else (",", ":")))
+
+
+class DraftStore:
+    """ Form draft kept in memory and written to disk by a debounced background writer """
+
+    def __init__(
+        self,
+        path: str,
+        debounce: float = DEBOUNCE,
+        maxDelay: float = MAX_DELAY,
+        indent: int = 2) -> None:
+        self.path = path
+        self.indent = indent
+        self.debounce = debounce
+        self.maxDelay = maxDelay
+        self.data = {}
+        self.loaded = False
+        self._version = 0
+        self._written = 0
+        self._firstChange = None
+        self._lastChange = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._writeLock = threading.Lock()
+        self._thread = None
+
+    def load(self) -> dict:
+        """ Reads the file, loaded stays False when it is missing, unreadable or not a JSON object """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        with self._condition:
+            self.loaded = isinstance(data, dict)
+            self.data = data if self.loaded else {}
+            self._version = self._written = 0
+        return self.data
+
+    def get(self, section: str) -> dict:
+        with self._condition:
+            return dict(self.data.get(section) or {})
+
+    def update(self, section: str, values) -> None:
+        """ Records a section and returns at once, the write happens on the writer thread """
+        with self._condition:
+            if self._closed or self.data.get(section) == values:
+                return
+            self.data[section] = values
+            self._schedule()
+
+    def remove(self, section: str) -> None:
+        with self._condition:
+            if self._closed or section not in self.data:
+                return
+            del self.data[section]
+            self._schedule()
+
+    def _schedule(self) -> None:
+        self._version += 1
+        now = time.monotonic()
+        self._lastChange = now
+        if self._firstChange is None:
+            self._firstChange = now
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="DraftWriter", daemon=True)
+            self._thread.start()
+        self._condition.notify()
+
+    def clear(self) -> None:
+        with self._condition:
+            self.data = {}
+            self._version += 1
+            self._firstChange = self._lastChange = None
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._version == self._written:
+                        self._condition.wait()
+                        continue
+                    now = time.monotonic()
+                    if self._lastChange is None:
+                        self._firstChange = self._lastChange = now
+                    due = min(self._lastChange + self.debounce, self._firstChange + self.maxDelay)
+                    if now >= due:
+                        break
+                    self._condition.wait(due - now)
+                if self._closed:
+                    return
+                version, snapshot = self._snapshot()
+            self._write(version, snapshot)
+
+    def _snapshot(self) -> tuple:
+        self._firstChange = self._lastChange = None
+        separators = None if self.indent else (",", ":")
+        return self._version, json.dumps(self.data, ensure_ascii=False, indent=self.indent, separators=separators)
+
+    def _write(self, version: int, snapshot: str) -> None:
+        with self._writeLock:
+            if version <= self._written:
+                return
+            try:
+                writeText(self.path, snapshot)
+            except OSError:
+                return
+            with self._condition:
+                self._written = version
+
+    def flush(self) -> None:
+        """ Writes any pending change synchronously """
+        with self._condition:
+            if self._version == self._written:
+                return
+            version, snapshot = self._snapshot()
+        self._write(version, snapshot)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
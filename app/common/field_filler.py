@@ -0,0 +1,83 @@
+import re
+import json
+from typing import Callable, Dict, List
+
+from app.common.llm_client import ChatClient
+
+PROMPT_VERSION = 1
+
+# field key -> (title, character limit)
+FIELDS = {
+    "devHardwareEnv": ("开发的硬件环境", 50),
+    "runHardwareEnv": ("运行的硬件环境", 50),
+    "devOS": ("开发该软件的操作系统", 50),
+    "devEnvTool": ("软件开发环境 / 开发工具", 50),
+    "runPlatformOS": ("该软件的运行平台 / 操作系统", 50),
+    "runEnvSoftware": ("软件运行支撑环境 / 支持软件", 50),
+    "devLanguage": ("编程语言", 120),
+    "devTarget": ("开发目的", 50),
+    "targetDomain": ("面向领域 / 行业", 50),
+    "mainFunction": ("软件的主要功能", 200),
+    "features": ("软件的技术特点", 100),
+}
+
+# fields whose quality depends on knowing what the project actually does
+DIGEST_FIELDS = {"devTarget", "targetDomain", "mainFunction", "features"}
+
+SYSTEM_PROMPT = (
+    "你是软件著作权登记材料的撰写助手。请根据提供的软件信息，"
+    "为登记表中的指定栏目撰写内容。只输出栏目内容本身，不要输出栏目名称、引号或解释。"
+)
+
+BATCH_PROMPT = SYSTEM_PROMPT + "需要填写多个栏目时，只输出一个 JSON 对象，键为栏目编号，值为栏目内容，不要输出其他文字。"
+
+
+def buildMessages(field: str, context: Dict[str, str]) -> List[dict]:
+    title, limit = FIELDS[field]
+    info = "\n".join(f"{key}：{value}" for key, value in context.items() if value)
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"软件信息：\n{info}\n\n请填写【{title}】，不超过{limit}字。"},
+    ]
+
+
+def buildBatchMessages(fields: List[str], context: Dict[str, str]) -> List[dict]:
+    info = "\n".join(f"{key}：{value}" for key, value in context.items() if value)
+    items = "\n".join(f"- {field}：{FIELDS[field][0]}，不超过{FIELDS[field][1]}字" for field in fields)
+    return [
+        {"role": "system", "content": BATCH_PROMPT},
+        {"role": "user", "content": f"软件信息：\n{info}\n\n请填写以下栏目（编号：栏目）：\n{items}"},
+    ]
+
+
+def parseBatch(text: str, fields: List[str]) -> Dict[str, str]:
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match is None:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        field: data[field].strip() for field in fields
+        if isinstance(data.get(field), str) and data[field].strip()
+    }
+
+
+async def fillField(
+    client: ChatClient,
+    field: str,
+    context: Dict[str, str],
+    onToken: Callable[[str, str], None]) -> str:
+    tokens = []
+    async for token in client.stream(buildMessages(field, context), temperature=0.3):
+        tokens.append(token)
+        onToken(field, token)
+    return "".join(tokens).strip()
+
+
+async def fillFields(client: ChatClient, fields: List[str], context: Dict[str, str]) -> Dict[str, str]:
+    text = await client.complete(buildBatchMessages(fields, context), temperature=0.3)
+    return parseBatch(text, fields)
@@ -0,0 +1,77 @@
+from functools import lru_cache
+from typing import Callable, Iterator, List, Tuple
+
+from pygments import format, lex
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_for_filename, TextLexer
+from pygments.styles import get_style_by_name
+from pygments.util import ClassNotFound
+
+CHECK_INTERVAL = 2048
+
+
+class HighlightCancelled(Exception):
+    pass
+
+
+def _checkedTokens(tokens: Iterator, cancelled: Callable[[], bool]) -> Iterator:
+    for i, token in enumerate(tokens):
+        if i % CHECK_INTERVAL == 0 and cancelled():
+            raise HighlightCancelled()
+        yield token
+
+
+def highlightFile(
+    path: str,
+    style: str,
+    progress: Callable = None,
+    cancelled: Callable[[], bool] = None) -> str:
+    cancelled = cancelled or (lambda: False)
+    if cancelled():
+        raise HighlightCancelled()
+
+    with open(path, encoding="utf-8") as file:
+        content = file.read()
+
+    if cancelled():
+        raise HighlightCancelled()
+
+    lexer = lexerForPath(path)
+    formatter = HtmlFormatter(style=style, noclasses=True, nobackground=True, cssstyles="line-height: 100%")
+    return format(_checkedTokens(lex(content, lexer), cancelled), formatter)
+
+
+def lexerForPath(path: str):
+    try:
+        return get_lexer_for_filename(path, stripnl=False)
+    except ClassNotFound:
+        return TextLexer(stripnl=False)
+
+
+@lru_cache(maxsize=8)
+def tokenFormats(style: str) -> dict:
+    styleClass = get_style_by_name(style)
+    return {ttype: styleClass.style_for_token(ttype) for ttype, _ in styleClass}
+
+
+def highlightLines(lines: List[str], lexer, style: str) -> List[List[Tuple[str, dict]]]:
+    formats = tokenFormats(style)
+    result = [[]]
+    for ttype, value in lexer.get_tokens("\n".join(lines) + "\n"):
+        while ttype not in formats:
+            ttype = ttype.parent
+        parts = value.split("\n")
+        for i, part in enumerate(parts):
+            if i:
+                result.append([])
+            if part:
+                result[-1].append((part, formats[ttype]))
+    return result[:len(lines)]
+
+
+def warmUp(extensions=(".py", ".js", ".json", ".html", ".css", ".md", ".sh")) -> None:
+    for ext in extensions:
+        lexerForPath("file" + ext)
+    for style in ("default", "monokai"):
+        HtmlFormatter(style=style)
+        tokenFormats(style)
@@ -0,0 +1,143 @@
+import os
+import sys
+import errno
+import shutil
+from typing import Callable, List, Tuple
+
+CHUNK_SIZE = 8 * 1024 * 1024
+FICLONE = 0x40049409
+
+
+class IngestCancelled(Exception):
+    pass
+
+
+def _walkSource(src: str) -> Tuple[List[Tuple[str, str]], int]:
+    if not os.path.isdir(src):
+        return [(src, "")], os.path.getsize(src)
+
+    files, total = [], 0
+    for dirPath, dirNames, fileNames in os.walk(src):
+        relDir = os.path.relpath(dirPath, src)
+        files.append((dirPath, relDir if relDir != "." else ""))
+        for name in fileNames:
+            path = os.path.join(dirPath, name)
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                continue
+            files.append((path, os.path.join(relDir, name) if relDir != "." else name))
+    return files, total
+
+
+def _reflink(src, dst) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def copyFile(
+    src: str,
+    dst: str,
+    progress: Callable[[int], None] = None,
+    cancelled: Callable[[], bool] = None) -> None:
+    partPath = dst + ".part"
+    try:
+        with open(src, "rb") as fsrc, open(partPath, "wb") as fdst:
+            if _reflink(fsrc, fdst):
+                if progress is not None:
+                    progress(os.fstat(fsrc.fileno()).st_size)
+            else:
+                buffer = bytearray(CHUNK_SIZE)
+                view = memoryview(buffer)
+                while n := fsrc.readinto(buffer):
+                    if cancelled is not None and cancelled():
+                        raise IngestCancelled()
+                    fdst.write(view[:n])
+                    if progress is not None:
+                        progress(n)
+        shutil.copystat(src, partPath)
+        os.replace(partPath, dst)
+    except BaseException:
+        if os.path.exists(partPath):
+            os.remove(partPath)
+        raise
+
+
+def _copyEntry(
+    files: List[Tuple[str, str]],
+    dst: str,
+    progress: Callable[[int], None],
+    cancelled: Callable[[], bool]) -> None:
+    for path, relPath in files:
+        target = os.path.join(dst, relPath) if relPath else dst
+        if os.path.isdir(path):
+            os.makedirs(target, exist_ok=True)
+        else:
+            copyFile(path, target, progress, cancelled)
+
+
+def _removeEntry(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def ingest(
+    sources: List[str],
+    targetDir: str,
+    move: bool = False,
+    progress: Callable[[Tuple[int, int]], None] = None,
+    cancelled: Callable[[], bool] = None) -> List[str]:
+    entries = []
+    for src in sources:
+        src = os.path.abspath(src)
+        dst = os.path.join(targetDir, os.path.basename(src.rstrip(os.sep)))
+        if not os.path.exists(src) or src == os.path.abspath(dst):
+            continue
+        if os.path.isdir(src) and os.path.abspath(targetDir).startswith(os.path.join(src, "")):
+            continue
+        entries.append((src, dst, *_walkSource(src)))
+
+    total = sum(entry[3] for entry in entries)
+    done = reported = 0
+
+    def report(n: int) -> None:
+        nonlocal done, reported
+        done += n
+        if progress is not None and (done - reported >= CHUNK_SIZE or done == total):
+            reported = done
+            progress((done, total))
+
+    ingested = []
+    for src, dst, files, size in entries:
+        if cancelled is not None and cancelled():
+            break
+        if move:
+            try:
+                os.replace(src, dst)
+                report(size)
+                ingested.append(dst)
+                continue
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EEXIST, errno.ENOTEMPTY, errno.EISDIR, errno.ENOTDIR):
+                    raise
+
+        existed = os.path.exists(dst)
+        try:
+            _copyEntry(files, dst, report, cancelled)
+        except IngestCancelled:
+            if not existed:
+                _removeEntry(dst)
+            break
+        if move:
+            _removeEntry(src)
+        ingested.append(dst)
+    return ingested
@@ -0,0 +1,153 @@
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from app.common.languages import EXTENSIONS, LANGUAGE_TAGS
+
+SNIFF_SIZE = 4096
+TAG_THRESHOLD = 0.05
+OTHER_THRESHOLD = 0.02
+
+# languages reported under one of the card's tags
+TAG_ALIASES = {"CSS": "HTML"}
+
+# pygments lexer modules that describe data, markup or configuration rather than code
+IGNORED_LEXER_MODULES = {"configs", "console", "data", "diff", "html", "make", "markup", "rdf", "special",
+                         "templates", "textfmts"}
+
+INTERPRETERS = {
+    "python": "Python", "perl": "Perl", "ruby": "Ruby", "node": "JavaScript", "php": "PHP", "rscript": "R",
+    "lua": "Lua", "sh": "Shell", "bash": "Shell", "zsh": "Shell", "dash": "Shell", "ksh": "Shell",
+    "pwsh": "PowerShell", "swift": "Swift", "tclsh": "Tcl", "awk": "Awk",
+}
+
+_shebangRe = re.compile(rb"#![ \t]*(\S+)(?:[ \t]+(\S+))?")
+_cppRe = re.compile(rb"^\s*(?:class\s+\w+\s*[:{]|namespace\s|template\s*<|using\s+namespace\s)|std::|\bpublic:|\bprivate:",
+                    re.MULTILINE)
+_objcRe = re.compile(rb"^\s*(?:#import\b|@interface\b|@implementation\b|@protocol\b|@property\b)", re.MULTILINE)
+_matlabRe = re.compile(rb"^\s*(?:%|function\b[^(\n]*=|end\s*$|disp\(|fprintf\()", re.MULTILINE)
+_prologRe = re.compile(rb"^:-|:-\s*$|^\w+\([^)\n]*\)\s*:-", re.MULTILINE)
+_plsqlRe = re.compile(
+    rb"\bcreate\s+(?:or\s+replace\s+)?(?:package|procedure|function|trigger)\b|^\s*declare\s*$|\bexception\s+when\b",
+    re.IGNORECASE | re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
+def extensionMap() -> Dict[str, str]:
+    """ Returns {extension: language}, built once from EXTENSIONS and the pygments lexer table """
+    mapping = {}
+    try:
+        from pygments.lexers import LEXERS
+    except ImportError:
+        LEXERS = {}
+
+    candidates = {}
+    for module, name, _, filenames, _ in LEXERS.values():
+        if module.rsplit(".", 1)[-1] in IGNORED_LEXER_MODULES:
+            continue
+        for pattern in filenames:
+            if pattern.startswith("*.") and not any(c in pattern[2:] for c in "*?["):
+                candidates.setdefault(pattern[1:].lower(), set()).add(name)
+    for extension, names in candidates.items():
+        if len(names) == 1:
+            mapping[extension] = names.pop()
+
+    mapping.update(EXTENSIONS)
+    return mapping
+
+
+def _sniffHeader(data: bytes) -> str:
+    if _objcRe.search(data):
+        return "Objective-C"
+    return "C++" if _cppRe.search(data) else "C"
+
+
+def _sniffM(data: bytes) -> str:
+    if _objcRe.search(data) or b"#include" in data:
+        return "Objective-C"
+    return "MATLAB" if _matlabRe.search(data) else "Objective-C"
+
+
+def _sniffPl(data: bytes) -> str:
+    return "Prolog" if _prologRe.search(data) and b"my $" not in data and b"use strict" not in data else "Perl"
+
+
+def _sniffSql(data: bytes) -> str:
+    return "PL/SQL" if _plsqlRe.search(data) else "SQL"
+
+
+# extensions whose language depends on the content
+SNIFFERS = {".h": _sniffHeader, ".m": _sniffM, ".pl": _sniffPl, ".sql": _sniffSql}
+
+
+def sniffShebang(data: bytes) -> str:
+    match = _shebangRe.match(data)
+    if not match:
+        return None
+    interpreter = os.path.basename(match.group(1)).decode("utf-8", "ignore")
+    if interpreter == "env" and match.group(2):
+        interpreter = match.group(2).decode("utf-8", "ignore")
+    return INTERPRETERS.get(interpreter.rstrip("0123456789.").lower())
+
+
+def needsSniffing(path: str) -> bool:
+    extension = os.path.splitext(path)[1].lower()
+    return not extension or extension in SNIFFERS
+
+
+def sniffLanguage(path: str, data: bytes) -> str:
+    """ Returns the language of a file whose extension is ambiguous or missing, from its first bytes """
+    sniffer = SNIFFERS.get(os.path.splitext(path)[1].lower())
+    return sniffer(data[:SNIFF_SIZE]) if sniffer else sniffShebang(data[:SNIFF_SIZE])
+
+
+def detectFile(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if not needsSniffing(path):
+        return extensionMap().get(extension)
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read(SNIFF_SIZE)
+    except OSError:
+        return extensionMap().get(extension)
+    return sniffLanguage(path, data)
+
+
+def detectLanguages(
+    root: str,
+    workers: int = None,
+    progress: Callable[[Tuple[int, int]], None] = None,
+    cancelled: Callable[[], bool] = None) -> Dict[str, int]:
+    """ Returns {language: bytes} for the ordinary source files of a project, read from its index """
+    from app.common.project_index import ProjectIndex
+
+    with ProjectIndex(root) as index:
+        index.update(workers, progress, cancelled)
+        return index.languages()
+
+
+def selectLanguages(
+    histogram: Dict[str, int],
+    tags: List[str] = LANGUAGE_TAGS,
+    tagThreshold: float = TAG_THRESHOLD,
+    otherThreshold: float = OTHER_THRESHOLD) -> Tuple[List[str], List[str]]:
+    """ Splits a histogram into (card tags to switch on, other languages), both by descending share """
+    weights = {}
+    for language, weight in histogram.items():
+        language = TAG_ALIASES.get(language, language)
+        weights[language] = weights.get(language, 0) + weight
+
+    total = sum(weights.values())
+    if not total:
+        return [], []
+
+    selected, others = [], []
+    for language, weight in sorted(weights.items(), key=lambda item: -item[1]):
+        if language in tags:
+            if weight >= total * tagThreshold:
+                selected.append(language)
+        elif weight >= total * otherThreshold:
+            others.append(language)
+    return selected, others
@@ -0,0 +1,60 @@
+import os
+
+# tags offered by DevLanguageCard
+LANGUAGE_TAGS = [
+    "Assembly language", "C", "C#", "C++", "Delphi/Object Pascal", "Go", "HTML",
+    "Java", "JavaScript", "MATLAB", "Objective-C", "PHP", "PL/SQL", "Perl",
+    "Python", "R", "Ruby", "SQL", "Swift", "Visual Basic", "Visual Basic .Net",
+]
+
+# extension -> language
+EXTENSIONS = {
+    ".asm": "Assembly language", ".s": "Assembly language",
+    ".c": "C", ".h": "C",
+    ".cs": "C#",
+    ".cpp": "C++", ".cc": "C++", ".cxx": "C++", ".hpp": "C++", ".hh": "C++", ".hxx": "C++",
+    ".pas": "Delphi/Object Pascal", ".dpr": "Delphi/Object Pascal", ".pp": "Delphi/Object Pascal",
+    ".go": "Go",
+    ".html": "HTML", ".htm": "HTML", ".vue": "HTML",
+    ".css": "CSS", ".scss": "CSS", ".less": "CSS",
+    ".java": "Java", ".kt": "Kotlin",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".m": "Objective-C", ".mm": "Objective-C",
+    ".php": "PHP",
+    ".pls": "PL/SQL", ".pkb": "PL/SQL", ".pks": "PL/SQL",
+    ".pl": "Perl", ".pm": "Perl",
+    ".py": "Python", ".pyw": "Python",
+    ".r": "R",
+    ".rb": "Ruby",
+    ".rs": "Rust",
+    ".sql": "SQL",
+    ".swift": "Swift",
+    ".bas": "Visual Basic", ".vb": "Visual Basic .Net",
+    ".sh": "Shell", ".bash": "Shell", ".bat": "Batch", ".cmd": "Batch", ".ps1": "PowerShell",
+    ".lua": "Lua", ".dart": "Dart", ".scala": "Scala",
+}
+
+_C_STYLE = ((b"//",), (b"/*", b"*/"))
+_HASH_STYLE = ((b"#",), None)
+
+# language -> (line comment prefixes, (block start, block end))
+COMMENTS = {
+    "Assembly language": ((b";",), None),
+    "C": _C_STYLE, "C#": _C_STYLE, "C++": _C_STYLE, "Go": _C_STYLE, "Java": _C_STYLE,
+    "Kotlin": _C_STYLE, "JavaScript": _C_STYLE, "TypeScript": _C_STYLE, "Objective-C": _C_STYLE,
+    "PHP": ((b"//", b"#"), (b"/*", b"*/")), "Rust": _C_STYLE, "Swift": _C_STYLE,
+    "Dart": _C_STYLE, "Scala": _C_STYLE,
+    "CSS": ((), (b"/*", b"*/")),
+    "HTML": ((), (b"<!--", b"-->")),
+    "Delphi/Object Pascal": ((b"//",), (b"{", b"}")),
+    "PL/SQL": ((b"--",), (b"/*", b"*/")), "SQL": ((b"--",), (b"/*", b"*/")),
+    "Lua": ((b"--",), (b"--[[", b"]]")),
+    "Perl": _HASH_STYLE, "R": _HASH_STYLE, "Ruby": ((b"#",), (b"=begin", b"=end")),
+    "Python": _HASH_STYLE, "Shell": _HASH_STYLE, "PowerShell": ((b"#",), (b"<#", b"#>")),
+    "Visual Basic": ((b"'",), None), "Visual Basic .Net": ((b"'",), None),
+    "Batch": ((b"::", b"REM ", b"rem "), None),
+}
+
+
+def languageForPath(path: str) -> str:
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
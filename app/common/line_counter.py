@@ -0,0 +1,135 @@
+import os
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from app.common.classifier import SKIPPED_DIRS, categoryFor
+from app.common.languages import COMMENTS, languageForPath
+from app.common.stat_cache import StatCache
+
+STAT_KEYS = ("total", "code", "comment", "blank")
+POOL_THRESHOLD = 1024
+CHUNK_SIZE = 32
+
+
+def walkSourceFiles(root: str) -> Iterator[Tuple[str, int, int]]:
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith(".") and entry.name not in SKIPPED_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file() and languageForPath(entry.name):
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def countLines(data: bytes, language: str) -> List[int]:
+    lineComments, blockComment = COMMENTS.get(language, ((), None))
+    code = comment = blank = 0
+    inBlock = False
+
+    lines = data.splitlines()
+    for line in lines:
+        line = line.strip()
+        if inBlock:
+            comment += 1
+            if blockComment[1] in line:
+                inBlock = False
+        elif not line:
+            blank += 1
+        elif lineComments and line.startswith(lineComments):
+            comment += 1
+        elif blockComment and line.startswith(blockComment[0]):
+            comment += 1
+            inBlock = blockComment[1] not in line[len(blockComment[0]):]
+        else:
+            code += 1
+
+    return [len(lines), code, comment, blank]
+
+
+def countFile(path: str) -> list:
+    language = languageForPath(path)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return [language, 0, 0, 0, 0]
+    return [language] + countLines(data, language)
+
+
+def _countFiles(paths: List[str]) -> List[list]:
+    return [countFile(path) for path in paths]
+
+
+def countProject(
+    root: str,
+    useCache: bool = True,
+    workers: int = None,
+    classification: Dict[str, str] = None,
+    progress: Callable[[Tuple[int, int]], None] = None,
+    cancelled: Callable[[], bool] = None) -> dict:
+    cache = StatCache("line_count") if useCache else None
+    files = [file for file in walkSourceFiles(root) if not (classification and categoryFor(file[0], classification, root))]
+
+    results = {}
+    pending = []
+    for path, size, mtime in files:
+        cached = cache.get(path, size, mtime) if cache else None
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending.append((path, size, mtime))
+
+    done = len(results)
+    if progress:
+        progress((done, len(files)))
+
+    chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+    if len(pending) < POOL_THRESHOLD or (workers or os.cpu_count() or 1) < 2:
+        counted = (_countFiles([path for path, _, _ in chunk]) for chunk in chunks)
+        executor = None
+    else:
+        # counting is pure Python, so only processes run it in parallel; spawn rather than
+        # fork because this runs on a Qt worker thread and forking a threaded process can deadlock
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        counted = executor.map(_countFiles, [[path for path, _, _ in chunk] for chunk in chunks])
+
+    try:
+        for chunk, stats in zip(chunks, counted):
+            for (path, size, mtime), value in zip(chunk, stats):
+                results[path] = value
+                if cache:
+                    cache.set(path, size, mtime, value)
+            done += len(chunk)
+            if progress:
+                progress((done, len(files)))
+            if cancelled and cancelled():
+                break
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        if cache:
+            cache.prune(set(results), os.path.join(root, ""))
+            cache.save()
+
+    summary = {}
+    for language, *counts in results.values():
+        languageStats = summary.setdefault(language, dict.fromkeys(STAT_KEYS, 0))
+        for key, value in zip(STAT_KEYS, counts):
+            languageStats[key] += value
+    return summary
+
+
+def totalLines(summary: dict, key: str = "total") -> int:
+    return sum(stats[key] for stats in summary.values())
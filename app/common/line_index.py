@@ -0,0 +1,85 @@
+import os
+import mmap
+import operator
+from array import array
+from itertools import accumulate, repeat
+from typing import Callable, List
+
+STRIDE = 64
+BLOCK_SIZE = 4 * 1024 * 1024
+MAX_LINE_LENGTH = 4096
+
+
+class LineIndex:
+    """ Sparse line-offset index over a memory-mapped file, one checkpoint every STRIDE lines """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.checkpoints = array("q", [0])
+        self.lineCount = 0
+
+    def build(self, progress: Callable[[float], None] = None, cancelled: Callable[[], bool] = None) -> "LineIndex":
+        position = 0
+        lineNo = 0
+        while position < self.size:
+            if cancelled and cancelled():
+                raise InterruptedError("cancelled")
+
+            block = self.map[position:position + BLOCK_SIZE]
+            cut = block.rfind(b"\n") + 1 if position + len(block) < self.size else len(block)
+            if cut == 0:
+                end = self.map.find(b"\n", position)
+                block = self.map[position:end + 1 if end >= 0 else self.size]
+                cut = len(block)
+            parts = block[:cut].split(b"\n")
+            if block[cut - 1:cut] == b"\n":
+                parts.pop()
+
+            starts = list(accumulate(map(operator.add, map(len, parts), repeat(1)), initial=position))
+            first = -lineNo % STRIDE
+            self.checkpoints.extend(starts[STRIDE if lineNo == 0 else first:len(parts):STRIDE])
+
+            lineNo += len(parts)
+            position += cut
+            if progress:
+                progress(position / self.size)
+
+        self.lineCount = lineNo
+        return self
+
+    def lineStart(self, lineNo: int) -> int:
+        position = self.checkpoints[lineNo // STRIDE]
+        for _ in range(lineNo % STRIDE):
+            position = self.map.find(b"\n", position) + 1
+        return position
+
+    def lines(self, start: int, count: int) -> List[str]:
+        start = max(0, min(start, self.lineCount))
+        count = max(0, min(count, self.lineCount - start))
+        result = []
+        position = self.lineStart(start) if count else 0
+        for _ in range(count):
+            end = self.map.find(b"\n", position)
+            if end < 0:
+                end = self.size
+            raw = self.map[position:min(end, position + MAX_LINE_LENGTH)]
+            result.append(raw.decode("utf-8", errors="replace").rstrip("\r"))
+            position = end + 1
+        return result
+
+    def close(self) -> None:
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+
+
+def buildLineIndex(path: str, progress: Callable[[float], None] = None, cancelled: Callable[[], bool] = None) -> LineIndex:
+    index = LineIndex(path)
+    try:
+        return index.build(progress, cancelled)
+    except BaseException:
+        index.close()
+        raise
@@ -0,0 +1,234 @@
+import ssl
+import json
+import asyncio
+from typing import AsyncIterator, List, Tuple
+from urllib.parse import urlsplit
+
+
+class LLMError(Exception):
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class Connection:
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def isClosed(self) -> bool:
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ConnectionPool:
+    """ Keep-alive HTTP/1.1 connections to a single origin """
+
+    def __init__(self, host: str, port: int, useSSL: bool, maxConnections: int = 8) -> None:
+        self.host = host
+        self.port = port
+        self.sslContext = ssl.create_default_context() if useSSL else None
+        self.idle = []
+        self.semaphore = asyncio.Semaphore(maxConnections)
+
+    async def acquire(self) -> Connection:
+        await self.semaphore.acquire()
+        while self.idle:
+            connection = self.idle.pop()
+            if not connection.isClosed():
+                connection.reused = True
+                return connection
+            connection.close()
+
+        try:
+            reader, writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.sslContext, limit=1024 * 1024)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return Connection(reader, writer)
+
+    def release(self, connection: Connection, reusable: bool) -> None:
+        if reusable and not connection.isClosed():
+            self.idle.append(connection)
+        else:
+            connection.close()
+        self.semaphore.release()
+
+    def close(self) -> None:
+        for connection in self.idle:
+            connection.close()
+        self.idle.clear()
+
+
+class Response:
+
+    def __init__(self, connection: Connection, status: int, headers: dict, idleTimeout: float = None) -> None:
+        self.connection = connection
+        self.status = status
+        self.headers = headers
+        self.idleTimeout = idleTimeout
+        self.complete = False
+
+    @property
+    def reusable(self) -> bool:
+        return self.complete and self.headers.get("connection", "").lower() != "close"
+
+    async def _wait(self, awaitable):
+        """ Bounds a single read, so a server that stalls mid-body raises TimeoutError instead of hanging """
+        return await asyncio.wait_for(awaitable, self.idleTimeout)
+
+    async def iterBody(self) -> AsyncIterator[bytes]:
+        reader = self.connection.reader
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self._wait(reader.readline())).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self._wait(reader.readline())) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                yield await self._wait(reader.readexactly(size))
+                await self._wait(reader.readline())
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining > 0:
+                chunk = await self._wait(reader.read(min(remaining, 65536)))
+                if not chunk:
+                    raise ConnectionError("connection closed before the response was complete")
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            self.headers["connection"] = "close"
+            while chunk := await self._wait(reader.read(65536)):
+                yield chunk
+        self.complete = True
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iterBody()])
+
+
+class ChatClient:
+    """ Minimal asyncio client for OpenAI-compatible chat completion endpoints """
+
+    def __init__(
+        self,
+        baseUrl: str,
+        apiKey: str,
+        model: str,
+        maxConnections: int = 8,
+        timeout: float = 120,
+        idleTimeout: float = 60) -> None:
+        url = urlsplit(baseUrl.rstrip("/"))
+        self.baseUrl = baseUrl
+        self.model = model
+        self.apiKey = apiKey
+        self.path = url.path + "/chat/completions"
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.hostHeader = url.netloc
+        self.useSSL = url.scheme == "https"
+        self.timeout = timeout
+        self.idleTimeout = idleTimeout
+        self.maxConnections = maxConnections
+        self.pool = None
+
+    def _pool(self) -> ConnectionPool:
+        if self.pool is None:
+            self.pool = ConnectionPool(self.host, self.port, self.useSSL, self.maxConnections)
+        return self.pool
+
+    async def _request(self, connection: Connection, body: bytes) -> Response:
+        head = (
+            f"POST {self.path} HTTP/1.1\r\n"
+            f"Host: {self.hostHeader}\r\n"
+            f"Authorization: Bearer {self.apiKey}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: text/event-stream, application/json\r\n"
+            "Connection: keep-alive\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("utf-8")
+        connection.writer.write(head + body)
+        await connection.writer.drain()
+
+        statusLine = await connection.reader.readline()
+        if not statusLine:
+            raise ConnectionError("connection closed by server")
+        status = int(statusLine.split()[1])
+
+        headers = {}
+        while (line := await connection.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return Response(connection, status, headers, self.idleTimeout)
+
+    async def stream(self, messages: List[dict], **params) -> AsyncIterator[str]:
+        payload = dict(model=self.model, messages=messages, stream=True, **params)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        pool = self._pool()
+        while True:
+            connection = await pool.acquire()
+            try:
+                response = await asyncio.wait_for(self._request(connection, body), self.timeout)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pool.release(connection, False)
+                if not connection.reused:
+                    raise
+            except BaseException:
+                pool.release(connection, False)
+                raise
+
+        try:
+            if response.status >= 400:
+                message = (await response.read()).decode("utf-8", errors="replace")
+                raise LLMError(response.status, message)
+
+            if "text/event-stream" in response.headers.get("content-type", ""):
+                async for token in self._iterEvents(response):
+                    yield token
+            else:
+                data = json.loads(await response.read())
+                yield data["choices"][0]["message"]["content"] or ""
+        finally:
+            pool.release(connection, response.reusable)
+
+    async def _iterEvents(self, response: Response) -> AsyncIterator[str]:
+        buffer = b""
+        done = False
+        async for chunk in response.iterBody():
+            if done:
+                continue
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    done = True
+                    break
+                event = json.loads(data)
+                if "error" in event:
+                    raise LLMError(500, str(event["error"]))
+                choices = event.get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+    async def complete(self, messages: List[dict], **params) -> str:
+        return "".join([token async for token in self.stream(messages, **params)])
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+
+    def key(self) -> Tuple[str, str, str]:
+        return self.baseUrl, self.apiKey, self.model
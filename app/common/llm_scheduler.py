@@ -0,0 +1,98 @@
+import time
+import random
+import asyncio
+from typing import AsyncIterator, List, Tuple
+
+from app.common.llm_client import ChatClient, LLMError
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+def estimateTokens(text: str) -> int:
+    asciiCount = len(text.encode("ascii", errors="ignore"))
+    return len(text) - asciiCount + asciiCount // 4 + 1
+
+
+def backoffDelay(attempt: int, base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def drain(self) -> None:
+        self._refill()
+        self.tokens = min(self.tokens, 0)
+
+
+class RequestScheduler:
+    """ Rate-limited, retrying front for a ChatClient with the same stream/complete interface """
+
+    def __init__(
+        self,
+        client: ChatClient,
+        requestsPerSecond: float = 2,
+        tokensPerMinute: float = 60000,
+        maxRetries: int = MAX_RETRIES) -> None:
+        self.client = client
+        self.model = client.model
+        self.baseUrl = client.baseUrl
+        self.maxRetries = maxRetries
+        self.requestBucket = TokenBucket(requestsPerSecond, max(1, requestsPerSecond))
+        self.tokenBucket = TokenBucket(tokensPerMinute / 60, tokensPerMinute)
+
+    async def stream(self, messages: List[dict], **params) -> AsyncIterator[str]:
+        cost = sum(estimateTokens(message["content"]) for message in messages)
+        cost += params.get("max_tokens", DEFAULT_COMPLETION_TOKENS)
+
+        attempt = 0
+        while True:
+            await self.requestBucket.acquire()
+            await self.tokenBucket.acquire(cost)
+            started = False
+            try:
+                async for token in self.client.stream(messages, **params):
+                    started = True
+                    yield token
+                return
+            except (LLMError, ConnectionError, asyncio.TimeoutError) as e:
+                retryable = not isinstance(e, LLMError) or e.status in RETRY_STATUSES
+                if started or not retryable or attempt >= self.maxRetries:
+                    raise
+                if isinstance(e, LLMError) and e.status == 429:
+                    self.requestBucket.drain()
+            await asyncio.sleep(backoffDelay(attempt))
+            attempt += 1
+
+    async def complete(self, messages: List[dict], **params) -> str:
+        return "".join([token async for token in self.stream(messages, **params)])
+
+    def close(self) -> None:
+        self.client.close()
+
+    def key(self) -> Tuple[str, str, str]:
+        return self.client.key()
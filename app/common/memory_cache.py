@@ -0,0 +1,56 @@
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+
+    def __init__(self, budget: int, sizeOf: Callable[[Any], int] = sys.getsizeof) -> None:
+        self.budget = budget
+        self.sizeOf = sizeOf
+        self.entries = OrderedDict()
+        self.currentSize = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.sizeOf(value)
+        if size > self.budget:
+            return
+
+        self.remove(key)
+        self.entries[key] = (value, size)
+        self.currentSize += size
+        while self.currentSize > self.budget:
+            _, (_, evictedSize) = self.entries.popitem(last=False)
+            self.currentSize -= evictedSize
+            self.evictions += 1
+
+    def remove(self, key: Hashable) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.currentSize -= entry[1]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.currentSize = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "entries": len(self.entries), "size": self.currentSize, "budget": self.budget
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,9 @@
+import os
+
+# folder holding main.py, relative folders in the settings are resolved against it
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.path.join("app", "cache")
+
+
+def resolvePath(path: str) -> str:
+    return os.path.join(APP_ROOT, path)
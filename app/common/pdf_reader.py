@@ -0,0 +1,544 @@
+import os
+import re
+import mmap
+import zlib
+import hashlib
+from typing import BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+from app.common.paths import CACHE_DIR
+
+WHITESPACE = b"\x00\t\n\x0c\r "
+INHERITED_KEYS = ("Resources", "MediaBox", "CropBox", "Rotate")
+TAIL_SIZE = 4096
+OBJECT_STREAM_CACHE = 4
+
+_tokenRe = re.compile(rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]+")
+_objRe = re.compile(rb"(\d+)\s+(\d+)\s+obj")
+
+
+class PdfError(Exception):
+    pass
+
+
+class Ref(NamedTuple):
+    num: int
+    gen: int
+
+
+class Name(str):
+    pass
+
+
+class RawString(bytes):
+    """ A string literal kept exactly as written so it can be copied without re-encoding """
+    pass
+
+
+class Stream(NamedTuple):
+    dict: dict
+    data: bytes
+
+
+class Parser:
+
+    def __init__(self, data, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+
+    def skipSpace(self) -> None:
+        data, pos = self.data, self.pos
+        while pos < len(data):
+            c = data[pos]
+            if c in WHITESPACE:
+                pos += 1
+            elif c == 0x25:
+                while pos < len(data) and data[pos] not in b"\r\n":
+                    pos += 1
+            else:
+                break
+        self.pos = pos
+
+    def keyword(self) -> bytes:
+        self.skipSpace()
+        match = _tokenRe.match(self.data, self.pos)
+        if match is None:
+            return b""
+        self.pos = match.end()
+        return match.group(0)
+
+    def parse(self, resolveLength: Callable[[object], int] = None):
+        self.skipSpace()
+        data = self.data
+        c = data[self.pos:self.pos + 1]
+        if c == b"/":
+            match = _tokenRe.match(data, self.pos + 1)
+            self.pos = match.end() if match else self.pos + 1
+            return Name(match.group(0).decode("latin-1") if match else "")
+        if c == b"(":
+            return self._literalString()
+        if c == b"<":
+            if data[self.pos + 1:self.pos + 2] == b"<":
+                return self._dictionary(resolveLength)
+            end = data.find(b">", self.pos)
+            if end < 0:
+                raise PdfError("unterminated hex string")
+            value = RawString(data[self.pos:end + 1])
+            self.pos = end + 1
+            return value
+        if c == b"[":
+            self.pos += 1
+            items = []
+            while True:
+                self.skipSpace()
+                if data[self.pos:self.pos + 1] == b"]":
+                    self.pos += 1
+                    return items
+                items.append(self.parse(resolveLength))
+        if not c:
+            raise PdfError("unexpected end of data")
+
+        token = self.keyword()
+        if not token:
+            raise PdfError(f"unexpected byte {c!r} at {self.pos}")
+        if token == b"true":
+            return True
+        if token == b"false":
+            return False
+        if token == b"null":
+            return None
+        try:
+            number = float(token) if b"." in token else int(token)
+        except ValueError:
+            raise PdfError(f"unexpected token {token!r} at {self.pos}")
+
+        if isinstance(number, int):
+            mark = self.pos
+            second = self.keyword()
+            if second.isdigit() and self.keyword() == b"R":
+                return Ref(number, int(second))
+            self.pos = mark
+        return number
+
+    def _literalString(self) -> RawString:
+        data, pos, depth = self.data, self.pos + 1, 1
+        while depth:
+            c = data[pos]
+            if c == 0x5C:
+                pos += 1
+            elif c == 0x28:
+                depth += 1
+            elif c == 0x29:
+                depth -= 1
+            pos += 1
+        value = RawString(data[self.pos:pos])
+        self.pos = pos
+        return value
+
+    def _dictionary(self, resolveLength: Callable[[object], int] = None):
+        data = self.data
+        self.pos += 2
+        result = {}
+        while True:
+            self.skipSpace()
+            if data[self.pos:self.pos + 2] == b">>":
+                self.pos += 2
+                break
+            key = self.parse(resolveLength)
+            result[key] = self.parse(resolveLength)
+
+        mark = self.pos
+        if self.keyword() != b"stream":
+            self.pos = mark
+            return result
+
+        if data[self.pos:self.pos + 2] == b"\r\n":
+            self.pos += 2
+        elif data[self.pos:self.pos + 1] in (b"\n", b"\r"):
+            self.pos += 1
+        length = result.get("Length")
+        if resolveLength is not None:
+            length = resolveLength(length)
+        end = self.pos + length if isinstance(length, int) else -1
+        if end < 0 or data[end:end + 20].strip()[:9] != b"endstream":
+            end = data.find(b"endstream", self.pos)
+            if end < 0:
+                raise PdfError("unterminated stream")
+            while end > self.pos and data[end - 1] in b"\r\n":
+                end -= 1
+        stream = Stream(result, bytes(data[self.pos:end]))
+        self.pos = data.find(b"endstream", end) + 9
+        return stream
+
+
+def decodeStream(stream: Stream) -> bytes:
+    filters = stream.dict.get("Filter")
+    params = stream.dict.get("DecodeParms")
+    if not isinstance(filters, list):
+        filters, params = [filters] if filters else [], [params]
+    elif not isinstance(params, list):
+        params = [params] * len(filters)
+
+    data = stream.data
+    for name, param in zip(filters, params):
+        if name != "FlateDecode":
+            raise PdfError(f"unsupported filter {name}")
+        data = zlib.decompress(data)
+        if isinstance(param, dict) and param.get("Predictor", 1) >= 10:
+            data = _pngUnpredict(data, param.get("Columns", 1) * param.get("Colors", 1) * param.get("BitsPerComponent", 8) // 8)
+    return data
+
+
+def _pngUnpredict(data: bytes, columns: int) -> bytes:
+    rows = []
+    previous = bytearray(columns)
+    for i in range(0, len(data), columns + 1):
+        kind, row = data[i], bytearray(data[i + 1:i + 1 + columns])
+        for j in range(len(row)):
+            left = row[j - 1] if j else 0
+            if kind == 1:
+                row[j] = (row[j] + left) & 0xFF
+            elif kind == 2:
+                row[j] = (row[j] + previous[j]) & 0xFF
+            elif kind == 3:
+                row[j] = (row[j] + (left + previous[j]) // 2) & 0xFF
+            elif kind == 4:
+                up, upLeft = previous[j], previous[j - 1] if j else 0
+                p = left + up - upLeft
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - upLeft)
+                row[j] = (row[j] + (left if pa <= pb and pa <= pc else up if pb <= pc else upLeft)) & 0xFF
+        rows.append(bytes(row))
+        previous = row
+    return b"".join(rows)
+
+
+class PdfReader:
+    """ Reads only the cross-reference data and the objects that are asked for, through a memory map """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise PdfError("empty file")
+        self.xref = {}
+        self.trailer = {}
+        self.objectStreams = {}
+        try:
+            self._readXref()
+        except (PdfError, ValueError, IndexError, zlib.error):
+            self._rebuildXref()
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self) -> "PdfReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _readXref(self) -> None:
+        tail = self.data.rfind(b"startxref", max(0, len(self.data) - TAIL_SIZE))
+        if tail < 0:
+            raise PdfError("startxref not found")
+        offset = int(Parser(self.data, tail + 9).keyword())
+
+        seen = set()
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            parser = Parser(self.data, offset)
+            parser.skipSpace()
+            if self.data[parser.pos:parser.pos + 4] == b"xref":
+                parser.pos += 4
+                trailer = self._readXrefTable(parser)
+                if isinstance(trailer.get("XRefStm"), int):
+                    self._readXrefStream(trailer["XRefStm"])
+            else:
+                trailer = self._readXrefStream(offset)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            offset = trailer.get("Prev")
+        if "Root" not in self.trailer:
+            raise PdfError("trailer has no Root")
+
+    def _readXrefTable(self, parser: Parser) -> dict:
+        while True:
+            token = parser.keyword()
+            if token == b"trailer":
+                return parser.parse()
+            start, count = int(token), int(parser.keyword())
+            for num in range(start, start + count):
+                offset, gen, kind = int(parser.keyword()), int(parser.keyword()), parser.keyword()
+                if kind == b"n" and num not in self.xref:
+                    self.xref[num] = (1, offset, gen)
+                elif num not in self.xref:
+                    self.xref[num] = (0, 0, gen)
+
+    def _readXrefStream(self, offset: int) -> dict:
+        parser = Parser(self.data, offset)
+        parser.keyword(), parser.keyword(), parser.keyword()
+        stream = parser.parse(self._resolveLength)
+        if not isinstance(stream, Stream) or stream.dict.get("Type") != "XRef":
+            raise PdfError("invalid cross-reference stream")
+
+        data = decodeStream(stream)
+        widths = stream.dict["W"]
+        index = stream.dict.get("Index", [0, stream.dict["Size"]])
+        rowSize = sum(widths)
+        pos = 0
+        for i in range(0, len(index), 2):
+            for num in range(index[i], index[i] + index[i + 1]):
+                fields, row = [], data[pos:pos + rowSize]
+                pos += rowSize
+                start = 0
+                for width in widths:
+                    fields.append(int.from_bytes(row[start:start + width], "big") if width else None)
+                    start += width
+                kind = 1 if fields[0] is None else fields[0]
+                if num not in self.xref:
+                    self.xref[num] = (kind, fields[1], fields[2] or 0)
+        return stream.dict
+
+    def _rebuildXref(self) -> None:
+        self.xref.clear()
+        self.trailer.clear()
+        for match in _objRe.finditer(self.data):
+            self.xref[int(match.group(1))] = (1, match.start(), int(match.group(2)))
+        for match in re.finditer(rb"trailer", self.data):
+            try:
+                trailer = Parser(self.data, match.end()).parse()
+            except (PdfError, ValueError, IndexError):
+                continue
+            if isinstance(trailer, dict):
+                self.trailer.update(trailer)
+        if "Root" not in self.trailer:
+            for num in self.xref:
+                obj = self.getObject(num)
+                if isinstance(obj, dict) and obj.get("Type") == "Catalog":
+                    self.trailer["Root"] = Ref(num, self.xref[num][2])
+                    break
+        if "Root" not in self.trailer:
+            raise PdfError("not a PDF document")
+
+    def _resolveLength(self, value) -> int:
+        return self.resolve(value) if isinstance(value, Ref) else value
+
+    def getObject(self, num: int):
+        entry = self.xref.get(num)
+        if entry is None or entry[0] == 0:
+            return None
+        if entry[0] == 2:
+            return self._compressedObject(entry[1], entry[2])
+
+        parser = Parser(self.data, entry[1])
+        parser.keyword(), parser.keyword()
+        if parser.keyword() != b"obj":
+            raise PdfError(f"object {num} not found at offset {entry[1]}")
+        return parser.parse(self._resolveLength)
+
+    def _compressedObject(self, streamNum: int, index: int):
+        if streamNum not in self.objectStreams:
+            stream = self.getObject(streamNum)
+            data = decodeStream(stream)
+            header = Parser(data)
+            offsets = [(int(header.keyword()), int(header.keyword())) for _ in range(stream.dict["N"])]
+            if len(self.objectStreams) >= OBJECT_STREAM_CACHE:
+                self.objectStreams.pop(next(iter(self.objectStreams)))
+            self.objectStreams[streamNum] = (data, stream.dict["First"], offsets)
+
+        data, first, offsets = self.objectStreams[streamNum]
+        return Parser(data, first + offsets[index][1]).parse()
+
+    def resolve(self, value):
+        seen = set()
+        while isinstance(value, Ref) and value.num not in seen:
+            seen.add(value.num)
+            value = self.getObject(value.num)
+        return value
+
+    @property
+    def root(self) -> dict:
+        return self.resolve(self.trailer["Root"])
+
+    @property
+    def pageCount(self) -> int:
+        return int(self.resolve(self.resolve(self.root["Pages"]).get("Count", 0)))
+
+    def iterPages(self) -> Iterator[Tuple[Ref, dict, dict]]:
+        """ Yields (reference, page dictionary, inherited attributes) in document order """
+        stack = [(self.root["Pages"], {})]
+        seen = set()
+        while stack:
+            ref, inherited = stack.pop()
+            if isinstance(ref, Ref):
+                if ref.num in seen:
+                    continue
+                seen.add(ref.num)
+            node = self.resolve(ref)
+            if not isinstance(node, dict):
+                continue
+
+            if node.get("Type") == "Pages" or "Kids" in node:
+                inherited = dict(inherited, **{key: node[key] for key in INHERITED_KEYS if key in node})
+                kids = self.resolve(node.get("Kids", []))
+                stack.extend((kid, inherited) for kid in reversed(kids))
+            else:
+                yield ref, node, inherited
+
+
+def serialize(value, refs: Dict[int, int]) -> bytes:
+    if isinstance(value, Ref):
+        num = refs.get(value.num)
+        return b"%d 0 R" % num if num is not None else b"null"
+    if isinstance(value, Name):
+        return b"/" + value.encode("latin-1")
+    if isinstance(value, RawString):
+        return bytes(value)
+    if value is True:
+        return b"true"
+    if value is False:
+        return b"false"
+    if value is None:
+        return b"null"
+    if isinstance(value, int):
+        return b"%d" % value
+    if isinstance(value, float):
+        return (b"%.6f" % value).rstrip(b"0").rstrip(b".")
+    if isinstance(value, list):
+        return b"[" + b" ".join(serialize(item, refs) for item in value) + b"]"
+    if isinstance(value, dict):
+        return b"<<" + b"".join(
+            b"/" + key.encode("latin-1") + b" " + serialize(item, refs) for key, item in value.items()
+        ) + b">>"
+    if isinstance(value, Stream):
+        streamDict = dict(value.dict, Length=len(value.data))
+        return serialize(streamDict, refs) + b"\nstream\n" + value.data + b"\nendstream"
+    raise PdfError(f"cannot serialize {type(value).__name__}")
+
+
+def _references(value) -> Iterator[Ref]:
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Ref):
+            yield value
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            stack.extend(item for key, item in value.items() if key != "Parent")
+        elif isinstance(value, Stream):
+            stack.append(value.dict)
+
+
+def countPages(path: str) -> int:
+    with PdfReader(path) as reader:
+        return reader.pageCount
+
+
+def selectPages(count: int, head: int, tail: int) -> List[int]:
+    if count <= head + tail:
+        return list(range(count))
+    return list(range(head)) + list(range(count - tail, count))
+
+
+def trimPdf(
+    path: str,
+    outputPath: str,
+    head: int = 30,
+    tail: int = 30,
+    progress: Callable[[int], None] = None,
+    cancelled: Callable[[], bool] = None) -> int:
+    with PdfReader(path) as reader:
+        if "Encrypt" in reader.trailer:
+            raise PdfError("加密的 PDF 无法截取页面")
+
+        pages = list(reader.iterPages())
+        selected = [pages[index] for index in selectPages(len(pages), head, tail)]
+        pageNums = {ref.num for ref, _, _ in pages if isinstance(ref, Ref)}
+        tmpPath = outputPath + ".tmp"
+        try:
+            with open(tmpPath, "wb") as f:
+                _writePages(reader, selected, pageNums, f, progress, cancelled)
+            os.replace(tmpPath, outputPath)
+        except BaseException:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+            raise
+        return len(selected)
+
+
+def _writePages(
+    reader: PdfReader,
+    pages: List[Tuple[Ref, dict, dict]],
+    pageNums: set,
+    f: BinaryIO,
+    progress: Callable[[int], None],
+    cancelled: Callable[[], bool]) -> None:
+    # pages keep their place in the numbering so links between kept pages survive,
+    # references to dropped pages are written as null
+    refs = {ref.num: index + 3 for index, (ref, _, _) in enumerate(pages) if isinstance(ref, Ref)}
+    nextNum = len(pages) + 3
+    offsets = {}
+
+    def write(num: int, value) -> None:
+        offsets[num] = f.tell()
+        f.write(b"%d 0 obj\n" % num + serialize(value, refs) + b"\nendobj\n")
+
+    f.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    for index, (ref, page, inherited) in enumerate(pages):
+        if cancelled is not None and cancelled():
+            raise PdfError("cancelled")
+
+        page = dict(inherited, **page)
+        page["Parent"] = RawString(b"2 0 R")
+        queue = [page]
+        while queue:
+            for child in _references(queue.pop()):
+                if child.num in refs or child.num in pageNums or reader.xref.get(child.num, (0,))[0] == 0:
+                    continue
+                refs[child.num] = nextNum
+                nextNum += 1
+                value = reader.getObject(child.num)
+                queue.append(value)
+                write(refs[child.num], value)
+        write(index + 3, page)
+        if progress is not None:
+            progress(index + 1)
+
+    kids = b" ".join(b"%d 0 R" % (index + 3) for index in range(len(pages)))
+    offsets[1] = f.tell()
+    f.write(b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n")
+    offsets[2] = f.tell()
+    f.write(b"2 0 obj\n<< /Type /Pages /Kids [" + kids + b"] /Count %d >>\nendobj\n" % len(pages))
+
+    size = nextNum
+    xrefOffset = f.tell()
+    f.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    for num in range(1, size):
+        f.write(b"%010d 00000 n \n" % offsets[num])
+    f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xrefOffset))
+
+
+def prepareMaterial(
+    path: str,
+    keepPages: int = 30,
+    outputDir: str = None,
+    progress: Callable[[int], None] = None,
+    cancelled: Callable[[], bool] = None) -> Tuple[str, int, int]:
+    """ Returns (usable path, its page count, original page count), trimming to the first and last pages if needed """
+    count = countPages(path)
+    if not keepPages or count <= keepPages * 2:
+        return path, count, count
+
+    # the trimmed copy never goes next to the original, whose folder may be read-only
+    outputDir = outputDir or os.path.join(CACHE_DIR, "materials")
+    os.makedirs(outputDir, exist_ok=True)
+    # files with the same name from different folders get different copies
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.blake2b(os.path.abspath(path).encode("utf-8"), digest_size=4).hexdigest()
+    outputPath = os.path.join(outputDir, f"{stem}_前后各{keepPages}页_{digest}.pdf")
+    pages = trimPdf(path, outputPath, keepPages, keepPages, progress, cancelled)
+    return outputPath, pages, count
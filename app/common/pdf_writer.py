@@ -0,0 +1,105 @@
+import zlib
+from typing import BinaryIO, List
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+FONT_OBJECTS = [
+    b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+    b"<< /Type /Font /Subtype /Type0 /BaseFont /STSong-Light /Encoding /UniGB-UCS2-H /DescendantFonts [%d 0 R] >>",
+    b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /STSong-Light"
+    b" /CIDSystemInfo << /Registry (Adobe) /Ordering (GB1) /Supplement 2 >>"
+    b" /FontDescriptor %d 0 R /DW 1000 /W [1 95 500] >>",
+    b"<< /Type /FontDescriptor /FontName /STSong-Light /Flags 6 /FontBBox [-25 -254 1000 880]"
+    b" /ItalicAngle 0 /Ascent 752 /Descent -271 /CapHeight 737 /StemV 58 >>",
+]
+
+
+def _escape(text: str) -> bytes:
+    data = text.encode("latin-1")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def textRuns(text: str, size: int) -> bytes:
+    runs = []
+    start = 0
+    for i in range(1, len(text) + 1):
+        if i == len(text) or (ord(text[i]) < 128) != (ord(text[start]) < 128):
+            run = text[start:i]
+            if ord(run[0]) < 128:
+                runs.append(b"/F1 %d Tf " % size + _escape(run) + b" Tj")
+            else:
+                encoded = "".join(c if ord(c) <= 0xFFFF else "?" for c in run).encode("utf-16-be")
+                runs.append(b"/F2 %d Tf <" % size + encoded.hex().encode() + b"> Tj")
+            start = i
+    return b" ".join(runs)
+
+
+class PdfWriter:
+    """ Minimal streaming PDF writer, each page is flushed to the file as soon as it is added """
+
+    def __init__(self, file: BinaryIO, fontSize: int = 10, leading: int = 14, margin: int = 50) -> None:
+        self.file = file
+        self.fontSize = fontSize
+        self.leading = leading
+        self.margin = margin
+        self.offsets = {}
+        self.pageIds = []
+        self.nextId = 3 + len(FONT_OBJECTS)
+
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        fontId = 3
+        self._writeObject(fontId, FONT_OBJECTS[0])
+        self._writeObject(fontId + 1, FONT_OBJECTS[1] % (fontId + 2))
+        self._writeObject(fontId + 2, FONT_OBJECTS[2] % (fontId + 3))
+        self._writeObject(fontId + 3, FONT_OBJECTS[3])
+        self.resources = b"<< /Font << /F1 %d 0 R /F2 %d 0 R >> >>" % (fontId, fontId + 1)
+
+    def _allocate(self) -> int:
+        self.nextId += 1
+        return self.nextId - 1
+
+    def _writeObject(self, objId: int, body: bytes) -> None:
+        self.offsets[objId] = self.file.tell()
+        self.file.write(b"%d 0 obj\n" % objId + body + b"\nendobj\n")
+
+    def _writeStream(self, objId: int, data: bytes) -> None:
+        data = zlib.compress(data)
+        self._writeObject(objId, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+
+    def addPage(self, lines: List[str], header: str = "", pageLabel: str = "") -> None:
+        top = PAGE_HEIGHT - self.margin
+        parts = []
+        if header:
+            parts.append(b"BT %d %d Td " % (self.margin, top) + textRuns(header, self.fontSize) + b" ET")
+        if pageLabel:
+            parts.append(b"BT %d %d Td " % (PAGE_WIDTH - self.margin - 6 * len(pageLabel), top)
+                         + textRuns(pageLabel, self.fontSize) + b" ET")
+        parts.append(b"0.6 G %d %d m %d %d l S 0 G" % (
+            self.margin, top - 6, PAGE_WIDTH - self.margin, top - 6))
+
+        body = [b"BT %d TL %d %d Td" % (self.leading, self.margin, top - 6 - self.leading * 2)]
+        for line in lines:
+            if line:
+                body.append(textRuns(line, self.fontSize))
+            body.append(b"T*")
+        body.append(b"ET")
+        parts.append(b"\n".join(body))
+
+        contentId = self._allocate()
+        pageId = self._allocate()
+        self._writeStream(contentId, b"\n".join(parts))
+        self._writeObject(pageId, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>" % (
+            PAGE_WIDTH, PAGE_HEIGHT, self.resources, contentId))
+        self.pageIds.append(pageId)
+
+    def close(self) -> None:
+        kids = b" ".join(b"%d 0 R" % pageId for pageId in self.pageIds)
+        self._writeObject(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.pageIds)))
+        self._writeObject(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xrefOffset = self.file.tell()
+        self.file.write(b"xref\n0 %d\n0000000000 65535 f \n" % self.nextId)
+        for objId in range(1, self.nextId):
+            self.file.write(b"%010d 00000 n \n" % self.offsets[objId])
+        self.file.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self.nextId, xrefOffset))
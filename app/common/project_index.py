@@ -0,0 +1,228 @@
+import os
+import sqlite3
+import hashlib
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from app.common.classifier import BINARY, SKIPPED_DIRS, VENDORED, classifyName, classifyPrefix, walkProject, PREFIX_SIZE
+from app.common.language_detector import extensionMap, needsSniffing, sniffLanguage
+from app.common.languages import languageForPath
+from app.common.line_counter import countLines, STAT_KEYS
+from app.common.paths import CACHE_DIR
+
+INDEX_DIR = os.path.join(CACHE_DIR, "index")
+SCHEMA_VERSION = 2
+BATCH_SIZE = 1000
+POOL_THRESHOLD = 1024
+CHUNK_SIZE = 64
+MAX_READ = 16 * 1024 * 1024
+TAIL_READ = 64 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    language TEXT,
+    total INTEGER NOT NULL DEFAULT 0,
+    code INTEGER NOT NULL DEFAULT 0,
+    comment INTEGER NOT NULL DEFAULT 0,
+    blank INTEGER NOT NULL DEFAULT 0,
+    hash TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    category TEXT NOT NULL
+);
+"""
+
+
+class ProjectSnapshot(NamedTuple):
+    classification: Dict[str, str]
+    summary: dict
+    changed: int
+    removed: int
+    fingerprint: str
+
+
+def indexPath(root: str) -> str:
+    key = hashlib.blake2b(os.path.abspath(root).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(INDEX_DIR, f"{key}.sqlite")
+
+
+def indexFile(path: str) -> list:
+    """ Returns [language, total, code, comment, blank, hash, category] for one file """
+    language = languageForPath(path)
+    category = classifyName(os.path.basename(path))
+    try:
+        with open(path, "rb") as f:
+            data = f.read(MAX_READ)
+            digest = hashlib.blake2b(data, digest_size=16)
+            complete = len(data) < MAX_READ or not f.read(1)
+            if not complete:
+                f.seek(-TAIL_READ, os.SEEK_END)
+                digest.update(f.read())
+                digest.update(str(os.fstat(f.fileno()).st_size).encode())
+    except OSError:
+        return [language, 0, 0, 0, 0, "", category]
+
+    category = category or classifyPrefix(data[:PREFIX_SIZE])
+    if needsSniffing(path) and category != BINARY:
+        language = sniffLanguage(path, data) or language
+    counts = countLines(data, language) if language and complete and category != BINARY else [0, 0, 0, 0]
+    return [language] + counts + [digest.hexdigest(), category]
+
+
+def isSkipped(relPath: str) -> bool:
+    """ Hidden and tool directories are left out of the statistics, as the line counter does """
+    return any(part.startswith(".") or part in SKIPPED_DIRS for part in relPath.split(os.sep)[:-1])
+
+
+def _indexFiles(paths: List[str]) -> List[list]:
+    return [indexFile(path) for path in paths]
+
+
+class ProjectIndex:
+    """ Per-project SQLite table of file metadata, reconciled against the tree by (size, mtime) """
+
+    def __init__(self, root: str, path: str = None) -> None:
+        self.root = root
+        self.path = path or indexPath(root)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS dirs;" + SCHEMA)
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "ProjectIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.root)
+
+    def update(
+        self,
+        workers: int = None,
+        progress: Callable[[Tuple[int, int]], None] = None,
+        cancelled: Callable[[], bool] = None) -> Tuple[int, int]:
+        """ Re-indexes new and modified files and drops deleted ones, returns (changed, removed) """
+        known = {path: (size, mtime) for path, size, mtime in self.db.execute("SELECT path, size, mtime FROM files")}
+        vendored = []
+        pending = []
+        seen = set()
+        for path, size, mtime in walkProject(self.root, vendored):
+            relPath = self._relative(path)
+            seen.add(relPath)
+            if known.get(relPath) != (size, mtime):
+                pending.append((path, relPath, size, mtime))
+
+        removed = [path for path in known if path not in seen]
+        with self.db:
+            self.db.execute("DELETE FROM dirs")
+            self.db.executemany(
+                "INSERT INTO dirs (path, category) VALUES (?, ?)",
+                [(self._relative(path), VENDORED) for path in vendored])
+            for i in range(0, len(removed), BATCH_SIZE):
+                self.db.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed[i:i + BATCH_SIZE]])
+
+        if progress:
+            progress((0, len(pending)))
+
+        chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+        if len(pending) < POOL_THRESHOLD or (workers or os.cpu_count() or 1) < 2:
+            indexed = (_indexFiles([path for path, _, _, _ in chunk]) for chunk in chunks)
+            executor = None
+        else:
+            # line counting and language sniffing are pure Python, so only processes run them in
+            # parallel; spawn rather than fork because this runs on a Qt worker thread
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            indexed = executor.map(_indexFiles, [[path for path, _, _, _ in chunk] for chunk in chunks])
+
+        done = 0
+        rows = []
+        try:
+            for chunk, values in zip(chunks, indexed):
+                rows.extend((relPath, size, mtime, *value) for (_, relPath, size, mtime), value in zip(chunk, values))
+                done += len(chunk)
+                if len(rows) >= BATCH_SIZE:
+                    self._write(rows)
+                    rows = []
+                if progress:
+                    progress((done, len(pending)))
+                if cancelled and cancelled():
+                    break
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+            self._write(rows)
+        return done, len(removed)
+
+    def _write(self, rows: list) -> None:
+        if not rows:
+            return
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime, language, total, code, comment, blank, hash, category)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def classification(self) -> Dict[str, str]:
+        query = "SELECT path, category FROM files WHERE category != '' UNION ALL SELECT path, category FROM dirs"
+        return {os.path.join(self.root, path): category for path, category in self.db.execute(query)}
+
+    def summary(self) -> dict:
+        query = "SELECT path, language, total, code, comment, blank FROM files WHERE language IS NOT NULL AND category = ''"
+        summary = {}
+        for path, language, *counts in self.db.execute(query):
+            if isSkipped(path):
+                continue
+            languageStats = summary.setdefault(language, dict.fromkeys(STAT_KEYS, 0))
+            for key, value in zip(STAT_KEYS, counts):
+                languageStats[key] += value
+        return summary
+
+    def sourceFiles(self) -> List[Tuple[str, str]]:
+        """ Returns (relative path, content hash) of the files counted in summary() """
+        query = "SELECT path, hash FROM files WHERE language IS NOT NULL AND category = '' AND hash != ''"
+        return [(path, contentHash) for path, contentHash in self.db.execute(query) if not isSkipped(path)]
+
+    def fingerprint(self) -> str:
+        """ Digest of the paths and content hashes of the files counted in summary() """
+        query = "SELECT path, hash FROM files WHERE language IS NOT NULL AND category = '' ORDER BY path"
+        digest = hashlib.blake2b(digest_size=16)
+        for path, contentHash in self.db.execute(query):
+            if not isSkipped(path):
+                digest.update(f"{path}\0{contentHash}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def languages(self) -> Dict[str, int]:
+        """ Returns {language: bytes}, extensions the line counter does not know are looked up in pygments """
+        mapping = extensionMap()
+        histogram = {}
+        for path, size, language in self.db.execute("SELECT path, size, language FROM files WHERE category = ''"):
+            if isSkipped(path):
+                continue
+            language = language or mapping.get(os.path.splitext(path)[1].lower())
+            if language:
+                histogram[language] = histogram.get(language, 0) + max(size, 1)
+        return histogram
+
+
+def updateIndex(
+    root: str,
+    workers: int = None,
+    progress: Callable[[Tuple[int, int]], None] = None,
+    cancelled: Callable[[], bool] = None) -> ProjectSnapshot:
+    with ProjectIndex(root) as index:
+        changed, removed = index.update(workers, progress, cancelled)
+        return ProjectSnapshot(index.classification(), index.summary(), changed, removed, index.fingerprint())
@@ -0,0 +1,185 @@
+import os
+import json
+import asyncio
+import hashlib
+from typing import Callable, List, Optional, Tuple
+
+from app.common.draft_store import writeJson
+from app.common.llm_client import ChatClient
+from app.common.llm_scheduler import estimateTokens
+from app.common.paths import CACHE_DIR
+from app.common.project_index import ProjectIndex
+
+SUMMARY_VERSION = 1
+CHUNK_TOKENS = 3000
+MAX_CHUNKS_PER_FILE = 4
+MAX_FILES = 300
+MAX_MERGE_ROUNDS = 4
+MAX_SUMMARIES = 5000
+CONCURRENCY = 4
+
+FILE_PROMPT = "你是资深软件工程师。请用不超过80字概括下面这段源代码的作用，只输出概括内容。"
+MERGE_PROMPT = "你是资深软件工程师。下面是一个软件项目中若干文件的概要，请合并为不超过300字的整体说明，涵盖项目用途、主要功能模块和技术特点，只输出说明内容。"
+
+
+def chunkText(text: str, budget: int = CHUNK_TOKENS) -> List[str]:
+    chunks, lines, used = [], [], 0
+    for line in text.splitlines(keepends=True):
+        while estimateTokens(line) > budget:
+            cut = budget * 2
+            while cut > 1 and estimateTokens(line[:cut]) > budget:
+                cut //= 2
+            line, head = line[cut:], line[:cut]
+            if lines:
+                chunks.append("".join(lines))
+                lines, used = [], 0
+            chunks.append(head)
+        cost = estimateTokens(line)
+        if lines and used + cost > budget:
+            chunks.append("".join(lines))
+            lines, used = [], 0
+        lines.append(line)
+        used += cost
+    if lines:
+        chunks.append("".join(lines))
+    return chunks
+
+
+def groupTexts(texts: List[str], budget: int = CHUNK_TOKENS) -> List[List[str]]:
+    groups, group, used = [], [], 0
+    for text in texts:
+        cost = estimateTokens(text)
+        if group and used + cost > budget:
+            groups.append(group)
+            group, used = [], 0
+        group.append(text)
+        used += cost
+    if group:
+        groups.append(group)
+    return groups
+
+
+def selectFiles(root: str) -> List[Tuple[str, str]]:
+    """ Returns (path, content hash) of the shallowest source files, taken from the project index """
+    with ProjectIndex(root) as index:
+        index.update()
+        files = sorted(index.sourceFiles(), key=lambda file: (file[0].count(os.sep), file[0]))
+    return [(os.path.join(root, relPath), contentHash) for relPath, contentHash in files[:MAX_FILES]]
+
+
+def readSource(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", errors="replace")
+
+
+class SummaryStore:
+    """ Summaries keyed by the hash of the text they were produced from, the least recently used are dropped first """
+
+    def __init__(self, path: str = os.path.join(CACHE_DIR, "summaries.json"), maxEntries: int = MAX_SUMMARIES) -> None:
+        self.path = path
+        self.maxEntries = maxEntries
+        self.dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def makeKey(model: str, kind: str, contentHash: str) -> str:
+        return hashlib.blake2b(f"{SUMMARY_VERSION}\0{model}\0{kind}\0{contentHash}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        summary = self.entries.pop(key, None)
+        if summary is not None:
+            # dicts keep insertion order, so the end of the file holds the most recently used entries
+            self.entries[key] = summary
+            self.dirty = True
+        return summary
+
+    def set(self, key: str, summary: str) -> None:
+        self.entries.pop(key, None)
+        self.entries[key] = summary
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+
+        for key in list(self.entries)[:max(0, len(self.entries) - self.maxEntries)]:
+            del self.entries[key]
+        writeJson(self.path, self.entries, indent=None)
+        self.dirty = False
+
+
+class ProjectSummarizer:
+    """ Map-reduce summary of a source tree: chunk files, summarize chunks, merge into a digest """
+
+    def __init__(self, client: ChatClient, store: SummaryStore = None, concurrency: int = CONCURRENCY) -> None:
+        self.client = client
+        self.store = store or SummaryStore()
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def _summarize(self, kind: str, prompt: str, text: str, contentHash: str = None) -> str:
+        contentHash = contentHash or hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        key = self.store.makeKey(self.client.model, kind, contentHash)
+        summary = self.store.get(key)
+        if summary is None:
+            async with self.semaphore:
+                summary = (await self.client.complete(
+                    [{"role": "system", "content": prompt}, {"role": "user", "content": text}],
+                    temperature=0.2)).strip()
+            self.store.set(key, summary)
+        return summary
+
+    async def _summarizeFile(self, root: str, path: str, contentHash: str) -> str:
+        summary = self.store.get(self.store.makeKey(self.client.model, "file", contentHash))
+        if summary is None:
+            text = await asyncio.to_thread(readSource, path)
+            relPath = os.path.relpath(path, root)
+            chunks = chunkText(text)[:MAX_CHUNKS_PER_FILE]
+            if len(chunks) == 1:
+                summary = await self._summarize("file", FILE_PROMPT, f"文件：{relPath}\n\n{chunks[0]}", contentHash)
+            else:
+                parts = await asyncio.gather(*[
+                    self._summarize("chunk", FILE_PROMPT, f"文件：{relPath}（第{index + 1}部分）\n\n{chunk}")
+                    for index, chunk in enumerate(chunks)
+                ])
+                summary = await self._summarize("file", FILE_PROMPT, f"文件：{relPath} 各部分概要：\n" + "\n".join(parts), contentHash)
+        return f"{os.path.relpath(path, root)}：{summary}"
+
+    async def summarize(self, root: str, progress: Callable[[int, int], None] = None) -> str:
+        files = await asyncio.to_thread(selectFiles, root)
+        if not files:
+            return ""
+
+        done = 0
+
+        async def mapFile(file: tuple) -> str:
+            nonlocal done
+            summary = await self._summarizeFile(root, *file)
+            done += 1
+            if progress is not None:
+                progress(done, len(files))
+            return summary
+
+        try:
+            summaries = await asyncio.gather(*[mapFile(file) for file in files])
+            for _ in range(MAX_MERGE_ROUNDS):
+                if len(summaries) == 1 and estimateTokens(summaries[0]) <= CHUNK_TOKENS:
+                    break
+                merged = await asyncio.gather(*[
+                    self._summarize("merge", MERGE_PROMPT, "\n".join(group))
+                    for group in groupTexts(summaries)
+                ])
+                # a merge that does not shrink the text would be sent, and cached, the same way again
+                if sum(map(estimateTokens, merged)) >= sum(map(estimateTokens, summaries)):
+                    break
+                summaries = merged
+            return chunkText("\n".join(summaries))[0]
+        finally:
+            self.store.save()
+
+
+async def summarizeProject(client: ChatClient, root: str, progress: Callable[[int, int], None] = None) -> str:
+    return await ProjectSummarizer(client).summarize(root, progress)
@@ -0,0 +1,40 @@
+import os
+from typing import Callable, List, NamedTuple
+
+
+class Entry(NamedTuple):
+    name: str
+    path: str
+    isDir: bool
+
+
+def scanDirectory(
+    path: str,
+    batchSize: int = 256,
+    progress: Callable[[List[Entry]], None] = None,
+    cancelled: Callable[[], bool] = None) -> List[Entry]:
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    isDir = entry.is_dir()
+                except OSError:
+                    isDir = False
+                entries.append(Entry(entry.name, entry.path, isDir))
+    except OSError:
+        return []
+
+    entries.sort(key=lambda e: e.name)
+
+    if progress:
+        for i in range(0, len(entries), batchSize):
+            if cancelled and cancelled():
+                break
+            progress(entries[i:i + batchSize])
+
+    return entries
+
+
+def scanDirectories(paths: List[str]) -> dict:
+    return {path: scanDirectory(path) for path in paths if os.path.isdir(path)}
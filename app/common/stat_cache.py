@@ -0,0 +1,41 @@
+import os
+import json
+from typing import Any
+
+from app.common.draft_store import writeJson
+from app.common.paths import CACHE_DIR
+
+
+class StatCache:
+
+    def __init__(self, name: str) -> None:
+        self.path = os.path.join(CACHE_DIR, f"{name}.json")
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, path: str, size: int, mtime: int) -> Any:
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime:
+            return entry[2]
+        return None
+
+    def set(self, path: str, size: int, mtime: int, value: Any) -> None:
+        self.entries[path] = [size, mtime, value]
+        self.dirty = True
+
+    def prune(self, paths: set, prefix: str) -> None:
+        for path in [p for p in self.entries if p.startswith(prefix) and p not in paths]:
+            del self.entries[path]
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+
+        writeJson(self.path, self.entries, indent=None)
+        self.dirty = False
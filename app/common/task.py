@@ -0,0 +1,58 @@
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class TaskSignals(QObject):
+
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class Task(QRunnable):
+
+    def __init__(self, fn: Callable[..., Any], *args, hooks: bool = False, **kwargs) -> None:
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self._cancelled = False
+
+        if hooks:
+            self.kwargs.update(progress=self.report, cancelled=self.isCancelled)
+
+    def report(self, value: Any) -> None:
+        if not self._cancelled:
+            self._emit("progress", value)
+
+    def _emit(self, name: str, value: Any) -> None:
+        # the signals object is destroyed with the application, a task still running then has nobody to tell,
+        # and an exception escaping run() would abort the process
+        try:
+            getattr(self.signals, name).emit(value)
+        except RuntimeError:
+            self._cancelled = True
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self._cancelled:
+                self._emit("failed", str(e))
+            return
+
+        if not self._cancelled:
+            self._emit("finished", result)
+
+
+def startTask(task: Task, pool: QThreadPool = None) -> Task:
+    (pool or QThreadPool.globalInstance()).start(task)
+    return task
@@ -0,0 +1,91 @@
+import os
+import hashlib
+from typing import Callable
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QImageReader
+
+from app.common.paths import CACHE_DIR
+
+THUMBNAIL_DIR = os.path.join(CACHE_DIR, "thumbnails")
+SAMPLE_SIZE = 64 * 1024
+FULL_HASH_SIZE = 4 * 1024 * 1024
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def fingerprint(path: str) -> str:
+    """ Hashes small images whole, larger ones by size, mtime and their first and last bytes """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size <= FULL_HASH_SIZE:
+            digest.update(f.read())
+            return digest.hexdigest()
+
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        digest.update(f.read(SAMPLE_SIZE))
+        f.seek(stat.st_size - SAMPLE_SIZE)
+        digest.update(f.read(SAMPLE_SIZE))
+    return digest.hexdigest()
+
+
+def pruneThumbnails(maxBytes: int = MAX_CACHE_BYTES) -> None:
+    """ Deletes the least recently used thumbnails until the cache fits in maxBytes """
+    entries = []
+    try:
+        with os.scandir(THUMBNAIL_DIR) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= maxBytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def loadThumbnail(
+    path: str,
+    maxSize: int = 512,
+    progress: Callable = None,
+    cancelled: Callable[[], bool] = None) -> QImage:
+    cachePath = os.path.join(THUMBNAIL_DIR, f"{fingerprint(path)}-{maxSize}.png")
+    if os.path.exists(cachePath):
+        image = QImage(cachePath)
+        if not image.isNull():
+            # the mtime doubles as the last use for pruning
+            try:
+                os.utime(cachePath)
+            except OSError:
+                pass
+            return image
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    scaled = size.isValid() and (size.width() > maxSize or size.height() > maxSize)
+    if scaled:
+        reader.setScaledSize(size.scaled(maxSize, maxSize, Qt.AspectRatioMode.KeepAspectRatio))
+
+    if cancelled and cancelled():
+        raise InterruptedError("cancelled")
+
+    image = reader.read()
+    if image.isNull():
+        raise OSError(reader.errorString())
+
+    if scaled:
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        if image.save(cachePath, "PNG"):
+            pruneThumbnails()
+    return image
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import shutil
+from typing import List, NamedTuple
+
+from app.common.draft_store import DraftStore, writeJson
+from app.common.paths import CACHE_DIR
+
+INDEX_FILE = "index.json"
+DRAFT_FILE = "draft.json"
+# the single draft kept before applications had their own folders
+LEGACY_DRAFT_FILE = os.path.join(CACHE_DIR, DRAFT_FILE)
+
+
+class Application(NamedTuple):
+    id: str
+    name: str
+    version: str
+    stage: str
+    modified: float
+
+
+class WorkspaceManager:
+    """ Folder of applications listed by a compact index, drafts are only read when opened """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.index = DraftStore(os.path.join(root, INDEX_FILE), indent=None)
+        self.index.load()
+        if not self.index.loaded:
+            self._rebuild()
+
+    @staticmethod
+    def _entry(draft: dict, modified: float) -> dict:
+        appInfo = draft.get("app_info") or {}
+        return {
+            "name": appInfo.get("软件全称", ""),
+            "version": appInfo.get("版本号", ""),
+            "stage": draft.get("page", ""),
+            "modified": modified,
+        }
+
+    def _rebuild(self) -> None:
+        """ Recovers the index from the application folders when the index file is missing or damaged """
+        self.index.clear()
+        with os.scandir(self.root) as it:
+            for entry in it:
+                draftPath = os.path.join(entry.path, DRAFT_FILE)
+                if not entry.is_dir() or not os.path.isfile(draftPath):
+                    continue
+                try:
+                    with open(draftPath, encoding="utf-8") as f:
+                        draft = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if isinstance(draft, dict):
+                    self.index.update(entry.name, self._entry(draft, os.path.getmtime(draftPath)))
+        self.index.flush()
+
+    def importDraft(self, path: str) -> str:
+        """ Moves a draft saved outside the workspace into a new application, returns its id """
+        try:
+            with open(path, encoding="utf-8") as f:
+                draft = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(draft, dict):
+            return None
+
+        modified = os.path.getmtime(path)
+        draft.pop("applicationName", None)
+        appId = self.create()
+        try:
+            writeJson(self.draftPath(appId), draft)
+            # the old draft has to go, or it would be imported again on the next start
+            os.remove(path)
+        except OSError:
+            self.remove(appId)
+            return None
+        self.index.update(appId, self._entry(draft, modified))
+        self.index.flush()
+        return appId
+
+    def applications(self) -> List[Application]:
+        entries = [
+            Application(appId, entry.get("name", ""), entry.get("version", ""), entry.get("stage", ""), entry.get("modified", 0))
+            for appId, entry in self.index.data.items() if isinstance(entry, dict)
+        ]
+        return sorted(entries, key=lambda app: -app.modified)
+
+    def directory(self, appId: str) -> str:
+        return os.path.join(self.root, appId)
+
+    def draftPath(self, appId: str) -> str:
+        return os.path.join(self.directory(appId), DRAFT_FILE)
+
+    def create(self) -> str:
+        appId = time.strftime("%Y%m%d-%H%M%S")
+        suffix = 1
+        while appId in self.index.data or os.path.exists(self.directory(appId)):
+            suffix += 1
+            appId = f"{time.strftime('%Y%m%d-%H%M%S')}-{suffix}"
+        os.makedirs(self.directory(appId))
+        self.index.update(appId, {"name": "", "version": "", "stage": "", "modified": time.time()})
+        return appId
+
+    def touch(self, appId: str, **fields) -> None:
+        """ Updates the index entry of an application, the write is debounced """
+        entry = dict(self.index.data.get(appId) or {})
+        entry.update(fields)
+        entry["modified"] = time.time()
+        self.index.update(appId, entry)
+
+    def remove(self, appId: str) -> None:
+        self.index.remove(appId)
+        shutil.rmtree(self.directory(appId), ignore_errors=True)
+
+    def close(self) -> None:
+        self.index.close()
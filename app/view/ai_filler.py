@@ -0,0 +1,191 @@
+import asyncio
+from typing import Dict, List
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from app.common.config import cfg
+from app.common.async_runner import runner
+from app.common.completion_cache import CompletionCache, projectFingerprint
+from app.common.field_filler import fillField, fillFields, DIGEST_FIELDS, PROMPT_VERSION
+from app.common.llm_client import ChatClient
+from app.common.llm_scheduler import RequestScheduler
+from app.common.project_summarizer import ProjectSummarizer, SummaryStore
+
+
+class AIFiller(QObject):
+
+    fieldStarted = pyqtSignal(str)
+    tokenReceived = pyqtSignal(str, str)
+    fieldFinished = pyqtSignal(str, str)
+    fieldFailed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent=parent)
+        self.client = None
+        self.clientKey = None
+        self.futures = {}
+        self.runIds = {}
+        self.cache = None
+        self.summaryStore = None
+        self.digests = {}
+
+    def _client(self) -> RequestScheduler:
+        key = (
+            cfg.base_url.value, cfg.api_key.value, cfg.model_name.value,
+            cfg.requests_per_second.value, cfg.tokens_per_minute.value
+        )
+        if self.client is None or self.clientKey != key:
+            if self.client is not None:
+                runner().call(self.client.close)
+            self.client = RequestScheduler(ChatClient(*key[:3]), *key[3:])
+            self.clientKey = key
+        return self.client
+
+    def fill(
+        self,
+        fields: List[str],
+        context: Dict[str, str],
+        rootPath: str = None,
+        sourceFingerprint: str = None,
+        regenerate: bool = False) -> None:
+        if self.cache is None:
+            self.cache = CompletionCache()
+            self.summaryStore = SummaryStore()
+
+        client = self._client()
+        fingerprint = runner().submit(asyncio.to_thread(projectFingerprint, rootPath, context, sourceFingerprint))
+        runIds = {}
+        for field in fields:
+            self.cancel(field)
+            self.fieldStarted.emit(field)
+            runIds[field] = self.runIds[field] = self.runIds.get(field, 0) + 1
+
+        if len(fields) == 1:
+            future = runner().submit(
+                self._fillField(client, fields[0], context, rootPath, fingerprint, regenerate, runIds[fields[0]]))
+        else:
+            future = runner().submit(self._fillBatch(client, fields, context, rootPath, fingerprint, regenerate, runIds))
+        for field in fields:
+            self.futures[field] = future
+
+    def _isCurrent(self, field: str, runId: int) -> bool:
+        return self.runIds.get(field) == runId
+
+    async def _withDigest(
+        self,
+        client: RequestScheduler,
+        fields: List[str],
+        context: Dict[str, str],
+        rootPath: str,
+        fingerprint: str) -> Dict[str, str]:
+        if not rootPath or DIGEST_FIELDS.isdisjoint(fields):
+            return context
+
+        key = (client.key(), rootPath, fingerprint)
+        if key not in self.digests:
+            self.digests = {key: asyncio.ensure_future(ProjectSummarizer(client, self.summaryStore).summarize(rootPath))}
+        try:
+            digest = await asyncio.shield(self.digests[key])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.digests.pop(key, None)
+            raise
+        return dict(context, 项目概要=digest) if digest else context
+
+    async def _fillBatch(
+        self,
+        client: RequestScheduler,
+        fields: List[str],
+        context: Dict[str, str],
+        rootPath: str,
+        fingerprint,
+        regenerate: bool,
+        runIds: Dict[str, int]) -> None:
+        pending = list(fields)
+        try:
+            fingerprintValue = await asyncio.wrap_future(fingerprint)
+            if not regenerate:
+                pending = [
+                    field for field in fields
+                    if await asyncio.to_thread(self.cache.get, self._cacheKey(client, fingerprintValue, field)) is None
+                ]
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+
+        batch = None
+        if len(pending) > 1:
+            batch = asyncio.ensure_future(self._requestBatch(client, pending, context, rootPath, fingerprint))
+        try:
+            await asyncio.gather(*[
+                self._fillField(client, field, context, rootPath, fingerprint, regenerate, runIds[field], batch)
+                for field in fields
+            ])
+        finally:
+            if batch is not None:
+                batch.cancel()
+
+    async def _requestBatch(
+        self,
+        client: RequestScheduler,
+        fields: List[str],
+        context: Dict[str, str],
+        rootPath: str,
+        fingerprint) -> Dict[str, str]:
+        fingerprint = await asyncio.wrap_future(fingerprint)
+        context = await self._withDigest(client, fields, context, rootPath, fingerprint)
+        return await fillFields(client, fields, context)
+
+    @staticmethod
+    def _cacheKey(client: RequestScheduler, fingerprint: str, field: str) -> str:
+        return CompletionCache.makeKey(client.model, client.baseUrl, PROMPT_VERSION, fingerprint, field)
+
+    async def _fillField(
+        self,
+        client: RequestScheduler,
+        field: str,
+        context: Dict[str, str],
+        rootPath: str,
+        fingerprint,
+        regenerate: bool,
+        runId: int,
+        batch: asyncio.Future = None) -> None:
+        def onToken(field: str, token: str) -> None:
+            if self._isCurrent(field, runId):
+                self.tokenReceived.emit(field, token)
+
+        try:
+            fingerprint = await asyncio.wrap_future(fingerprint)
+            key = self._cacheKey(client, fingerprint, field)
+            text = None if regenerate else await asyncio.to_thread(self.cache.get, key)
+            if text is None:
+                if batch is not None:
+                    try:
+                        text = (await asyncio.shield(batch)).get(field)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        text = None
+                if not text:
+                    fieldContext = await self._withDigest(client, [field], context, rootPath, fingerprint)
+                    text = await fillField(client, field, fieldContext, onToken)
+                if text:
+                    await asyncio.to_thread(self.cache.put, key, text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self._isCurrent(field, runId):
+                self.fieldFailed.emit(field, str(e))
+        else:
+            if self._isCurrent(field, runId):
+                self.fieldFinished.emit(field, text)
+
+    def cancel(self, field: str) -> None:
+        future = self.futures.pop(field, None)
+        if future is not None and future not in self.futures.values():
+            future.cancel()
+
+    def isRunning(self) -> bool:
+        return any(not future.done() for future in self.futures.values())
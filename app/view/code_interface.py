@@ -1,13 +1,23 @@
 import os
 
 import qfluentwidgets as qfw
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QTimer, QFileSystemWatcher
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QFileDialog, QFrame, QTreeWidgetItem
 
 import app.view.custom_widget as custom
+from app.common.classifier import categoryFor, CATEGORY_LABELS
+from app.common.project_index import updateIndex
+from app.common.scanner import scanDirectory, scanDirectories
+from app.common.task import Task, startTask
+
 
 class CodeInterface(QWidget):
 
+    LOADED_ROLE = Qt.ItemDataRole.UserRole + 1
+    REFRESH_DELAY = 200
+    INDEX_DELAY = 2000
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent=parent)
         self._parent = parent
@@ -41,13 +51,35 @@ class CodeInterface(QWidget):
         self.treeWidget.setHeaderHidden(True)
         self.treeWidget.hide()
         self.treeWidget.itemClicked.connect(self._onTreeItemClicked)
+        self.treeWidget.itemExpanded.connect(self._onItemExpanded)
         self.leftLayout.addWidget(self.treeWidget)
         
         self.customArea = custom.FileUploadArea(self.leftContainer)
         self.customArea.fileMoved.connect(self._refreshTree)
+        self.customArea.ingestFailed.connect(self._onIngestFailed)
         self.leftLayout.addWidget(self.customArea, 0, Qt.AlignmentFlag.AlignBottom)
         
         self.currentRootPath = None
+        self.classification = {}
+        self.lineSummary = None
+        self.sourceFingerprint = None
+        self._indexTask = None
+        self._dirItems = {}
+        self._scanTasks = {}
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._onDirectoryChanged)
+        self._pendingDirs = set()
+        self._refreshTask = None
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.setSingleShot(True)
+        self.refreshTimer.setInterval(self.REFRESH_DELAY)
+        self.refreshTimer.timeout.connect(self._applyPendingChanges)
+        # every index update walks the whole tree, so bursts of refreshes share one
+        self.indexTimer = QTimer(self)
+        self.indexTimer.setSingleShot(True)
+        self.indexTimer.setInterval(self.INDEX_DELAY)
+        self.indexTimer.timeout.connect(self._updateIndex)
 
     def _onOpenFolderClicked(self) -> None:
         folderPath = QFileDialog.getExistingDirectory(self, "选择文件夹")
@@ -59,35 +91,216 @@ class CodeInterface(QWidget):
             self._populateTree(folderPath)
 
     def _populateTree(self, path: str) -> None:
+        for task in self._scanTasks.values():
+            task.cancel()
+        if self._refreshTask is not None:
+            self._refreshTask.cancel()
+            self._refreshTask = None
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.refreshTimer.stop()
+        self.indexTimer.stop()
+        self._pendingDirs.clear()
+        self._scanTasks.clear()
+        self._dirItems.clear()
         self.treeWidget.clear()
-        
-        def addItems(parent_item, current_path: str):
-            try:
-                entries = sorted(os.listdir(current_path))
-            except OSError:
-                return
-
-            for entry in entries:
-                full_path = os.path.join(current_path, entry)
-                item = QTreeWidgetItem([entry])
-                item.setData(0, Qt.ItemDataRole.UserRole, full_path)
-                
-                if parent_item:
-                    parent_item.addChild(item)
-                else:
-                    self.treeWidget.addTopLevelItem(item)
-                
-                if os.path.isdir(full_path):
-                    addItems(item, full_path)
-        
-        addItems(None, path)
+        self.classification = {}
+        self.lineSummary = None
+        self.sourceFingerprint = None
+
+        self._dirItems[path] = None
+        self.treeWidget.addTopLevelItem(self._createPlaceholder())
+        self._loadChildren(path)
+        self._updateIndex()
+
+    def _updateIndex(self) -> None:
+        if self._indexTask is not None:
+            self._indexTask.cancel()
+
+        rootPath = self.currentRootPath
+        self._indexTask = Task(updateIndex, rootPath, hooks=True)
+        self._indexTask.signals.finished.connect(lambda snapshot: self._onIndexUpdated(rootPath, snapshot))
+        self._indexTask.signals.failed.connect(lambda _: setattr(self, "_indexTask", None))
+        startTask(self._indexTask)
+
+    def _onIndexUpdated(self, rootPath: str, snapshot) -> None:
+        self._indexTask = None
+        if rootPath != self.currentRootPath:
+            return
+
+        self.classification = snapshot.classification
+        self.lineSummary = snapshot.summary
+        self.sourceFingerprint = snapshot.fingerprint
+        self.treeWidget.setUpdatesEnabled(False)
+        for path, parent in self._dirItems.items():
+            for item in self._childItems(parent):
+                self._markItem(item)
+        self.treeWidget.setUpdatesEnabled(True)
+
+    def _markItem(self, item: QTreeWidgetItem) -> None:
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        if path is None:
+            return
+
+        category = categoryFor(path, self.classification, self.currentRootPath)
+        if category:
+            item.setForeground(0, QColor(128, 128, 128))
+            item.setToolTip(0, CATEGORY_LABELS[category])
+        elif item.toolTip(0):
+            item.setData(0, Qt.ItemDataRole.ForegroundRole, None)
+            item.setToolTip(0, "")
+
+    def _createItem(self, name: str, path: str, isDir: bool) -> QTreeWidgetItem:
+        item = QTreeWidgetItem([name])
+        item.setData(0, Qt.ItemDataRole.UserRole, path)
+        if isDir:
+            item.setData(0, self.LOADED_ROLE, False)
+            item.addChild(self._createPlaceholder())
+        if self.classification:
+            self._markItem(item)
+        return item
+
+    @staticmethod
+    def _createPlaceholder() -> QTreeWidgetItem:
+        item = QTreeWidgetItem(["加载中..."])
+        item.setDisabled(True)
+        return item
+
+    def _onItemExpanded(self, item: QTreeWidgetItem) -> None:
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        if item.data(0, self.LOADED_ROLE) is False and path not in self._scanTasks:
+            self._dirItems[path] = item
+            self._loadChildren(path)
+
+    def _loadChildren(self, path: str) -> None:
+        self.watcher.addPath(path)
+        task = Task(scanDirectory, path, hooks=True)
+        task.signals.progress.connect(lambda entries: self._onEntriesScanned(path, entries))
+        task.signals.finished.connect(lambda _: self._onScanFinished(path))
+        task.signals.failed.connect(lambda _: self._onScanFinished(path))
+        self._scanTasks[path] = startTask(task)
+
+    def _onEntriesScanned(self, path: str, entries: list) -> None:
+        if path not in self._dirItems:
+            return
+
+        items = [self._createItem(*entry) for entry in entries]
+        parent = self._dirItems[path]
+        if parent is None:
+            self.treeWidget.addTopLevelItems(items)
+        else:
+            parent.addChildren(items)
+
+    def _onScanFinished(self, path: str) -> None:
+        self._scanTasks.pop(path, None)
+        if path not in self._dirItems:
+            return
+
+        parent = self._dirItems[path]
+        if parent is None:
+            placeholder = self.treeWidget.topLevelItem(0)
+            if placeholder is not None and placeholder.data(0, Qt.ItemDataRole.UserRole) is None:
+                self.treeWidget.takeTopLevelItem(0)
+        else:
+            placeholder = parent.child(0)
+            if placeholder is not None and placeholder.data(0, Qt.ItemDataRole.UserRole) is None:
+                parent.removeChild(placeholder)
+            parent.setData(0, self.LOADED_ROLE, True)
 
     def _refreshTree(self) -> None:
         if self.currentRootPath:
-            self._populateTree(self.currentRootPath)
+            for path in self._dirItems:
+                self._onDirectoryChanged(path)
+
+    def _onDirectoryChanged(self, path: str) -> None:
+        if path in self._dirItems:
+            self._pendingDirs.add(path)
+            self.refreshTimer.start()
+
+    def _applyPendingChanges(self) -> None:
+        if self._refreshTask is not None:
+            self.refreshTimer.start()
+            return
+
+        paths = [path for path in self._pendingDirs if path in self._dirItems and path not in self._scanTasks]
+        self._pendingDirs.difference_update(paths)
+        if self._pendingDirs:
+            self.refreshTimer.start()
+        if not paths:
+            return
+
+        self._refreshTask = Task(scanDirectories, paths)
+        self._refreshTask.signals.finished.connect(self._onRefreshScanned)
+        self._refreshTask.signals.failed.connect(lambda _: setattr(self, "_refreshTask", None))
+        startTask(self._refreshTask)
+
+    def _onRefreshScanned(self, results: dict) -> None:
+        self._refreshTask = None
+        self.treeWidget.setUpdatesEnabled(False)
+        for path, entries in results.items():
+            if path in self._dirItems:
+                self._applyDiff(self._dirItems[path], entries)
+        self.treeWidget.setUpdatesEnabled(True)
+        self.indexTimer.start()
+
+    def _childItems(self, parent: QTreeWidgetItem) -> list:
+        if parent is None:
+            return [self.treeWidget.topLevelItem(i) for i in range(self.treeWidget.topLevelItemCount())]
+        return [parent.child(i) for i in range(parent.childCount())]
+
+    def _applyDiff(self, parent: QTreeWidgetItem, entries: list) -> None:
+        existing = {
+            item.text(0): item for item in self._childItems(parent)
+            if item.data(0, Qt.ItemDataRole.UserRole) is not None
+        }
+
+        kinds = {entry.name: entry.isDir for entry in entries}
+        for name, item in list(existing.items()):
+            if kinds.get(name) != (item.data(0, self.LOADED_ROLE) is not None):
+                self._removeItem(parent, item)
+                del existing[name]
+
+        for index, entry in enumerate(entries):
+            if entry.name in existing:
+                continue
+            item = self._createItem(*entry)
+            if parent is None:
+                self.treeWidget.insertTopLevelItem(index, item)
+            else:
+                parent.insertChild(index, item)
+
+    def _removeItem(self, parent: QTreeWidgetItem, item: QTreeWidgetItem) -> None:
+        self._forgetDirectory(item.data(0, Qt.ItemDataRole.UserRole))
+        if parent is None:
+            self.treeWidget.takeTopLevelItem(self.treeWidget.indexOfTopLevelItem(item))
+        else:
+            parent.removeChild(item)
+
+    def _forgetDirectory(self, path: str) -> None:
+        prefix = os.path.join(path, "")
+        for dirPath in [p for p in self._dirItems if p == path or p.startswith(prefix)]:
+            del self._dirItems[dirPath]
+            self._pendingDirs.discard(dirPath)
+            self.watcher.removePath(dirPath)
+            task = self._scanTasks.pop(dirPath, None)
+            if task is not None:
+                task.cancel()
+
+    def _onIngestFailed(self, error: str) -> None:
+        qfw.InfoBar.error(
+            title="提示",
+            content=f"导入失败：{error}",
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            duration=3000,
+            position=qfw.InfoBarPosition.TOP_RIGHT,
+            parent=self
+        )
 
     def _onTreeItemClicked(self, item: QTreeWidgetItem, column: int) -> None:
         path = item.data(0, Qt.ItemDataRole.UserRole)
+        if path is None:
+            return
         self._showFileInfo(path)
 
     def _showFileInfo(self, path: str) -> None:
@@ -1,18 +1,21 @@
 import os
 import time
-import shutil
+import weakref
 from typing import Union
 
 import qfluentwidgets as qfw
-import qfluentwidgets.multimedia as multimedia
 
-from PyQt6.QtCore import Qt, QRectF, pyqtSignal, QUrl, QSize
-from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QVBoxLayout, QWidget, QFileDialog, QStackedWidget
-from PyQt6.QtGui import QColor, QIcon, QPainter, QPixmap, QDesktopServices, QFont, QDragEnterEvent, QDropEvent, QMouseEvent, QImage
+from PyQt6.QtCore import Qt, QRectF, pyqtSignal, QUrl, QSize, QThreadPool
+from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QVBoxLayout, QWidget, QFileDialog, QStackedWidget, QAbstractScrollArea
+from PyQt6.QtGui import QColor, QIcon, QPainter, QPixmap, QDesktopServices, QFont, QDragEnterEvent, QDropEvent, QMouseEvent, QImage, QFontMetrics, QPixmapCache
 
-from pygments import highlight
-from pygments.formatters import HtmlFormatter
-from pygments.lexers import get_lexer_for_filename
+from app.common.ingest import ingest
+from app.common.languages import LANGUAGE_TAGS
+from app.common.line_index import LineIndex, buildLineIndex
+from app.common.pdf_reader import prepareMaterial
+from app.common.memory_cache import LRUCache
+from app.common.thumbnail import loadThumbnail
+from app.common.task import Task, startTask
 
 
 def drawIcon(icon: Union[str, QIcon, qfw.FluentIconBase], painter: QPainter, rect: QRectF, state: QIcon.State = QIcon.State.Off, **attributes) -> None:
@@ -25,15 +28,114 @@ def drawIcon(icon: Union[str, QIcon, qfw.FluentIconBase], painter: QPainter, rec
         icon.paint(painter, QRectF(rect).toRect(), Qt.AlignmentFlag.AlignCenter, state=state)
 
 
+class BackgroundCache:
+
+    PATH = r"./resources/background.png"
+    OPACITY = 0.08
+    source = None
+
+    @classmethod
+    def pixmap(cls, size: QSize, ratio: float) -> QPixmap:
+        key = f"background-{size.width()}x{size.height()}@{ratio}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+
+        if cls.source is None:
+            cls.source = QPixmap(cls.PATH)
+
+        scaled = cls.source.scaled(size * ratio, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = QPixmap(scaled.size())
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setOpacity(cls.OPACITY)
+        painter.drawPixmap(0, 0, scaled)
+        painter.end()
+        pixmap.setDevicePixelRatio(ratio)
+
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+
+class CardChromeCache:
+
+    enabled = True
+    keys = set()
+    connected = False
+    # bytes of the pixmap each live card currently uses, for sizing QPixmapCache
+    widgetBytes = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def render(cls, painter: QPainter, rect, dark: bool) -> None:
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+        if dark:
+            painter.setBrush(QColor(255, 255, 255, 13))
+            painter.setPen(QColor(0, 0, 0, 50))
+        else:
+            painter.setBrush(QColor(255, 255, 255, 170))
+            painter.setPen(QColor(0, 0, 0, 19))
+        painter.drawRoundedRect(rect, 6, 6)
+
+    @classmethod
+    def pixmap(cls, size: QSize, ratio: float, dark: bool, bottom: int) -> QPixmap:
+        key = f"card-{size.width()}x{size.height()}@{ratio}-{int(dark)}{bottom}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+
+        if not cls.connected:
+            qfw.qconfig.themeChanged.connect(cls.invalidate)
+            cls.connected = True
+
+        pixmap = QPixmap(size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        cls.render(painter, QRectF(0, 0, size.width(), size.height()).adjusted(1, 1, -1, bottom), dark)
+        painter.end()
+
+        QPixmapCache.insert(key, pixmap)
+        cls.keys.add(key)
+        return pixmap
+
+    @classmethod
+    def draw(cls, widget: QWidget, bottom: int = -1) -> None:
+        painter = QPainter(widget)
+        if not cls.enabled:
+            cls.render(painter, QRectF(widget.rect().adjusted(1, 1, -1, bottom)), qfw.isDarkTheme())
+            return
+        pixmap = cls.pixmap(widget.size(), widget.devicePixelRatioF(), qfw.isDarkTheme(), bottom)
+        painter.drawPixmap(0, 0, pixmap)
+
+        size = pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        if cls.widgetBytes.get(widget) != size:
+            cls.widgetBytes[widget] = size
+            cls.reserve(sum(cls.widgetBytes.values()))
+
+    @staticmethod
+    def reserve(size: int) -> None:
+        """ Raises the QPixmapCache limit so every live card fits twice, leaving room for one resize """
+        limit = size * 2 // 1024
+        if limit > QPixmapCache.cacheLimit():
+            QPixmapCache.setCacheLimit(limit)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        for key in cls.keys:
+            QPixmapCache.remove(key)
+        cls.keys.clear()
+
+
 class BaseSubPage(QWidget):
     
     nextSignal = pyqtSignal()
     prevSignal = pyqtSignal()
+    draftChanged = pyqtSignal()
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self._parent = parent
-        self.backgroundPixmap = QPixmap(r"./resources/background.png")
+        self.backgroundPixmap = None
         
         self.vBoxLayout = QVBoxLayout(self)
         self.vBoxLayout.setSpacing(20)
@@ -67,6 +169,12 @@ class BaseSubPage(QWidget):
         
         self.vBoxLayout.addLayout(self.buttonLayout)
 
+    def draft(self) -> dict:
+        return {}
+
+    def restoreDraft(self, draft: dict) -> None:
+        pass
+
     def show_info(
         self, 
         title: str = "提示",
@@ -109,17 +217,20 @@ class BaseSubPage(QWidget):
             parent=self._parent
         )
 
+    def resizeEvent(self, e) -> None:
+        super().resizeEvent(e)
+        self.backgroundPixmap = BackgroundCache.pixmap(self.size(), self.devicePixelRatioF())
+
     def paintEvent(self, e) -> None:
         super().paintEvent(e)
+        if self.backgroundPixmap is None:
+            return
+
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        painter.setOpacity(0.08)
-        
-        pixmap = self.backgroundPixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        x = int((self.width() - pixmap.width()) / 2)
-        y = int((self.height() - pixmap.height()) / 2)
-        painter.drawPixmap(x, y, pixmap)
+        size = self.backgroundPixmap.deviceIndependentSize()
+        x = int((self.width() - size.width()) / 2)
+        y = int((self.height() - size.height()) / 2)
+        painter.drawPixmap(x, y, self.backgroundPixmap)
 
 
 class IdentityCard(qfw.ElevatedCardWidget):
@@ -161,6 +272,7 @@ class SettingIconWidget(qfw.IconWidget):
 class EditSettingCard(QFrame):
 
     clicked = pyqtSignal()
+    regenerateClicked = pyqtSignal()
 
     def __init__(self, icon: Union[str, QIcon, qfw.FluentIconBase], title: str, content: str = None, parent=None, text: str = "AI自动填写") -> None:
         super().__init__(parent=parent)
@@ -217,27 +329,24 @@ class EditSettingCard(QFrame):
         qfw.FluentStyleSheet.SETTING_CARD.apply(self)
 
         self.button = qfw.PushButton(text, self, qfw.FluentIcon.EDIT)
+        self.regenerateButton = qfw.TransparentToolButton(qfw.FluentIcon.SYNC, self)
+        self.regenerateButton.setToolTip("重新生成")
+        self.topLayout.addWidget(self.regenerateButton, 0, Qt.AlignmentFlag.AlignRight)
+        self.topLayout.addSpacing(8)
         self.topLayout.addWidget(self.button, 0, Qt.AlignmentFlag.AlignRight)
         self.topLayout.addSpacing(16)
         self.button.clicked.connect(self.clicked)
+        self.regenerateButton.clicked.connect(self.regenerateClicked)
 
     def paintEvent(self, e) -> None:
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
-
-        if qfw.isDarkTheme():
-            painter.setBrush(QColor(255, 255, 255, 13))
-            painter.setPen(QColor(0, 0, 0, 50))
-        else:
-            painter.setBrush(QColor(255, 255, 255, 170))
-            painter.setPen(QColor(0, 0, 0, 19))
-
-        painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 6, 6)
+        CardChromeCache.draw(self)
 
 
 class DevLanguageCard(QFrame):
 
     clicked = pyqtSignal()
+    regenerateClicked = pyqtSignal()
+    detectClicked = pyqtSignal()
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent=parent)
@@ -278,13 +387,13 @@ class DevLanguageCard(QFrame):
         
         self.mainLayout.addWidget(self.topWidget)
 
-        self.tags = ["Assembly language", "C", "C#", "C++", "Delphi/Object Pascal", "Go", "HTML",
-                     "Java", "JavaScript", "MATLAB", "Objective-C", "PHP", "PL/SQL", "Perl",
-                     "Python", "R", "Ruby", "SQL", "Swift", "Visual Basic", "Visual Basic .Net"] 
+        self.tags = LANGUAGE_TAGS
+        self.tagButtons = {}
         self.tagLayout = qfw.FlowLayout()
         self.tagLayout.setContentsMargins(16, 0, 16, 0)
         for tag in self.tags:
-            self.tagLayout.addWidget(qfw.ToggleButton(tag))
+            self.tagButtons[tag] = qfw.ToggleButton(tag)
+            self.tagLayout.addWidget(self.tagButtons[tag])
 
         self.mainLayout.addLayout(self.tagLayout)
         
@@ -300,28 +409,37 @@ class DevLanguageCard(QFrame):
         self.contentLabel.setObjectName('contentLabel')
         qfw.FluentStyleSheet.SETTING_CARD.apply(self)
 
+        self.detectButton = qfw.PushButton("自动识别", self, qfw.FluentIcon.SEARCH)
         self.button = qfw.PushButton("AI自动填写", self, qfw.FluentIcon.EDIT)
+        self.regenerateButton = qfw.TransparentToolButton(qfw.FluentIcon.SYNC, self)
+        self.regenerateButton.setToolTip("重新生成")
+        self.topLayout.addWidget(self.detectButton, 0, Qt.AlignmentFlag.AlignRight)
+        self.topLayout.addSpacing(16)
+        self.topLayout.addWidget(self.regenerateButton, 0, Qt.AlignmentFlag.AlignRight)
+        self.topLayout.addSpacing(8)
         self.topLayout.addWidget(self.button, 0, Qt.AlignmentFlag.AlignRight)
         self.topLayout.addSpacing(16)
+        self.detectButton.clicked.connect(self.detectClicked)
         self.button.clicked.connect(self.clicked)
+        self.regenerateButton.clicked.connect(self.regenerateClicked)
 
-    def paintEvent(self, e) -> None:
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+    def checkedTags(self) -> list:
+        return [tag for tag, button in self.tagButtons.items() if button.isChecked()]
 
-        if qfw.isDarkTheme():
-            painter.setBrush(QColor(255, 255, 255, 13))
-            painter.setPen(QColor(0, 0, 0, 50))
-        else:
-            painter.setBrush(QColor(255, 255, 255, 170))
-            painter.setPen(QColor(0, 0, 0, 19))
+    def setLanguages(self, tags: list, others: list) -> None:
+        for tag, button in self.tagButtons.items():
+            button.setChecked(tag in tags)
+        if others and not self.plainTextEdit.toPlainText().strip():
+            self.plainTextEdit.setPlainText("、".join(others))
 
-        painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 6, 6)
+    def paintEvent(self, e) -> None:
+        CardChromeCache.draw(self)
 
 
 class FeaturesCard(QFrame):
 
     clicked = pyqtSignal()
+    regenerateClicked = pyqtSignal()
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent=parent)
@@ -364,10 +482,12 @@ class FeaturesCard(QFrame):
 
         self.tags = ["APP", "游戏软件", "教育软件", "金融软件", "医疗软件", "地理信息软件", "云计算软件", "信息安全软件",
                      "大数据软件", "人工智能软件", "VR软件", "5G软件", "小程序", "物联网软件", "智慧城市软件"] 
+        self.tagButtons = {}
         self.tagLayout = qfw.FlowLayout()
         self.tagLayout.setContentsMargins(16, 0, 16, 0)
         for tag in self.tags:
-            self.tagLayout.addWidget(qfw.ToggleButton(tag))
+            self.tagButtons[tag] = qfw.ToggleButton(tag)
+            self.tagLayout.addWidget(self.tagButtons[tag])
 
         self.mainLayout.addLayout(self.tagLayout)
         
@@ -384,22 +504,20 @@ class FeaturesCard(QFrame):
         qfw.FluentStyleSheet.SETTING_CARD.apply(self)
 
         self.button = qfw.PushButton("AI自动填写", self, qfw.FluentIcon.EDIT)
+        self.regenerateButton = qfw.TransparentToolButton(qfw.FluentIcon.SYNC, self)
+        self.regenerateButton.setToolTip("重新生成")
+        self.topLayout.addWidget(self.regenerateButton, 0, Qt.AlignmentFlag.AlignRight)
+        self.topLayout.addSpacing(8)
         self.topLayout.addWidget(self.button, 0, Qt.AlignmentFlag.AlignRight)
         self.topLayout.addSpacing(16)
         self.button.clicked.connect(self.clicked)
+        self.regenerateButton.clicked.connect(self.regenerateClicked)
 
-    def paintEvent(self, e) -> None:
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+    def checkedTags(self) -> list:
+        return [tag for tag, button in self.tagButtons.items() if button.isChecked()]
 
-        if qfw.isDarkTheme():
-            painter.setBrush(QColor(255, 255, 255, 13))
-            painter.setPen(QColor(0, 0, 0, 50))
-        else:
-            painter.setBrush(QColor(255, 255, 255, 170))
-            painter.setPen(QColor(0, 0, 0, 19))
-
-        painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 6, 6)
+    def paintEvent(self, e) -> None:
+        CardChromeCache.draw(self)
 
 
 class FileCard(QFrame):
@@ -434,6 +552,9 @@ class FileCard(QFrame):
         self.infoLayout.addWidget(self.nameLabel)
         self.infoLayout.addWidget(self.pathLabel)
 
+        self.pageLabel = QLabel(self)
+        self.pageLabel.setStyleSheet("font-size: 12px; color: gray;")
+
         self.deleteBtn = qfw.TransparentToolButton(qfw.FluentIcon.CLOSE, self)
         self.deleteBtn.setFixedSize(24, 24)
         self.deleteBtn.setIconSize(QSize(16, 16))
@@ -443,22 +564,22 @@ class FileCard(QFrame):
         self.hBoxLayout.addWidget(self.iconBtn)
         self.hBoxLayout.addWidget(self.infoWidget)
         self.hBoxLayout.addStretch(1)
+        self.hBoxLayout.addWidget(self.pageLabel, 0, Qt.AlignmentFlag.AlignVCenter)
         self.hBoxLayout.addWidget(self.deleteBtn)
         
         self.setFixedHeight(72)
         
     def paintEvent(self, e) -> None:
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+        CardChromeCache.draw(self, bottom=-9)
 
-        if qfw.isDarkTheme():
-            painter.setBrush(QColor(255, 255, 255, 13))
-            painter.setPen(QColor(0, 0, 0, 50))
-        else:
-            painter.setBrush(QColor(255, 255, 255, 170))
-            painter.setPen(QColor(0, 0, 0, 19))
+    def setFilePath(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.nameLabel.setText(os.path.basename(file_path))
+        self.pathLabel.setText(file_path)
 
-        painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -9), 6, 6)
+    def setPageInfo(self, text: str, toolTip: str = "") -> None:
+        self.pageLabel.setText(text)
+        self.pageLabel.setToolTip(toolTip)
 
     def open_file(self) -> None:
         QDesktopServices.openUrl(QUrl.fromLocalFile(self.file_path))
@@ -470,9 +591,21 @@ class FileCard(QFrame):
 
 class FileUploadCard(QFrame):
 
-    def __init__(self, icon: Union[str, QIcon, qfw.FluentIconBase], title: str, content: str = None, parent=None):
+    filesChanged = pyqtSignal()
+
+    def __init__(
+        self,
+        icon: Union[str, QIcon, qfw.FluentIconBase],
+        title: str,
+        content: str = None,
+        parent=None,
+        keepPages: int = None,
+        outputDir: str = None):
         super().__init__(parent=parent)
         self._parent = parent
+        self.keepPages = keepPages
+        self.outputDir = outputDir
+        self.inspectTasks = {}
         self.iconLabel = SettingIconWidget(icon, self)
         self.titleLabel = QLabel(title, self)
         self.contentLabel = QLabel(content, self)
@@ -524,37 +657,71 @@ class FileUploadCard(QFrame):
         self.button.clicked.connect(self.upload_file)
 
     def paintEvent(self, e) -> None:
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
-
-        if qfw.isDarkTheme():
-            painter.setBrush(QColor(255, 255, 255, 13))
-            painter.setPen(QColor(0, 0, 0, 50))
-        else:
-            painter.setBrush(QColor(255, 255, 255, 170))
-            painter.setPen(QColor(0, 0, 0, 19))
-
-        painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 6, 6)
+        CardChromeCache.draw(self)
 
     def upload_file(self) -> None:
         fname, _ = QFileDialog.getOpenFileName(self, "选择文件", "", "PDF Files (*.pdf)")
         if fname:
-            if fname in self.fileLayoutContent:
-                return
-            
-            self.fileLayoutContent.append(fname)
-            card = FileCard(fname, self)
-            card.removed.connect(self.remove_file)
-            self.fileLayout.addWidget(card)
+            self.add_file(fname)
+
+    def add_file(self, fname: str) -> None:
+        if fname in self.fileLayoutContent:
+            return
+
+        self.fileLayoutContent.append(fname)
+        self.filesChanged.emit()
+        card = FileCard(fname, self)
+        card.removed.connect(self.remove_file)
+        self.fileLayout.addWidget(card)
+
+        card.setPageInfo("正在读取页数...")
+        task = Task(prepareMaterial, fname, self.keepPages, self.outputDir, hooks=True)
+        task.signals.progress.connect(lambda page: card.setPageInfo(f"正在截取 {page}/{self.keepPages * 2}"))
+        task.signals.finished.connect(lambda result: self._onInspected(card, fname, result))
+        task.signals.failed.connect(lambda error: self._onInspectFailed(card, fname, error))
+        self.inspectTasks[fname] = startTask(task)
+
+    def _onInspected(self, card: FileCard, fname: str, result: tuple) -> None:
+        self.inspectTasks.pop(fname, None)
+        path, pages, originalPages = result
+        if fname not in self.fileLayoutContent:
+            self._removeTrimmed(path)
+            return
+        if path != fname:
+            self.fileLayoutContent[self.fileLayoutContent.index(fname)] = path
+            self.filesChanged.emit()
+            card.setFilePath(path)
+            card.setPageInfo(f"共 {pages} 页", f"原文档共 {originalPages} 页，已截取前后各 {self.keepPages} 页")
+        else:
+            card.setPageInfo(f"共 {pages} 页")
+
+    def _onInspectFailed(self, card: FileCard, fname: str, error: str) -> None:
+        self.inspectTasks.pop(fname, None)
+        card.setPageInfo("无法读取页数", error)
 
     def remove_file(self, file_path: str) -> None:
+        task = self.inspectTasks.pop(file_path, None)
+        if task is not None:
+            task.cancel()
         if file_path in self.fileLayoutContent:
             self.fileLayoutContent.remove(file_path)
+            self.filesChanged.emit()
+        self._removeTrimmed(file_path)
+
+    def _removeTrimmed(self, path: str) -> None:
+        """ Deletes a trimmed copy, only files this card wrote to its output folder are touched """
+        if not self.outputDir or os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.outputDir):
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 
 class FileUploadArea(QFrame):
 
     fileMoved = pyqtSignal()
+    ingestFailed = pyqtSignal(str)
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent=parent)
@@ -567,10 +734,22 @@ class FileUploadArea(QFrame):
         self.label.setPixmap(QPixmap(r"./resources/copyright.png"))
         self.label.setScaledContents(True)
         self.vBoxLayout.addWidget(self.label)
+
+        self.progressLayout = QHBoxLayout()
+        self.progressBar = qfw.ProgressBar(self)
+        self.progressBar.hide()
+        self.cancelButton = qfw.TransparentToolButton(qfw.FluentIcon.CLOSE, self)
+        self.cancelButton.setToolTip("取消")
+        self.cancelButton.hide()
+        self.cancelButton.clicked.connect(self.cancelIngest)
+        self.progressLayout.addWidget(self.progressBar, 1)
+        self.progressLayout.addWidget(self.cancelButton)
+        self.vBoxLayout.addLayout(self.progressLayout)
         
         self.treeWidget = None
         self.rootPath = None
         self.enabled = False
+        self.ingestTask = None
 
     def setContext(self, treeWidget: qfw.TreeWidget, rootPath: str) -> None:
         self.treeWidget = treeWidget
@@ -578,43 +757,67 @@ class FileUploadArea(QFrame):
         self.enabled = True
 
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:
-        if self.enabled and event.mimeData().hasUrls():
+        if self.enabled and self.ingestTask is None and event.mimeData().hasUrls():
             event.accept()
         else:
             event.ignore()
 
     def dropEvent(self, event: QDropEvent) -> None:
-        if not self.enabled or not self.rootPath:
+        if not self.enabled or not self.rootPath or self.ingestTask is not None:
             return
 
-        targetPath = self._getCurrentTargetDir()
-        
-        files_moved = False
-        for url in event.mimeData().urls():
-            srcPath = url.toLocalFile()
-            if os.path.exists(srcPath):
-                dstPath = os.path.join(targetPath, os.path.basename(srcPath))
-                if srcPath != dstPath:
-                    shutil.copy(srcPath, dstPath)
-                    files_moved = True
-        
-        if files_moved:
-            self.fileMoved.emit()
+        sources = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if sources:
+            self._startIngest(sources, self._getCurrentTargetDir(), False)
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
-        if not self.enabled or not self.rootPath:
+        if not self.enabled or not self.rootPath or self.ingestTask is not None:
             return
             
         filePath, _ = QFileDialog.getOpenFileName(self, "选择文件")
         if filePath:
-            targetPath = self._getCurrentTargetDir()
-            dstPath = os.path.join(targetPath, os.path.basename(filePath))
-            if filePath != dstPath:
-                shutil.move(filePath, dstPath)
-                self.fileMoved.emit()
+            self._startIngest([filePath], self._getCurrentTargetDir(), True)
         
         super().mousePressEvent(event)
 
+    def _startIngest(self, sources: list, targetPath: str, move: bool) -> None:
+        self.label.hide()
+        self.progressBar.setValue(0)
+        self.progressBar.show()
+        self.cancelButton.show()
+
+        self.ingestTask = Task(ingest, sources, targetPath, move, hooks=True)
+        self.ingestTask.signals.progress.connect(self._onIngestProgress)
+        self.ingestTask.signals.finished.connect(self._onIngestFinished)
+        self.ingestTask.signals.failed.connect(self._onIngestFailed)
+        startTask(self.ingestTask)
+
+    def _onIngestProgress(self, progress: tuple) -> None:
+        done, total = progress
+        self.progressBar.setValue(int(done * 100 / total) if total else 100)
+
+    def _onIngestFinished(self, paths: list) -> None:
+        self._resetIngest()
+        if paths:
+            self.fileMoved.emit()
+
+    def _onIngestFailed(self, error: str) -> None:
+        self._resetIngest()
+        self.fileMoved.emit()
+        self.ingestFailed.emit(error)
+
+    def cancelIngest(self) -> None:
+        if self.ingestTask is not None:
+            self.ingestTask.cancel()
+            self._resetIngest()
+            self.fileMoved.emit()
+
+    def _resetIngest(self) -> None:
+        self.ingestTask = None
+        self.progressBar.hide()
+        self.cancelButton.hide()
+        self.label.show()
+
     def _getCurrentTargetDir(self) -> str:
         if not self.treeWidget:
             return self.rootPath
@@ -629,6 +832,127 @@ class FileUploadArea(QFrame):
         return self.rootPath
 
 
+class LargeTextView(QAbstractScrollArea):
+
+    MARGIN_LINES = 64
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent=parent)
+        self.setStyleSheet("background-color: transparent; border: none;")
+        font = QFont("Consolas", 10)
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        self.setFont(font)
+        self.lineHeight = QFontMetrics(self.font()).lineSpacing()
+        self.charWidth = QFontMetrics(self.font()).horizontalAdvance(" ")
+
+        self.index = None
+        self.lexer = None
+        self.style = "default"
+        self.windowStart = 0
+        self.windowRuns = []
+
+    def setIndex(self, index: LineIndex, style: str) -> None:
+        self.clear()
+        self.index = index
+        from app.common.highlighter import lexerForPath
+
+        self.lexer = lexerForPath(index.path)
+        self.style = style
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self._updateScrollBars()
+        self.viewport().update()
+
+    def clear(self) -> None:
+        if self.index is not None:
+            self.index.close()
+        self.index = None
+        self.windowRuns = []
+
+    def visibleLineCount(self) -> int:
+        return self.viewport().height() // self.lineHeight + 1
+
+    def _updateScrollBars(self) -> None:
+        lineCount = self.index.lineCount if self.index else 0
+        visible = self.visibleLineCount()
+        self.verticalScrollBar().setRange(0, max(0, lineCount - visible + 1))
+        self.verticalScrollBar().setPageStep(visible)
+        self.horizontalScrollBar().setPageStep(self.viewport().width())
+
+    def _ensureWindow(self, first: int, count: int) -> None:
+        if self.windowRuns and self.windowStart <= first and first + count <= self.windowStart + len(self.windowRuns):
+            return
+
+        start = max(0, first - self.MARGIN_LINES)
+        lines = self.index.lines(start, count + 2 * self.MARGIN_LINES)
+        self.windowStart = start
+        from app.common.highlighter import highlightLines
+
+        self.windowRuns = highlightLines([line.expandtabs(4) for line in lines], self.lexer, self.style)
+
+        width = max((sum(len(text) for text, _ in runs) for runs in self.windowRuns), default=0)
+        self.horizontalScrollBar().setRange(0, max(0, width * self.charWidth - self.viewport().width() + self.charWidth))
+
+    def resizeEvent(self, e) -> None:
+        super().resizeEvent(e)
+        self._updateScrollBars()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        self.viewport().update()
+
+    def paintEvent(self, e) -> None:
+        if self.index is None:
+            return
+
+        first = self.verticalScrollBar().value()
+        count = min(self.visibleLineCount(), self.index.lineCount - first)
+        self._ensureWindow(first, count)
+
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        defaultColor = QColor(248, 248, 242) if qfw.isDarkTheme() else QColor(0, 0, 0)
+        ascent = QFontMetrics(self.font()).ascent()
+        left = -self.horizontalScrollBar().value() + 4
+
+        for row in range(count):
+            x = left
+            y = row * self.lineHeight + ascent
+            for text, style in self.windowRuns[first - self.windowStart + row]:
+                font = painter.font()
+                font.setBold(bool(style["bold"]))
+                font.setItalic(bool(style["italic"]))
+                painter.setFont(font)
+                painter.setPen(QColor(f"#{style['color']}") if style["color"] else defaultColor)
+                painter.drawText(x, y, text)
+                x += len(text) * self.charWidth
+
+
+class LazyInterface(QWidget):
+
+    created = pyqtSignal(QWidget)
+
+    def __init__(self, cls: type, objectName: str, parent=None) -> None:
+        super().__init__(parent=parent)
+        self._parent = parent
+        self.cls = cls
+        self.instance = None
+        self.setObjectName(objectName)
+
+        self.vBoxLayout = QVBoxLayout(self)
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 0)
+
+    def interface(self) -> QWidget:
+        if self.instance is None:
+            self.instance = self.cls(self._parent)
+            self.vBoxLayout.addWidget(self.instance)
+            self.created.emit(self.instance)
+        return self.instance
+
+    def showEvent(self, e) -> None:
+        self.interface()
+        super().showEvent(e)
+
+
 class ClickableWidget(QWidget):
 
     doubleClicked = pyqtSignal()
@@ -640,6 +964,11 @@ class ClickableWidget(QWidget):
 
 class FileDetailStackWidget(QStackedWidget):
 
+    TEXT_EXTENSIONS = ['.txt', '.py', '.json', '.md', '.js', '.html', '.css', '.sh', '.bat']
+    LOG_EXTENSIONS = ['.log', '.sql', '.csv']
+    LARGE_FILE_SIZE = 2 * 1024 * 1024
+    PREVIEW_CACHE_BUDGET = 64 * 1024 * 1024
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent=parent)
         self.setObjectName("fileDetailStackWidget")
@@ -660,6 +989,34 @@ class FileDetailStackWidget(QStackedWidget):
         self.imageWrapper = qfw.ImageLabel(self.imageContainer)
         self.imageLayout.addWidget(self.imageWrapper)
 
+        self.audioContainer = None
+        self.mediaPlayer = None
+        self.videoContainer = None
+
+        self.largeTextContainer = ClickableWidget(self)
+        self.largeTextLayout = QVBoxLayout(self.largeTextContainer)
+        self.largeTextWrapper = LargeTextView(self.largeTextContainer)
+        self.largeTextLayout.addWidget(self.largeTextWrapper)
+
+        self.addWidget(self.textContainer)
+        self.addWidget(self.imageContainer)
+        self.addWidget(self.largeTextContainer)
+
+        self.previewPool = QThreadPool(self)
+        self.previewPool.setMaxThreadCount(2)
+        self.previewTask = None
+        self.generation = 0
+        self.previewCache = LRUCache(self.PREVIEW_CACHE_BUDGET)
+
+    def _initMediaWidgets(self) -> bool:
+        if self.mediaPlayer is not None:
+            return True
+
+        try:
+            import qfluentwidgets.multimedia as multimedia
+        except ImportError:
+            return False
+
         self.audioContainer = ClickableWidget(self)
         self.audioLayout = QVBoxLayout(self.audioContainer)
         self.audioLayout.setAlignment(Qt.AlignmentFlag.AlignBottom)
@@ -682,14 +1039,21 @@ class FileDetailStackWidget(QStackedWidget):
         self.videoWrapper.playBar.skipForwardButton.setFont(QFont("Segoe UI", 12))
         self.videoLayout.addWidget(self.videoWrapper)
 
-        self.addWidget(self.textContainer)
-        self.addWidget(self.imageContainer)
         self.addWidget(self.audioContainer)
         self.addWidget(self.videoContainer)
+        return True
 
     def updateFile(self, path: str) -> None:
-        self.mediaPlayer.stop()
-        self.videoWrapper.pause()
+        if self.mediaPlayer is not None:
+            self.mediaPlayer.stop()
+            self.videoWrapper.pause()
+
+        self.generation += 1
+        self.largeTextWrapper.clear()
+        if self.previewTask is not None:
+            self.previewTask.cancel()
+            self.previewPool.tryTake(self.previewTask)
+            self.previewTask = None
 
         if not os.path.exists(path):
             self.textWrapper.setText("File not found.")
@@ -699,41 +1063,72 @@ class FileDetailStackWidget(QStackedWidget):
         else:
             ext = os.path.splitext(path)[1].lower()
             source = QUrl.fromLocalFile(path)
-            if ext in ['.txt', '.py', '.json', '.md', '.js', '.html', '.css', '.sh', '.bat']:
-                try:
-                    with open(path, encoding="utf-8") as file:
-                        content = file.read()
-
-                    lexer = get_lexer_for_filename(path)
-                    style = 'monokai' if qfw.isDarkTheme() else 'default'
-                    formatter = HtmlFormatter(style=style, noclasses=True, nobackground=True, cssstyles="line-height: 100%")
-                    html = highlight(content, lexer, formatter)
-                    self.textWrapper.setHtml(html)
-
-                    self.textContainer.doubleClicked.connect(lambda: QDesktopServices.openUrl(source))
-                    self.setCurrentIndex(0)
-                except Exception:
-                    self.showDefaultInfo(path)
-            elif ext in ['.png', '.jpg', '.jpeg', '.bmp', '.gif', '.ico', '.svg']:
-                image = QImage(path)
-                if image.width() > image.height():
-                    image = image.scaledToWidth(512) if image.width() > 512 else image
+            style = 'monokai' if qfw.isDarkTheme() else 'default'
+            if ext in self.TEXT_EXTENSIONS + self.LOG_EXTENSIONS and os.path.getsize(path) > self.LARGE_FILE_SIZE:
+                self._startPreview(Task(buildLineIndex, path, hooks=True), path,
+                                   lambda path, index: self._onIndexed(index, style))
+            elif ext in self.TEXT_EXTENSIONS + self.LOG_EXTENSIONS:
+                stat = os.stat(path)
+                key = (path, stat.st_size, stat.st_mtime_ns, style)
+                html = self.previewCache.get(key)
+                if html is not None:
+                    self._onHighlighted(path, html)
                 else:
-                    image = image.scaledToHeight(512) if image.height() > 512 else image
-                self.imageWrapper.setImage(image)
-                self.imageContainer.doubleClicked.connect(lambda: QDesktopServices.openUrl(source))
-                self.setCurrentIndex(1)
-            elif ext in ['.mp3', '.wav', '.flac', '.m4a']:
+                    from app.common.highlighter import highlightFile
+
+                    self._startPreview(Task(highlightFile, path, style, hooks=True), path,
+                                       lambda path, html: self._onHighlighted(path, html, key))
+            elif ext in ['.png', '.jpg', '.jpeg', '.bmp', '.gif', '.ico', '.svg']:
+                self._startPreview(Task(loadThumbnail, path, hooks=True), path, self._onImageLoaded)
+            elif ext in ['.mp3', '.wav', '.flac', '.m4a'] and self._initMediaWidgets():
                 self.mediaPlayer.setSource(source)
                 self.audioContainer.doubleClicked.connect(lambda: QDesktopServices.openUrl(source))
-                self.setCurrentIndex(2)
-            elif ext in ['.mp4', '.avi', '.mkv', '.mov', '.wmv']:
+                self.setCurrentWidget(self.audioContainer)
+            elif ext in ['.mp4', '.avi', '.mkv', '.mov', '.wmv'] and self._initMediaWidgets():
                 self.videoWrapper.setVideo(source)
                 self.videoContainer.doubleClicked.connect(lambda: QDesktopServices.openUrl(source))
-                self.setCurrentIndex(3)
+                self.setCurrentWidget(self.videoContainer)
             else:
                 self.showDefaultInfo(path)
 
+    def _startPreview(self, task: Task, path: str, slot) -> None:
+        generation = self.generation
+        task.signals.finished.connect(lambda result: self._deliver(generation, slot, path, result))
+        task.signals.failed.connect(lambda _: self._isCurrent(generation) and self.showDefaultInfo(path))
+        self.previewTask = startTask(task, self.previewPool)
+
+    def _deliver(self, generation: int, slot, path: str, result) -> None:
+        if self._isCurrent(generation):
+            slot(path, result)
+        elif isinstance(result, LineIndex):
+            result.close()
+
+    def _isCurrent(self, generation: int) -> bool:
+        if generation != self.generation:
+            return False
+        self.previewTask = None
+        return True
+
+    def _onIndexed(self, index: LineIndex, style: str) -> None:
+        source = QUrl.fromLocalFile(index.path)
+        self.largeTextWrapper.setIndex(index, style)
+        self.largeTextContainer.doubleClicked.connect(lambda: QDesktopServices.openUrl(source))
+        self.setCurrentWidget(self.largeTextContainer)
+
+    def _onImageLoaded(self, path: str, image: QImage) -> None:
+        source = QUrl.fromLocalFile(path)
+        self.imageWrapper.setImage(image)
+        self.imageContainer.doubleClicked.connect(lambda: QDesktopServices.openUrl(source))
+        self.setCurrentIndex(1)
+
+    def _onHighlighted(self, path: str, html: str, cacheKey: tuple = None) -> None:
+        if cacheKey is not None:
+            self.previewCache.put(cacheKey, html)
+        source = QUrl.fromLocalFile(path)
+        self.textWrapper.setHtml(html)
+        self.textContainer.doubleClicked.connect(lambda: QDesktopServices.openUrl(source))
+        self.setCurrentIndex(0)
+
     def showDefaultInfo(self, path: str) -> None:
         try:
             size = os.path.getsize(path)
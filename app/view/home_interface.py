@@ -1,12 +1,104 @@
 import os
-import json
+import time
 
 import qfluentwidgets as qfw
 from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QButtonGroup, QLabel
+from PyQt6.QtCore import Qt, QTimer, QDate, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QButtonGroup, QLabel, QTableWidgetItem, QAbstractItemView, QHeaderView
 
 import app.view.custom_widget as custom
+from app.common.application_info import (
+    applicationInfo, developmentInfo, writeInfoFile,
+    APPLICATION_INFO_FILE, DEVELOPMENT_INFO_FILE, CODE_MATERIAL_FILE, TRIMMED_MATERIAL_DIR, CLASS_ITEMS
+)
+from app.common.language_detector import detectLanguages, selectLanguages
+from app.common.line_counter import countProject, totalLines, STAT_KEYS
+from app.common.code_material import generateCodeMaterial
+from app.common.config import cfg
+from app.common.draft_store import DraftStore
+from app.common.paths import resolvePath
+from app.common.task import Task, startTask
+from app.common.workspace import WorkspaceManager, LEGACY_DRAFT_FILE
+from app.view.ai_filler import AIFiller
+
+
+class WorkspaceListInterface(custom.BaseSubPage):
+
+    openRequested = pyqtSignal(str)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._parent = parent
+
+        self.toolLayout = QHBoxLayout()
+        self.newButton = qfw.PrimaryPushButton("新建申请", self, qfw.FluentIcon.ADD)
+        self.openButton = qfw.PushButton("打开", self, qfw.FluentIcon.FOLDER)
+        self.deleteButton = qfw.PushButton("删除", self, qfw.FluentIcon.DELETE)
+        self.toolLayout.addWidget(self.newButton)
+        self.toolLayout.addSpacing(16)
+        self.toolLayout.addWidget(self.openButton)
+        self.toolLayout.addSpacing(16)
+        self.toolLayout.addWidget(self.deleteButton)
+        self.toolLayout.addStretch(1)
+
+        self.table = qfw.TableWidget(self)
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["软件全称", "版本号", "进度", "最近修改"])
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        self.contentLayout.addLayout(self.toolLayout)
+        self.contentLayout.addWidget(self.table)
+
+        self.newButton.clicked.connect(lambda: self.openRequested.emit(self._parent.workspace.create()))
+        self.openButton.clicked.connect(self.openSelected)
+        self.deleteButton.clicked.connect(self.deleteSelected)
+        self.table.cellDoubleClicked.connect(lambda row, _: self.openSelected())
+
+        self.prevBtn.hide()
+        self.nextBtn.hide()
+
+    def showEvent(self, e) -> None:
+        super().showEvent(e)
+        self.refresh()
+
+    def refresh(self) -> None:
+        stages = {key: name for key, name, _ in self._parent.pages_info}
+        applications = self._parent.workspace.applications()
+        self.table.setRowCount(len(applications))
+        for row, app in enumerate(applications):
+            nameItem = QTableWidgetItem(app.name or "未命名申请")
+            nameItem.setData(Qt.ItemDataRole.UserRole, app.id)
+            self.table.setItem(row, 0, nameItem)
+            self.table.setItem(row, 1, QTableWidgetItem(app.version))
+            self.table.setItem(row, 2, QTableWidgetItem(stages.get(app.stage, "")))
+            self.table.setItem(row, 3, QTableWidgetItem(time.strftime("%Y-%m-%d %H:%M", time.localtime(app.modified))))
+        self.openButton.setEnabled(bool(applications))
+        self.deleteButton.setEnabled(bool(applications))
+
+    def selectedId(self) -> str:
+        row = self.table.currentRow()
+        item = self.table.item(row, 0) if row >= 0 else None
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+
+    def openSelected(self) -> None:
+        appId = self.selectedId()
+        if appId:
+            self.openRequested.emit(appId)
+
+    def deleteSelected(self) -> None:
+        appId = self.selectedId()
+        if not appId:
+            return
+        name = self.table.item(self.table.currentRow(), 0).text()
+        box = qfw.MessageBox("删除申请", f"确定删除【{name}】及其全部材料吗？此操作无法撤销。", self.window())
+        if box.exec():
+            self._parent.closeApplication(appId)
+            self._parent.workspace.remove(appId)
+            self.refresh()
 
 
 class IdentitySelectionInterface(custom.BaseSubPage):
@@ -124,6 +216,21 @@ class SoftwareAppInfoInterface(custom.BaseSubPage):
         self.nextBtn.clicked.disconnect()
         self.nextBtn.clicked.connect(self.check_for_next)
 
+        for edit in (self.fullNameEdit, self.abbrEdit, self.versionEdit):
+            edit.textChanged.connect(self.draftChanged)
+
+    def draft(self) -> dict:
+        return {
+            "软件全称": self.fullNameEdit.text(),
+            "软件简称": self.abbrEdit.text(),
+            "版本号": self.versionEdit.text(),
+        }
+
+    def restoreDraft(self, draft: dict) -> None:
+        self.fullNameEdit.setText(draft.get("软件全称", ""))
+        self.abbrEdit.setText(draft.get("软件简称", ""))
+        self.versionEdit.setText(draft.get("版本号", ""))
+
     def onDerivedClicked(self) -> None:
         self.show_info()
         QTimer.singleShot(1000, lambda: self.originalRadio.setChecked(True))
@@ -133,20 +240,16 @@ class SoftwareAppInfoInterface(custom.BaseSubPage):
         QTimer.singleShot(1000, lambda: self.allRightsRadio.setChecked(True))
 
     def createWorkSpace(self) -> None:
-        if self._parent.applicationName is not None and os.path.exists(self._parent.applicationName):
-            os.removedirs(self._parent.applicationName)
-        self._parent.applicationName = self.fullNameEdit.text()
-        os.makedirs(self._parent.applicationName, exist_ok=True)
+        os.makedirs(self._parent.applicationDir, exist_ok=True)
 
     def writeInfo(self) -> None:
-        with open(os.path.join(self._parent.applicationName, "软件申请信息.json"), "w+", encoding="utf-8") as f:
-            json.dump({
-                "权利取得方式": self.originalRadio.text() if self.originalRadio.isChecked() else self.derivedRadio.text(),
-                "软件全称": self.fullNameEdit.text(),
-                "软件简称": self.abbrEdit.text(),
-                "版本号": self.versionEdit.text(),
-                "权利范围": self.allRightsRadio.text() if self.allRightsRadio.isChecked() else self.partRightsRadio.text()
-            }, f, ensure_ascii=False, indent=4)
+        writeInfoFile(self._parent.applicationDir, APPLICATION_INFO_FILE, applicationInfo(
+            self.originalRadio.text() if self.originalRadio.isChecked() else self.derivedRadio.text(),
+            self.fullNameEdit.text(),
+            self.abbrEdit.text(),
+            self.versionEdit.text(),
+            self.allRightsRadio.text() if self.allRightsRadio.isChecked() else self.partRightsRadio.text()
+        ))
 
     def check_for_next(self) -> None:
         if self.originalRadio.isChecked():
@@ -189,7 +292,7 @@ class SoftwareDevInfoInterface(custom.BaseSubPage):
         self.classGroup.setFixedWidth(160)
         self.classCard.hBoxLayout.addWidget(self.classGroup, 0, Qt.AlignmentFlag.AlignRight)
         self.classCard.hBoxLayout.addSpacing(16)
-        self.classItems = ["请选择软件分类", "应用软件", "嵌入式软件", "中间件", "操作系统"]
+        self.classItems = ["请选择软件分类"] + CLASS_ITEMS
         self.classGroup.addItems(self.classItems)
         self.classGroup.setPlaceholderText("请选择软件分类")
 
@@ -296,6 +399,23 @@ class SoftwareDevInfoInterface(custom.BaseSubPage):
         self.nextBtn.clicked.disconnect()
         self.nextBtn.clicked.connect(self.check_for_next)
 
+        self.classGroup.currentIndexChanged.connect(self.draftChanged)
+        self.devFinishDate.dateChanged.connect(self.draftChanged)
+
+    def draft(self) -> dict:
+        return {
+            "软件分类": self.classGroup.text() if self.classGroup.currentIndex() > 0 else "",
+            "开发完成日期": self.devFinishDate.date.toString("yyyy-MM-dd") if self.devFinishDate.date.isValid() else "",
+        }
+
+    def restoreDraft(self, draft: dict) -> None:
+        index = self.classGroup.findText(draft.get("软件分类", ""))
+        if index > 0:
+            self.classGroup.setCurrentIndex(index)
+        date = QDate.fromString(draft.get("开发完成日期", ""), "yyyy-MM-dd")
+        if date.isValid():
+            self.devFinishDate.setDate(date)
+
     def onDerivedClicked(self) -> None:
         self.show_info()
         QTimer.singleShot(1000, lambda: self.originalRadio.setChecked(True))
@@ -313,15 +433,14 @@ class SoftwareDevInfoInterface(custom.BaseSubPage):
             else self.coopRadio.text() if self.coopRadio.isChecked() \
             else self.delegateRadio.text() if self.delegateRadio.isChecked() \
             else self.taskRadio.text()
-        with open(os.path.join(self._parent.applicationName, "软件开发信息.json"), "w+", encoding="utf-8") as f:
-            json.dump({
-                "软件分类": self.classGroup.text(),
-                "软件说明": self.originalRadio.text() if self.originalRadio.isChecked() else self.derivedRadio.text(),
-                "开发方式": devForm,
-                "开发完成日期": self.devFinishDate.date.toString("yyyy-MM-dd"),
-                "发表状态": self.publishRadio.text() if self.publishRadio.isChecked() else self.unPublishRadio.text(),
-                "著作权人": self.authorName.text(),
-            }, f, ensure_ascii=False, indent=4)
+        writeInfoFile(self._parent.applicationDir, DEVELOPMENT_INFO_FILE, developmentInfo(
+            self.classGroup.text(),
+            self.originalRadio.text() if self.originalRadio.isChecked() else self.derivedRadio.text(),
+            devForm,
+            self.devFinishDate.date.toString("yyyy-MM-dd"),
+            self.publishRadio.text() if self.publishRadio.isChecked() else self.unPublishRadio.text(),
+            self.authorName.text()
+        ))
 
     def check_for_next(self) -> None:
         if self.classGroup.text() in self.classItems[1:]:
@@ -394,6 +513,9 @@ class SoftwareFeaturesInterface(custom.BaseSubPage):
         )
 
         self.devLanguageCard = custom.DevLanguageCard(self.scrollWidget)
+        self.devLanguageCard.detectClicked.connect(self.detectLanguages)
+        self.detectTask = None
+        self.detectedRoot = None
 
         self.codeLineCard = qfw.SettingCard(
             qfw.FluentIcon.CODE,
@@ -408,6 +530,11 @@ class SoftwareFeaturesInterface(custom.BaseSubPage):
         self.codeLineCard.hBoxLayout.addSpacing(24)
         self.codeLineCard.hBoxLayout.addWidget(QLabel("行", self.codeLineCard))
         self.codeLineCard.hBoxLayout.addSpacing(16)
+        self.countLineBtn = qfw.PushButton("自动统计", self.codeLineCard, qfw.FluentIcon.SYNC)
+        self.countLineBtn.clicked.connect(self.countCodeLines)
+        self.codeLineCard.hBoxLayout.addWidget(self.countLineBtn)
+        self.codeLineCard.hBoxLayout.addSpacing(16)
+        self.countTask = None
 
         self.devTargetCard = custom.EditSettingCard(
             qfw.FluentIcon.PIN,
@@ -432,18 +559,29 @@ class SoftwareFeaturesInterface(custom.BaseSubPage):
 
         self.featuresCard = custom.FeaturesCard(self.scrollWidget)
 
+        materialDir = parent.applicationDir and os.path.join(parent.applicationDir, TRIMMED_MATERIAL_DIR)
+
         self.codeIdentifyCard = custom.FileUploadCard(
             qfw.FluentIcon.COMMAND_PROMPT,
             "程序鉴别材料",
             "源程序前连续的30页和后连续的30页",
-            self.scrollWidget
+            self.scrollWidget,
+            keepPages=30,
+            outputDir=materialDir and os.path.join(materialDir, "程序鉴别材料")
             )
+        self.generateCodeBtn = qfw.PushButton("从代码生成", self.codeIdentifyCard, qfw.FluentIcon.CODE)
+        self.generateCodeBtn.clicked.connect(self.generateCodeMaterial)
+        self.codeIdentifyCard.topLayout.insertWidget(self.codeIdentifyCard.topLayout.count() - 2, self.generateCodeBtn)
+        self.codeIdentifyCard.topLayout.insertSpacing(self.codeIdentifyCard.topLayout.count() - 2, 16)
+        self.materialTask = None
 
         self.documentIdentifyCard = custom.FileUploadCard(
             qfw.FluentIcon.DICTIONARY_ADD,
             "文档鉴别材料",
             "提交任何一种文档的前连续的30页和后连续的30页",
-            self.scrollWidget
+            self.scrollWidget,
+            keepPages=30,
+            outputDir=materialDir and os.path.join(materialDir, "文档鉴别材料")
         )
 
         self.otherMaterialCard = custom.FileUploadCard(
@@ -472,6 +610,223 @@ class SoftwareFeaturesInterface(custom.BaseSubPage):
         self.nextBtn.clicked.disconnect()
         self.nextBtn.clicked.connect(self.check_for_next)
 
+        self.aiCards = {
+            "devHardwareEnv": self.devHardwareEnvCard,
+            "runHardwareEnv": self.runHardwareEnvCard,
+            "devOS": self.devOSEnvCard,
+            "devEnvTool": self.devEnvToolCard,
+            "runPlatformOS": self.runPlatformOSCard,
+            "runEnvSoftware": self.runEnvSoftwareCard,
+            "devLanguage": self.devLanguageCard,
+            "devTarget": self.devTargetCard,
+            "targetDomain": self.TargetDomainCard,
+            "mainFunction": self.MainFunctionCard,
+            "features": self.featuresCard,
+        }
+        self.aiFiller = AIFiller(self)
+        self.aiFiller.fieldStarted.connect(self.onFieldStarted)
+        self.aiFiller.tokenReceived.connect(self.onFieldToken)
+        self.aiFiller.fieldFinished.connect(self.onFieldFinished)
+        self.aiFiller.fieldFailed.connect(self.onFieldFailed)
+        for key, card in self.aiCards.items():
+            card.clicked.connect(lambda key=key: self.aiFill([key]))
+            card.regenerateClicked.connect(lambda key=key: self.aiFill([key], regenerate=True))
+
+        self.fillAllBtn = qfw.PushButton("AI全部填写", self, qfw.FluentIcon.ROBOT)
+        self.fillAllBtn.setFixedWidth(120)
+        self.fillAllBtn.clicked.connect(lambda: self.aiFill(list(self.aiCards)))
+        self.buttonLayout.insertWidget(0, self.fillAllBtn)
+        self.buttonLayout.insertSpacing(1, 20)
+
+        self.uploadCards = {
+            "codeIdentify": self.codeIdentifyCard,
+            "documentIdentify": self.documentIdentifyCard,
+            "otherMaterial": self.otherMaterialCard,
+        }
+        for card in self.aiCards.values():
+            card.plainTextEdit.textChanged.connect(self.draftChanged)
+        for button in [*self.devLanguageCard.tagButtons.values(), *self.featuresCard.tagButtons.values()]:
+            button.toggled.connect(self.draftChanged)
+        for card in self.uploadCards.values():
+            card.filesChanged.connect(self.draftChanged)
+        self.codeLineEdit.textChanged.connect(self.draftChanged)
+
+    def draft(self) -> dict:
+        draft = {key: card.plainTextEdit.toPlainText() for key, card in self.aiCards.items()}
+        draft["languageTags"] = self.devLanguageCard.checkedTags()
+        draft["featureTags"] = self.featuresCard.checkedTags()
+        draft["codeLines"] = self.codeLineEdit.text()
+        draft["files"] = {key: list(card.fileLayoutContent) for key, card in self.uploadCards.items()}
+        return draft
+
+    def restoreDraft(self, draft: dict) -> None:
+        for key, card in self.aiCards.items():
+            card.plainTextEdit.setPlainText(draft.get(key, ""))
+        for tag, button in self.devLanguageCard.tagButtons.items():
+            button.setChecked(tag in draft.get("languageTags", []))
+        for tag, button in self.featuresCard.tagButtons.items():
+            button.setChecked(tag in draft.get("featureTags", []))
+        self.codeLineEdit.setText(draft.get("codeLines", ""))
+        for key, files in draft.get("files", {}).items():
+            if key in self.uploadCards:
+                for path in files:
+                    if os.path.isfile(path):
+                        self.uploadCards[key].add_file(path)
+
+    def aiContext(self) -> dict:
+        appInfo = self._parent.page("app_info")
+        devInfo = self._parent.page("dev_info")
+        context = {
+            "软件全称": appInfo.fullNameEdit.text(),
+            "软件简称": appInfo.abbrEdit.text(),
+            "版本号": appInfo.versionEdit.text(),
+            "软件分类": devInfo.classGroup.text() if devInfo.classGroup.currentIndex() > 0 else "",
+        }
+        rootPath = self._parent.projectRoot()
+        if rootPath:
+            try:
+                context["项目顶层文件"] = "、".join(sorted(os.listdir(rootPath))[:50])
+            except OSError:
+                pass
+        return context
+
+    def aiFill(self, fields: list, regenerate: bool = False) -> None:
+        if not self._parent.page("app_info").fullNameEdit.text():
+            self.show_warning(content="请先填写【软件全称】！")
+            return
+        self.aiFiller.fill(
+            fields, self.aiContext(), self._parent.projectRoot(), self._parent.projectFingerprint(), regenerate)
+
+    def onFieldStarted(self, field: str) -> None:
+        card = self.aiCards[field]
+        card.plainTextEdit.clear()
+        card.button.setEnabled(False)
+        card.regenerateButton.setEnabled(False)
+
+    def onFieldToken(self, field: str, token: str) -> None:
+        edit = self.aiCards[field].plainTextEdit
+        cursor = edit.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(token)
+
+    def onFieldFinished(self, field: str, text: str) -> None:
+        card = self.aiCards[field]
+        card.plainTextEdit.setPlainText(text)
+        card.button.setEnabled(True)
+        card.regenerateButton.setEnabled(True)
+
+    def onFieldFailed(self, field: str, error: str) -> None:
+        self.aiCards[field].button.setEnabled(True)
+        self.aiCards[field].regenerateButton.setEnabled(True)
+        self.show_error(content=f"【{self.aiCards[field].titleLabel.text()}】填写失败：{error}")
+
+    def showEvent(self, e) -> None:
+        super().showEvent(e)
+        rootPath = self._parent.projectRoot()
+        if rootPath and rootPath != self.detectedRoot and not self.devLanguageCard.checkedTags():
+            self.detectLanguages()
+
+    def detectLanguages(self) -> None:
+        rootPath = self._parent.projectRoot()
+        if not rootPath:
+            self.show_warning(content="请先在【软件代码】中打开项目文件夹！")
+            return
+        if self.detectTask is not None:
+            return
+
+        self.detectedRoot = rootPath
+        self.devLanguageCard.detectButton.setEnabled(False)
+        self.detectTask = Task(detectLanguages, rootPath, hooks=True)
+        self.detectTask.signals.progress.connect(
+            lambda progress: self.devLanguageCard.detectButton.setText(f"识别中 {progress[0]}/{progress[1]}"))
+        self.detectTask.signals.finished.connect(self.onDetectFinished)
+        self.detectTask.signals.failed.connect(self.onDetectFailed)
+        startTask(self.detectTask)
+
+    def onDetectFinished(self, histogram: dict) -> None:
+        self.detectTask = None
+        self.devLanguageCard.detectButton.setText("自动识别")
+        self.devLanguageCard.detectButton.setEnabled(True)
+        self.devLanguageCard.setLanguages(*selectLanguages(histogram))
+
+    def onDetectFailed(self, error: str) -> None:
+        self.detectTask = None
+        self.devLanguageCard.detectButton.setText("自动识别")
+        self.devLanguageCard.detectButton.setEnabled(True)
+        self.show_error(content=f"识别失败：{error}")
+
+    def countCodeLines(self) -> None:
+        rootPath = self._parent.projectRoot()
+        if not rootPath:
+            self.show_warning(content="请先在【软件代码】中打开项目文件夹！")
+            return
+
+        summary = self._parent.projectLineSummary()
+        if summary is not None:
+            self.onCountFinished(summary)
+            return
+
+        self.countLineBtn.setEnabled(False)
+        self.countTask = Task(countProject, rootPath, classification=self._parent.projectClassification(), hooks=True)
+        self.countTask.signals.progress.connect(self.onCountProgress)
+        self.countTask.signals.finished.connect(self.onCountFinished)
+        self.countTask.signals.failed.connect(self.onCountFailed)
+        startTask(self.countTask)
+
+    def onCountProgress(self, progress: tuple) -> None:
+        done, total = progress
+        self.countLineBtn.setText(f"统计中 {done}/{total}")
+
+    def onCountFinished(self, summary: dict) -> None:
+        self.countTask = None
+        self.countLineBtn.setText("自动统计")
+        self.countLineBtn.setEnabled(True)
+        self.codeLineEdit.setText(str(totalLines(summary)))
+
+        header = "语言\t" + "\t".join(["总行数", "代码", "注释", "空行"])
+        rows = [
+            f"{language}\t" + "\t".join(str(stats[key]) for key in STAT_KEYS)
+            for language, stats in sorted(summary.items(), key=lambda item: -item[1]["total"])
+        ]
+        self.codeLineEdit.setToolTip("\n".join([header] + rows))
+        self.show_info(content=f"共统计 {totalLines(summary)} 行，其中代码 {totalLines(summary, 'code')} 行")
+
+    def onCountFailed(self, error: str) -> None:
+        self.countTask = None
+        self.countLineBtn.setText("自动统计")
+        self.countLineBtn.setEnabled(True)
+        self.show_error(content=f"统计失败：{error}")
+
+    def generateCodeMaterial(self) -> None:
+        rootPath = self._parent.projectRoot()
+        if not rootPath:
+            self.show_warning(content="请先在【软件代码】中打开项目文件夹！")
+            return
+
+        appInfo = self._parent.page("app_info")
+        title = f"{appInfo.fullNameEdit.text()} {appInfo.versionEdit.text()}"
+        outputPath = os.path.abspath(os.path.join(self._parent.applicationDir or rootPath, CODE_MATERIAL_FILE))
+
+        self.generateCodeBtn.setEnabled(False)
+        self.materialTask = Task(
+            generateCodeMaterial, rootPath, outputPath, title, self._parent.projectClassification(), hooks=True)
+        self.materialTask.signals.progress.connect(lambda page: self.generateCodeBtn.setText(f"生成中 {page}/60"))
+        self.materialTask.signals.finished.connect(self.onMaterialFinished)
+        self.materialTask.signals.failed.connect(self.onMaterialFailed)
+        startTask(self.materialTask)
+
+    def onMaterialFinished(self, outputPath: str) -> None:
+        self.materialTask = None
+        self.generateCodeBtn.setText("从代码生成")
+        self.generateCodeBtn.setEnabled(True)
+        self.codeIdentifyCard.add_file(outputPath)
+
+    def onMaterialFailed(self, error: str) -> None:
+        self.materialTask = None
+        self.generateCodeBtn.setText("从代码生成")
+        self.generateCodeBtn.setEnabled(True)
+        self.show_error(content=f"生成失败：{error}")
+
     def check_for_next(self) -> None:
         self.nextSignal.emit()
 
@@ -497,7 +852,11 @@ class HomeInterface(QWidget):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self._parent = parent
-        self.applicationName = None
+        self.workspace = WorkspaceManager(resolvePath(cfg.workspace_folder.value))
+        self.workspace.importDraft(LEGACY_DRAFT_FILE)
+        self.applicationId = None
+        self.applicationDir = None
+        self.draftStore = None
         self.setObjectName("homeInterface")
         
         self.vBoxLayout = QVBoxLayout(self)
@@ -516,6 +875,7 @@ class HomeInterface(QWidget):
         self.vBoxLayout.addWidget(self.stackedWidget)
 
         self.pages_info = [
+            ("workspace", "我的申请", WorkspaceListInterface),
             ("identity", "选择办理身份", IdentitySelectionInterface),
             ("app_info", "软件申请信息", SoftwareAppInfoInterface),
             ("dev_info", "软件开发信息", SoftwareDevInfoInterface),
@@ -525,45 +885,124 @@ class HomeInterface(QWidget):
         ]
 
         self.added_keys = []
-        self.route_keys = []
-        
-        for key, name, cls in self.pages_info:
+        self.route_keys = [key for key, _, _ in self.pages_info]
+        self.pages = {}
+        self.currentIndex = 0
+
+        key, name, _ = self.pages_info[0]
+        self.added_keys.append(key)
+        self.breadcrumb.addItem(key, name)
+        self.setCurrentPage(0)
+
+        self.breadcrumb.currentItemChanged.connect(self.switchToPage)
+        self.page("workspace").openRequested.connect(self.openApplication)
+
+    def page(self, key: str) -> custom.BaseSubPage:
+        page = self.pages.get(key)
+        if page is None:
+            cls = self.pages_info[self.route_keys.index(key)][2]
             page = cls(self)
             page.nextSignal.connect(self.nextPage)
             page.prevSignal.connect(self.prevPage)
             if key == "complete":
                 page.nextBtn.hide()
 
+            if self.draftStore is not None:
+                page.restoreDraft(self.draftStore.get(key))
+            page.draftChanged.connect(lambda key=key, page=page: self.onDraftChanged(key, page))
             self.stackedWidget.addWidget(page)
-            self.route_keys.append(key)
-
-            if key == "identity":
-                self.added_keys.append(key)
-                self.breadcrumb.addItem(key, name)
-
-        self.breadcrumb.currentItemChanged.connect(self.switchToPage)
+            self.pages[key] = page
+        return page
+
+    def setCurrentPage(self, index: int) -> None:
+        self.currentIndex = index
+        key = self.route_keys[index]
+        self.stackedWidget.setCurrentWidget(self.page(key))
+        if key != "workspace" and self.draftStore is not None:
+            self.draftStore.update("page", key)
+            self.workspace.touch(self.applicationId, stage=key)
+
+    def onDraftChanged(self, key: str, page: custom.BaseSubPage) -> None:
+        if self.draftStore is None:
+            return
+        draft = page.draft()
+        self.draftStore.update(key, draft)
+        if key == "app_info":
+            self.workspace.touch(self.applicationId, name=draft["软件全称"], version=draft["版本号"])
+        else:
+            self.workspace.touch(self.applicationId)
+
+    def openApplication(self, appId: str) -> None:
+        self.closeApplication()
+        self.applicationId = appId
+        self.applicationDir = self.workspace.directory(appId)
+        self.draftStore = DraftStore(self.workspace.draftPath(appId))
+        savedPage = self.draftStore.load().get("page", "identity")
+
+        self.nextPage()
+        if savedPage in self.route_keys:
+            for _ in range(self.route_keys.index(savedPage) - self.currentIndex):
+                self.nextPage()
+
+    def closeApplication(self, appId: str = None) -> None:
+        """ Closes the open application, or only the given one if it is open """
+        if self.draftStore is None or appId not in (None, self.applicationId):
+            return
+
+        self.draftStore.close()
+        self.draftStore = None
+        self.applicationId = self.applicationDir = None
+        for key in [key for key in self.pages if key != "workspace"]:
+            page = self.pages.pop(key)
+            self.stackedWidget.removeWidget(page)
+            page.deleteLater()
+        self.breadcrumb.setCurrentItem("workspace")
+        self.added_keys = ["workspace"]
+        self.setCurrentPage(0)
+
+    def closeWorkspace(self) -> None:
+        if self.draftStore is not None:
+            self.draftStore.close()
+        self.workspace.close()
+
+    def projectRoot(self) -> str:
+        codeInterface = self._parent.codeInterface.instance
+        return codeInterface.currentRootPath if codeInterface else None
+
+    def projectClassification(self) -> dict:
+        codeInterface = self._parent.codeInterface.instance
+        return codeInterface.classification if codeInterface else {}
+
+    def projectLineSummary(self) -> dict:
+        codeInterface = self._parent.codeInterface.instance
+        return codeInterface.lineSummary if codeInterface else None
+
+    def projectFingerprint(self) -> str:
+        """ Source digest from the last index update, None until the code page has indexed the project """
+        codeInterface = self._parent.codeInterface.instance
+        return codeInterface.sourceFingerprint if codeInterface else None
 
     def switchToPage(self, routeKey: str) -> None:
         if routeKey in self.route_keys:
             index = self.route_keys.index(routeKey)
             self.added_keys = self.route_keys[:index+1]
-            self.stackedWidget.setCurrentIndex(index)
+            self.setCurrentPage(index)
 
     def nextPage(self) -> None:
-        current_idx = self.stackedWidget.currentIndex()
-        if current_idx < self.stackedWidget.count() - 1:
+        current_idx = self.currentIndex
+        if current_idx < len(self.route_keys) - 1:
             next_idx = current_idx + 1
             key, name, _ = self.pages_info[next_idx]
             if key not in self.added_keys:
                 self.added_keys.append(key)
                 self.breadcrumb.addItem(key, name)
             self.breadcrumb.setCurrentItem(key)
-            self.stackedWidget.setCurrentIndex(next_idx)
+            self.setCurrentPage(next_idx)
 
     def prevPage(self) -> None:
-        current_idx = self.stackedWidget.currentIndex()
+        current_idx = self.currentIndex
         if current_idx > 0:
             prev_idx = current_idx - 1
             key = self.route_keys[prev_idx]
             self.breadcrumb.setCurrentItem(key)
-            self.stackedWidget.setCurrentIndex(prev_idx)
+            self.setCurrentPage(prev_idx)
@@ -1,8 +1,12 @@
+import importlib
+
 import qfluentwidgets as qfw
-from PyQt6.QtCore import QUrl
+from PyQt6.QtCore import QUrl, QTimer
 from PyQt6.QtGui import QIcon, QDesktopServices
 
 from app.common.config import cfg
+from app.common.task import Task, startTask
+from .custom_widget import LazyInterface
 from .home_interface import HomeInterface
 from .manual_interface import ManualInterface
 from .code_interface import CodeInterface
@@ -11,16 +15,19 @@ from .setting_interface import SettingInterface
 
 class MainWindow(qfw.FluentWindow):
 
+    WARM_UP_DELAY = 1500
+
     def __init__(self) -> None:
         super().__init__()
         qfw.setTheme(cfg.theme.value)
+        self.warmedUp = False
 
         self.initWindow()
 
         self.homeInterface = HomeInterface(self)
-        self.manualInterface = ManualInterface(self)
-        self.codeInterface = CodeInterface(self)
-        self.settingInterface = SettingInterface(self)
+        self.manualInterface = LazyInterface(ManualInterface, "manualInterface", self)
+        self.codeInterface = LazyInterface(CodeInterface, "codeInterface", self)
+        self.settingInterface = LazyInterface(SettingInterface, "settingInterface", self)
 
         self.initNavigation()
 
@@ -47,6 +54,27 @@ class MainWindow(qfw.FluentWindow):
 
         self.addSubInterface(self.settingInterface, qfw.FluentIcon.SETTING, "设置", position=qfw.NavigationItemPosition.BOTTOM)
 
+    def showEvent(self, e) -> None:
+        super().showEvent(e)
+        if not self.warmedUp:
+            self.warmedUp = True
+            QTimer.singleShot(self.WARM_UP_DELAY, self.warmUp)
+
+    def closeEvent(self, e) -> None:
+        self.homeInterface.closeWorkspace()
+        super().closeEvent(e)
+
+    def warmUp(self) -> None:
+        startTask(Task(lambda: importlib.import_module("app.common.highlighter").warmUp()))
+        QTimer.singleShot(self.WARM_UP_DELAY, self.warmUpMultimedia)
+
+    @staticmethod
+    def warmUpMultimedia() -> None:
+        try:
+            importlib.import_module("qfluentwidgets.multimedia")
+        except ImportError:
+            pass
+
     @staticmethod
     def openCopyrightWebsite() -> None:
         QDesktopServices.openUrl(QUrl("https://register.ccopyright.com.cn/login.html"))
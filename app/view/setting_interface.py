@@ -1,7 +1,9 @@
 import qfluentwidgets as qfw
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QFileDialog
 
 from app.common.config import cfg
+from app.common.paths import resolvePath
 
 
 class SettingInterface(qfw.ScrollArea):
@@ -57,11 +59,40 @@ class SettingInterface(qfw.ScrollArea):
         self.apiKeyCard.hBoxLayout.addWidget(self.apiKeyEdit)
         self.apiKeyCard.hBoxLayout.addSpacing(16)
 
+        self.rateCard = qfw.SettingCard(
+            qfw.FluentIcon.SPEED_HIGH,
+            "请求速率",
+            "每秒最多发起的请求数",
+            self.apiGroup
+        )
+        self.rateSpinBox = qfw.SpinBox(self.rateCard)
+        self.rateSpinBox.setRange(*cfg.requests_per_second.range)
+        self.rateSpinBox.setValue(cfg.requests_per_second.value)
+        self.rateSpinBox.setFixedWidth(200)
+        self.rateCard.hBoxLayout.addWidget(self.rateSpinBox)
+        self.rateCard.hBoxLayout.addSpacing(16)
+
+        self.tokenRateCard = qfw.SettingCard(
+            qfw.FluentIcon.SPEED_MEDIUM,
+            "Token 速率",
+            "每分钟最多消耗的 Token 数",
+            self.apiGroup
+        )
+        self.tokenRateSpinBox = qfw.SpinBox(self.tokenRateCard)
+        self.tokenRateSpinBox.setRange(*cfg.tokens_per_minute.range)
+        self.tokenRateSpinBox.setSingleStep(1000)
+        self.tokenRateSpinBox.setValue(cfg.tokens_per_minute.value)
+        self.tokenRateSpinBox.setFixedWidth(200)
+        self.tokenRateCard.hBoxLayout.addWidget(self.tokenRateSpinBox)
+        self.tokenRateCard.hBoxLayout.addSpacing(16)
+
         self.__connectSignalToSlot()
 
         self.apiGroup.addSettingCard(self.baseUrlCard)
         self.apiGroup.addSettingCard(self.modelNameCard)
         self.apiGroup.addSettingCard(self.apiKeyCard)
+        self.apiGroup.addSettingCard(self.rateCard)
+        self.apiGroup.addSettingCard(self.tokenRateCard)
 
         self.vBoxLayout.addWidget(self.apiGroup)
 
@@ -77,6 +108,16 @@ class SettingInterface(qfw.ScrollArea):
         )
         self.themeCard.optionChanged.connect(lambda: qfw.setTheme(cfg.theme.value))
         self.personalGroup.addSettingCard(self.themeCard)
+
+        self.workspaceCard = qfw.PushSettingCard(
+            "选择文件夹",
+            qfw.FluentIcon.FOLDER,
+            "工作区目录",
+            cfg.workspace_folder.value,
+            self.personalGroup
+        )
+        self.workspaceCard.clicked.connect(self.__chooseWorkspaceFolder)
+        self.personalGroup.addSettingCard(self.workspaceCard)
         self.vBoxLayout.addWidget(self.personalGroup)
 
         self.hyperlinkGroup = qfw.SettingCardGroup("快捷方式", self.scrollWidget)
@@ -107,9 +148,30 @@ class SettingInterface(qfw.ScrollArea):
         self.baseUrlEdit.editingFinished.connect(self.__saveApiConfig)
         self.modelNameEdit.editingFinished.connect(self.__saveApiConfig)
         self.apiKeyEdit.editingFinished.connect(self.__saveApiConfig)
+        self.rateSpinBox.editingFinished.connect(self.__saveApiConfig)
+        self.tokenRateSpinBox.editingFinished.connect(self.__saveApiConfig)
+
+    def __chooseWorkspaceFolder(self) -> None:
+        folder = QFileDialog.getExistingDirectory(self, "选择工作区目录", resolvePath(cfg.workspace_folder.value))
+        if not folder or folder == cfg.workspace_folder.value:
+            return
+
+        cfg.set(cfg.workspace_folder, folder)
+        self.workspaceCard.setContent(folder)
+        qfw.InfoBar.success(
+            title="已保存",
+            content="重启应用后生效",
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            duration=2000,
+            position=qfw.InfoBarPosition.TOP_RIGHT,
+            parent=self
+        )
 
     def __saveApiConfig(self) -> None:
         cfg.set(cfg.base_url, self.baseUrlEdit.text())
         cfg.set(cfg.model_name, self.modelNameEdit.text())
         cfg.set(cfg.api_key, self.apiKeyEdit.text())
+        cfg.set(cfg.requests_per_second, self.rateSpinBox.value())
+        cfg.set(cfg.tokens_per_minute, self.tokenRateSpinBox.value())
         cfg.save()
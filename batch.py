@@ -0,0 +1,139 @@
+import os
+import re
+import sys
+import json
+import queue
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from app.common.application_info import (
+    applicationInfo, developmentInfo, checkApplicationInfo, checkDevelopmentInfo, writeInfoFile,
+    APPLICATION_INFO_FILE, DEVELOPMENT_INFO_FILE, CODE_MATERIAL_FILE
+)
+from app.common.classifier import classifyProject
+from app.common.code_material import generateCodeMaterial
+
+PROGRESS_STEP = 10
+
+# characters Windows refuses in file names, plus both path separators
+_unsafeNameRe = re.compile(r'[\x00-\x1f<>:"/\\|?*]+')
+
+DEFAULTS = {
+    "权利取得方式": "原始取得",
+    "软件简称": "",
+    "版本号": "V1.0",
+    "权利范围": "全部权利",
+    "软件说明": "原创",
+    "开发方式": "单独开发",
+    "开发完成日期": "",
+    "发表状态": "未发表",
+    "著作权人": "",
+}
+
+
+def loadManifest(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if isinstance(manifest, list):
+        manifest = {"projects": manifest}
+    baseDir = os.path.dirname(os.path.abspath(path))
+    defaults = dict(DEFAULTS, **manifest.get("defaults", {}))
+
+    projects = []
+    for project in manifest["projects"]:
+        project = dict(defaults, **project)
+        if project.get("源代码"):
+            project["源代码"] = os.path.join(baseDir, project["源代码"])
+        projects.append(project)
+    return projects
+
+
+def packageDirName(index: int, name: str, version: str) -> str:
+    """ Folder name of one package, numbered so rows with the same name never share a folder """
+    parts = [_unsafeNameRe.sub("_", part).strip(" ._") for part in (name, version)]
+    return "_".join([f"{index:03d}"] + [part for part in parts if part])
+
+
+def buildPackage(project: dict, outputRoot: str, index: int, material: bool = True, events=None) -> str:
+    name = project.get("软件全称", "")
+
+    def report(stage: str) -> None:
+        if events is not None:
+            events.put((name, stage))
+
+    appInfo = applicationInfo(
+        project["权利取得方式"], name, project["软件简称"], project["版本号"], project["权利范围"])
+    devInfo = developmentInfo(
+        project.get("软件分类", ""), project["软件说明"], project["开发方式"],
+        project["开发完成日期"], project["发表状态"], project["著作权人"])
+    errors = checkApplicationInfo(appInfo) + checkDevelopmentInfo(devInfo)
+    source = project.get("源代码")
+    if material and (not source or not os.path.isdir(source)):
+        errors.append(f"源代码目录不存在：{source}")
+    if errors:
+        raise ValueError(" ".join(errors))
+
+    outputDir = os.path.join(outputRoot, packageDirName(index, name, appInfo["版本号"]))
+    os.makedirs(outputDir, exist_ok=True)
+    writeInfoFile(outputDir, APPLICATION_INFO_FILE, appInfo)
+    writeInfoFile(outputDir, DEVELOPMENT_INFO_FILE, devInfo)
+    report("信息已写入")
+
+    if material:
+        generateCodeMaterial(
+            source,
+            os.path.join(outputDir, CODE_MATERIAL_FILE),
+            f"{name} {appInfo['版本号']}",
+            classifyProject(source),
+            progress=lambda page: page % PROGRESS_STEP == 0 and report(f"程序鉴别材料 {page} 页")
+        )
+    report("完成")
+    return outputDir
+
+
+def run(projects: list, outputRoot: str, workers: int = None, material: bool = True) -> int:
+    failures = 0
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(workers) as pool:
+        events = manager.Queue()
+        futures = {
+            pool.submit(buildPackage, project, outputRoot, index, material, events): project.get("软件全称", "")
+            for index, project in enumerate(projects, 1)
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            try:
+                while True:
+                    name, stage = events.get_nowait()
+                    print(f"[{name}] {stage}", flush=True)
+            except queue.Empty:
+                pass
+            for future in done:
+                name = futures[future]
+                try:
+                    print(f"[{name}] 输出：{future.result()}", flush=True)
+                except Exception as e:
+                    failures += 1
+                    print(f"[{name}] 失败：{e}", file=sys.stderr, flush=True)
+
+    print(f"共 {len(projects)} 个项目，成功 {len(projects) - failures} 个，失败 {failures} 个")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="批量生成软件著作权申请材料")
+    parser.add_argument("manifest", help="项目清单 JSON 文件")
+    parser.add_argument("-o", "--output", default=".", help="输出目录，每个项目生成一个以序号、软件全称和版本号命名的子目录")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="并行进程数，默认为 CPU 核数")
+    parser.add_argument("--no-material", action="store_true", help="不生成程序鉴别材料")
+    args = parser.parse_args()
+
+    projects = loadManifest(args.manifest)
+    return 1 if run(projects, args.output, args.workers, not args.no_material) else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import os
+import re
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_MODULE = "app.view.main_window"
+DEFERRED_PREFIXES = ("pygments", "qfluentwidgets.multimedia", "PyQt6.QtMultimedia", "app.common.highlighter")
+LINE_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def collect(module: str = STARTUP_MODULE) -> list:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True)
+
+    records = []
+    for line in process.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            selfTime, cumulative, indent, name = match.groups()
+            records.append({
+                "module": name,
+                "self_us": int(selfTime),
+                "cumulative_us": int(cumulative),
+                "depth": len(indent) // 2,
+            })
+    return records
+
+
+def summarize(records: list, top: int = 20) -> dict:
+    topLevel = [r for r in records if r["depth"] == 0]
+    return {
+        "total_ms": round(sum(r["cumulative_us"] for r in topLevel) / 1000, 1),
+        "module_count": len(records),
+        "top_cumulative": [
+            {"module": r["module"], "ms": round(r["cumulative_us"] / 1000, 1)}
+            for r in sorted(records, key=lambda r: -r["cumulative_us"])[:top]
+        ],
+        "deferred_violations": sorted({r["module"] for r in records if r["module"].startswith(DEFERRED_PREFIXES)}),
+    }
+
+
+if __name__ == "__main__":
+    report = summarize(collect(sys.argv[1] if len(sys.argv) > 1 else STARTUP_MODULE))
+    print(json.dumps(report, indent=4))
+    sys.exit(1 if report["deferred_violations"] else 0)
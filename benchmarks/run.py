@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.chdir(ROOT)
+
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtGui import QImage, QColor
+from PyQt6.QtWidgets import QApplication
+
+from app.common import thumbnail
+
+import scroll_frames
+from synthetic import generateRepo
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+REPO_SIZES = (1000, 10000, 100000)
+TIMEOUT = 120
+INDEX_TIMEOUT = 900
+
+
+def waitUntil(app: QApplication, condition, timeout: float = TIMEOUT) -> float:
+    start = time.perf_counter()
+    while not condition():
+        app.processEvents()
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("benchmark step timed out")
+        time.sleep(0.0005)
+    return (time.perf_counter() - start) * 1000
+
+
+def benchStartup(runs: int = 3) -> dict:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.join(BENCH_DIR, "startup.py")],
+            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        # qfluentwidgets prints a banner on import, the report is the JSON object that follows it
+        samples.append(json.loads(output[output.index("{"):])["first_paint_ms"])
+    return {"startup.first_paint_ms": min(samples)}
+
+
+def benchPageSwitch(app: QApplication, window) -> dict:
+    home = window.homeInterface
+    results = {}
+    for label in ("first", "revisit"):
+        start = time.perf_counter()
+        for index in range(len(home.route_keys)):
+            home.setCurrentPage(index)
+            app.processEvents()
+        results[f"home.page_switch_{label}_ms"] = round((time.perf_counter() - start) * 1000 / len(home.route_keys), 3)
+    home.setCurrentPage(0)
+    return results
+
+
+def benchTree(app: QApplication, window, workDir: str, sizes=REPO_SIZES) -> dict:
+    codeInterface = window.codeInterface.interface()
+    results = {}
+    for size in sizes:
+        repo = generateRepo(os.path.join(workDir, f"repo_{size}"), size)
+        start = time.perf_counter()
+        codeInterface.currentRootPath = repo
+        codeInterface._populateTree(repo)
+        waitUntil(app, lambda: not codeInterface._scanTasks)
+        results[f"tree.first_level_{size}_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        start = time.perf_counter()
+        for i in range(codeInterface.treeWidget.topLevelItemCount()):
+            codeInterface.treeWidget.topLevelItem(i).setExpanded(True)
+        waitUntil(app, lambda: not codeInterface._scanTasks)
+        results[f"tree.expand_top_{size}_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        # indexing keeps a worker busy long after the tree is shown; let it finish so it does not
+        # slow down the next size or the preview and scroll benchmarks
+        waitUntil(app, lambda: codeInterface._indexTask is None, INDEX_TIMEOUT)
+        QThreadPool.globalInstance().waitForDone()
+    return results
+
+
+def benchPreview(app: QApplication, window, workDir: str) -> dict:
+    detail = window.codeInterface.interface().fileDetailStackWidget
+
+    textPath = os.path.join(ROOT, "app", "view", "custom_widget.py")
+    imagePath = os.path.join(workDir, "photo.jpg")
+    if not os.path.exists(imagePath):
+        image = QImage(6000, 4000, QImage.Format.Format_RGB32)
+        image.fill(QColor(80, 120, 160))
+        image.save(imagePath, "JPG")
+    largePath = os.path.join(workDir, "large.log")
+    if not os.path.exists(largePath):
+        with open(largePath, "w", encoding="utf-8") as f:
+            for i in range(1_500_000):
+                f.write(f"2026-01-01 00:00:{i % 60:02d} INFO request {i} served in {i % 997} ms\n")
+
+    # an empty thumbnail cache, otherwise the cold image sample is a hit from an earlier run
+    thumbnailDir = thumbnail.THUMBNAIL_DIR
+    thumbnail.THUMBNAIL_DIR = tempfile.mkdtemp(dir=workDir)
+    results = {}
+    try:
+        for name, path in (("text", textPath), ("image", imagePath), ("large_file", largePath)):
+            for label in ("cold", "warm"):
+                start = time.perf_counter()
+                detail.updateFile(path)
+                waitUntil(app, lambda: detail.previewTask is None)
+                results[f"preview.{name}_{label}_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                detail.updateFile(ROOT)
+    finally:
+        shutil.rmtree(thumbnail.THUMBNAIL_DIR, ignore_errors=True)
+        thumbnail.THUMBNAIL_DIR = thumbnailDir
+    return results
+
+
+def benchScroll(app: QApplication, window) -> dict:
+    page = window.homeInterface.page("features")
+    window.homeInterface.stackedWidget.setCurrentWidget(page)
+    app.processEvents()
+    scroll_frames.measureScroll(page, 10)
+    summary = scroll_frames.summarize(scroll_frames.measureScroll(page))
+    window.homeInterface.setCurrentPage(0)
+    return {f"scroll.features_{key}": value for key, value in summary.items()}
+
+
+def runAll(sizes=REPO_SIZES) -> dict:
+    results = benchStartup()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    from app.view.main_window import MainWindow
+
+    window = MainWindow()
+    window.resize(960, 640)
+    window.show()
+    app.processEvents()
+
+    workDir = os.path.join(tempfile.gettempdir(), "software-benchmarks")
+    os.makedirs(workDir, exist_ok=True)
+
+    results.update(benchPageSwitch(app, window))
+    results.update(benchTree(app, window, workDir, sizes))
+    results.update(benchPreview(app, window, workDir))
+    results.update(benchScroll(app, window))
+
+    window.close()
+    # previews and scans started by the benchmarks may still be running
+    QThreadPool.globalInstance().waitForDone()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for key, value in sorted(results.items()):
+        reference = baseline.get(key)
+        if reference and value > reference * (1 + tolerance):
+            regressions.append({"metric": key, "baseline": reference, "current": value,
+                                "change": f"{(value / reference - 1) * 100:+.1f}%"})
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless startup and interaction benchmarks")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a metric is reported")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(REPO_SIZES), help="synthetic repository sizes")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": runAll(args.sizes),
+    }
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    elif not args.update_baseline:
+        print(f"baseline not found: {args.baseline} (run with --update-baseline to create it)", file=sys.stderr)
+    report["regressions"] = compare(report["results"], baseline or {}, args.tolerance)
+
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({key: report[key] for key in ("python", "platform", "results")}, f, indent=4)
+
+    if args.update_baseline:
+        return 0
+    if baseline is None:
+        return 2
+    missing = sorted(set(baseline) - set(report["results"]))
+    if missing:
+        print(f"metrics missing from this run: {', '.join(missing)}", file=sys.stderr)
+    return 1 if report["regressions"] or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
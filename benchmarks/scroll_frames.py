@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+
+def measureScroll(page, frames: int = 120) -> list:
+    scrollBar = page.scrollArea.verticalScrollBar()
+    step = max(1, scrollBar.maximum() // frames)
+    times = []
+    for i in range(frames):
+        scrollBar.setValue((i * step) % (scrollBar.maximum() + 1))
+        start = time.perf_counter()
+        page.repaint()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summarize(times: list) -> dict:
+    times = sorted(times)
+    return {
+        "mean_ms": round(statistics.fmean(times), 3),
+        "p50_ms": round(times[len(times) // 2], 3),
+        "p95_ms": round(times[int(len(times) * 0.95) - 1], 3),
+    }
+
+
+def compareCache(page, rounds: int = 6, frames: int = 120) -> dict:
+    """ Alternates cache-off and cache-on rounds so drift affects both sides equally """
+    from app.view.custom_widget import CardChromeCache
+
+    samples = {False: [], True: []}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            CardChromeCache.enabled = enabled
+            measureScroll(page, 10)
+            samples[enabled].extend(measureScroll(page, frames))
+    CardChromeCache.enabled = True
+    return {"uncached": summarize(samples[False]), "cached": summarize(samples[True])}
+
+
+def main() -> dict:
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from app.view.main_window import MainWindow
+
+    window = MainWindow()
+    window.resize(960, 640)
+    window.show()
+    page = window.homeInterface.page("features")
+    window.homeInterface.stackedWidget.setCurrentWidget(page)
+    app.processEvents()
+
+    results = compareCache(page)
+    window.close()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=4))
@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import time
+import statistics
+import subprocess
+
+START = time.perf_counter()
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QObject, QEvent
+from PyQt6.QtWidgets import QApplication
+
+
+class FirstPaintFilter(QObject):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.paintedAt = None
+
+    def eventFilter(self, obj, event) -> bool:
+        if self.paintedAt is None and event.type() == QEvent.Type.Paint:
+            self.paintedAt = time.perf_counter()
+        return False
+
+
+def main(eager: bool = False) -> dict:
+    app = QApplication.instance() or QApplication(sys.argv)
+    imported = time.perf_counter()
+
+    from app.view.main_window import MainWindow
+
+    window = MainWindow()
+    if eager:
+        for interface in (window.manualInterface, window.codeInterface, window.settingInterface):
+            interface.interface()
+        for key in window.homeInterface.route_keys:
+            window.homeInterface.page(key)
+    constructed = time.perf_counter()
+
+    paintFilter = FirstPaintFilter()
+    window.installEventFilter(paintFilter)
+    window.show()
+    while paintFilter.paintedAt is None:
+        app.processEvents()
+
+    window.close()
+    return {
+        "mode": "eager" if eager else "lazy",
+        "qt_init_ms": round((imported - START) * 1000, 1),
+        "construct_ms": round((constructed - imported) * 1000, 1),
+        "first_paint_ms": round((paintFilter.paintedAt - START) * 1000, 1),
+    }
+
+
+def compare(runs: int) -> dict:
+    """ Runs both modes in fresh processes, alternating, and reports the median of each metric """
+    samples = {"lazy": [], "eager": []}
+    for _ in range(runs):
+        for mode in samples:
+            command = [sys.executable, os.path.abspath(__file__)] + (["--eager"] if mode == "eager" else [])
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            # qfluentwidgets prints a banner on import, the report is the JSON object that follows it
+            samples[mode].append(json.loads(output[output.index("{"):]))
+
+    return {
+        mode: {key: statistics.median(sample[key] for sample in results) for key in results[0] if key != "mode"}
+        for mode, results in samples.items()
+    }
+
+
+if __name__ == "__main__":
+    if "--compare" in sys.argv:
+        print(json.dumps(compare(int(sys.argv[sys.argv.index("--compare") + 1])), indent=4))
+    else:
+        print(json.dumps(main("--eager" in sys.argv), indent=4))
@@ -0,0 +1,35 @@
+import os
+
+SOURCE = '''import os
+
+
+def handler_{index}(path: str) -> int:
+    # synthetic benchmark file
+    total = 0
+    for name in os.listdir(path):
+        total += len(name)
+    return total
+'''
+
+
+def generateRepo(root: str, fileCount: int, filesPerDir: int = 40, dirsPerDir: int = 8) -> str:
+    marker = os.path.join(root, f".synthetic-{fileCount}")
+    if os.path.exists(marker):
+        return root
+
+    os.makedirs(root, exist_ok=True)
+    pending = [root]
+    created = 0
+    while created < fileCount:
+        current = pending.pop(0)
+        for i in range(min(filesPerDir, fileCount - created)):
+            with open(os.path.join(current, f"module_{i}.py"), "w", encoding="utf-8") as f:
+                f.write(SOURCE.format(index=created))
+            created += 1
+        for i in range(dirsPerDir if created < fileCount else 0):
+            child = os.path.join(current, f"package_{i}")
+            os.makedirs(child, exist_ok=True)
+            pending.append(child)
+
+    open(marker, "w").close()
+    return root
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 
 from PyQt6.QtWidgets import QApplication
 
@@ -6,6 +7,7 @@ from app.view.main_window import MainWindow
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,35 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from batch import buildPackage, loadManifest, packageDirName
+
+
+class PackageDirTest(unittest.TestCase):
+
+    def testNameIsSanitized(self) -> None:
+        self.assertEqual(packageDirName(1, "../客户端/服务端", "V1.0"), "001_客户端_服务端_V1.0")
+        self.assertEqual(packageDirName(12, 'a:b*c?"', " V2 "), "012_a_b_c_V2")
+        self.assertEqual(packageDirName(3, "", ""), "003")
+
+    def testSameNameGetsSeparateFolders(self) -> None:
+        outputRoot = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outputRoot, ignore_errors=True)
+        manifest = os.path.join(outputRoot, "manifest.json")
+        with open(manifest, "w", encoding="utf-8") as f:
+            f.write('[{"软件全称": "测试/软件", "开发完成日期": "2026-01-01", "软件分类": "应用软件", "著作权人": "甲"},'
+                    ' {"软件全称": "测试/软件", "开发完成日期": "2026-01-01", "软件分类": "应用软件", "著作权人": "乙"}]')
+
+        outputDirs = [
+            buildPackage(project, outputRoot, index, material=False)
+            for index, project in enumerate(loadManifest(manifest), 1)
+        ]
+        self.assertEqual(len(set(outputDirs)), 2)
+        for outputDir in outputDirs:
+            self.assertEqual(os.path.dirname(outputDir), outputRoot)
+            self.assertTrue(os.listdir(outputDir))
+
+
+if __name__ == "__main__":
+    unittest.main()
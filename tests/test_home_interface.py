@@ -0,0 +1,76 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from app.common.config import cfg
+from app.view.main_window import MainWindow
+
+
+class SoftwareFeaturesTest(unittest.TestCase):
+    """ Drives the features page slots that work on the opened project """
+
+    def setUp(self) -> None:
+        self.tmpDir = tempfile.mkdtemp()
+        self.project = os.path.join(self.tmpDir, "project")
+        os.makedirs(os.path.join(self.project, "pkg"))
+        with open(os.path.join(self.project, "pkg", "main.py"), "w", encoding="utf-8") as f:
+            f.write("# entry point\n\n" + "".join(f"value{i} = {i}\n" for i in range(200)))
+
+        self.workspaceFolder = cfg.workspace_folder.value
+        cfg.workspace_folder.value = os.path.join(self.tmpDir, "workspaces")
+        self.window = MainWindow()
+        self.home = self.window.homeInterface
+        self.home.openApplication(self.home.workspace.create())
+
+        codeInterface = self.window.codeInterface.interface()
+        codeInterface.currentRootPath = self.project
+        codeInterface._populateTree(self.project)
+        self.wait()
+        self.page = self.home.page("features")
+
+    def tearDown(self) -> None:
+        self.wait()
+        self.home.closeWorkspace()
+        self.window.deleteLater()
+        app.processEvents()
+        cfg.workspace_folder.value = self.workspaceFolder
+        shutil.rmtree(self.tmpDir, ignore_errors=True)
+
+    def wait(self) -> None:
+        QThreadPool.globalInstance().waitForDone()
+        app.processEvents()
+
+    def testCountCodeLines(self) -> None:
+        self.window.codeInterface.instance.lineSummary = None
+        self.page.countCodeLines()
+        self.wait()
+        self.assertEqual(self.page.codeLineEdit.text(), "202")
+
+    def testGenerateCodeMaterial(self) -> None:
+        self.page.generateCodeMaterial()
+        self.wait()
+        self.assertEqual(len(self.page.codeIdentifyCard.fileLayoutContent), 1)
+        self.assertTrue(os.path.isfile(self.page.codeIdentifyCard.fileLayoutContent[0]))
+
+    def testFeatureTagsSurviveReopening(self) -> None:
+        appId = self.home.applicationId
+        self.page.featuresCard.tagButtons["教育软件"].setChecked(True)
+        self.assertEqual(self.home.draftStore.get("features")["featureTags"], ["教育软件"])
+
+        self.home.closeApplication()
+        self.home.openApplication(appId)
+        card = self.home.page("features").featuresCard
+        self.assertEqual(card.checkedTags(), ["教育软件"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+import json
+import asyncio
+import unittest
+
+from app.common.field_filler import fillField, fillFields
+from app.common.llm_client import ChatClient, LLMError
+
+
+class StandInServer:
+    """ Local OpenAI-compatible endpoint that answers each request with a scripted response """
+
+    def __init__(self) -> None:
+        self.responses = []
+        self.requests = []
+        self.connections = 0
+        self.handlers = set()
+        self.server = None
+        self.port = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        # handlers simulating a stalled server never return on their own
+        for handler in self.handlers:
+            handler.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.handlers.add(asyncio.current_task())
+        try:
+            while True:
+                requestLine = await reader.readline()
+                if not requestLine:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append((requestLine.decode("latin-1").split()[1], headers, json.loads(body)))
+
+                respond = self.responses.pop(0)
+                if not await respond(writer):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def sse(tokens: list, delay: float = 0, stallAfter: int = None):
+    """ Streams tokens as chunked server-sent events, optionally stalling after some of them """
+    async def respond(writer: asyncio.StreamWriter) -> bool:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n")
+        events = [{"choices": [{"delta": {"content": token}}]} for token in tokens]
+        lines = [f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8") for event in events]
+        for i, line in enumerate(lines + [b"data: [DONE]\n\n"]):
+            if stallAfter is not None and i == stallAfter:
+                await writer.drain()
+                await asyncio.sleep(3600)
+            # split every event across two chunks to exercise reassembly
+            for part in (line[:7], line[7:]):
+                writer.write(b"%x\r\n%s\r\n" % (len(part), part))
+            await writer.drain()
+            if delay:
+                await asyncio.sleep(delay)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+    return respond
+
+
+def status(code: int, message: str, close: bool = False):
+    async def respond(writer: asyncio.StreamWriter) -> bool:
+        body = json.dumps({"error": {"message": message}}).encode("utf-8")
+        writer.write(
+            b"HTTP/1.1 %d Error\r\nContent-Type: application/json\r\nContent-Length: %d\r\n%s\r\n%s"
+            % (code, len(body), b"Connection: close\r\n" if close else b"", body))
+        await writer.drain()
+        return not close
+    return respond
+
+
+def completion(content: str):
+    async def respond(writer: asyncio.StreamWriter) -> bool:
+        body = json.dumps({"choices": [{"message": {"content": content}}]}, ensure_ascii=False).encode("utf-8")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        await writer.drain()
+        return True
+    return respond
+
+
+def hang():
+    async def respond(writer: asyncio.StreamWriter) -> bool:
+        await asyncio.sleep(3600)
+        return False
+    return respond
+
+
+def closeConnection():
+    async def respond(writer: asyncio.StreamWriter) -> bool:
+        return False
+    return respond
+
+
+class ChatClientTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.server = StandInServer()
+        await self.server.start()
+        self.client = ChatClient(self.server.url(), "sk-test", "test-model", timeout=1, idleTimeout=0.5)
+
+    async def asyncTearDown(self) -> None:
+        self.client.close()
+        await self.server.stop()
+
+    async def testStreamsTokens(self) -> None:
+        self.server.responses.append(sse(["你好", "，", "世界"]))
+        tokens = [token async for token in self.client.stream([{"role": "user", "content": "hi"}])]
+        self.assertEqual(tokens, ["你好", "，", "世界"])
+
+        path, headers, payload = self.server.requests[0]
+        self.assertEqual(path, "/v1/chat/completions")
+        self.assertEqual(headers["authorization"], "Bearer sk-test")
+        self.assertEqual(payload["model"], "test-model")
+        self.assertTrue(payload["stream"])
+
+    async def testReusesKeepAliveConnection(self) -> None:
+        self.server.responses += [sse(["a"]), completion("b"), sse(["c"])]
+        self.assertEqual(await self.client.complete([]), "a")
+        self.assertEqual(await self.client.complete([]), "b")
+        self.assertEqual(await self.client.complete([]), "c")
+        self.assertEqual(self.server.connections, 1)
+
+    async def testReconnectsWhenIdleConnectionWasDropped(self) -> None:
+        self.server.responses += [sse(["a"]), closeConnection(), sse(["b"])]
+        self.assertEqual(await self.client.complete([]), "a")
+        self.assertEqual(await self.client.complete([]), "b")
+        self.assertEqual(self.server.connections, 2)
+
+    async def testErrorStatusRaisesAndKeepsConnection(self) -> None:
+        self.server.responses += [status(429, "rate limited"), sse(["ok"])]
+        with self.assertRaises(LLMError) as context:
+            await self.client.complete([])
+        self.assertEqual(context.exception.status, 429)
+        self.assertIn("rate limited", context.exception.message)
+
+        self.assertEqual(await self.client.complete([]), "ok")
+        self.assertEqual(self.server.connections, 1)
+
+    async def testServerErrorWithConnectionClose(self) -> None:
+        self.server.responses += [status(503, "overloaded", close=True), sse(["ok"])]
+        with self.assertRaises(LLMError) as context:
+            await self.client.complete([])
+        self.assertEqual(context.exception.status, 503)
+        self.assertEqual(await self.client.complete([]), "ok")
+        self.assertEqual(self.server.connections, 2)
+
+    async def testTimesOutWaitingForResponseHead(self) -> None:
+        self.server.responses.append(hang())
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.client.complete([])
+
+    async def testTimesOutWhenStreamStalls(self) -> None:
+        self.server.responses += [sse(["a", "b", "c"], stallAfter=2), sse(["ok"])]
+        tokens = []
+        with self.assertRaises(asyncio.TimeoutError):
+            async for token in self.client.stream([]):
+                tokens.append(token)
+        self.assertEqual(tokens, ["a", "b"])
+
+        # the stalled connection must not be handed out again
+        self.assertEqual(await self.client.complete([]), "ok")
+        self.assertEqual(self.server.connections, 2)
+
+    async def testSlowButSteadyStreamIsNotCutOff(self) -> None:
+        self.server.responses.append(sse(["a", "b", "c", "d"], delay=0.3))
+        self.assertEqual(await self.client.complete([]), "abcd")
+
+    async def testFillFieldAndBatch(self) -> None:
+        self.server.responses += [
+            sse(["  Python", "、Qt  "]),
+            completion('说明如下：{"devOS": "Windows 11", "devTarget": "  生成材料 "}'),
+        ]
+        received = []
+        text = await fillField(self.client, "devLanguage", {"软件全称": "测试软件"}, lambda *args: received.append(args))
+        self.assertEqual(text, "Python、Qt")
+        self.assertEqual(received, [("devLanguage", "  Python"), ("devLanguage", "、Qt  ")])
+
+        filled = await fillFields(self.client, ["devOS", "devTarget", "features"], {"软件全称": "测试软件"})
+        self.assertEqual(filled, {"devOS": "Windows 11", "devTarget": "生成材料"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from app.common.pdf_reader import countPages, prepareMaterial
+from app.common.pdf_writer import PdfWriter
+
+
+def writePdf(path: str, pages: int) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        writer = PdfWriter(f)
+        for number in range(1, pages + 1):
+            writer.addPage([f"line on page {number}"], "title", str(number))
+        writer.close()
+
+
+class PrepareMaterialTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmpDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpDir, ignore_errors=True)
+        self.outputDir = os.path.join(self.tmpDir, "materials")
+
+    def testShortDocumentIsUsedAsIs(self) -> None:
+        source = os.path.join(self.tmpDir, "a", "doc.pdf")
+        writePdf(source, 4)
+        self.assertEqual(prepareMaterial(source, 2, self.outputDir), (source, 4, 4))
+        self.assertFalse(os.path.exists(self.outputDir))
+
+    def testTrimmedCopyGoesToOutputDir(self) -> None:
+        source = os.path.join(self.tmpDir, "a", "doc.pdf")
+        writePdf(source, 10)
+        path, pages, originalPages = prepareMaterial(source, 2, self.outputDir)
+        self.assertEqual(os.path.dirname(path), self.outputDir)
+        self.assertEqual((pages, originalPages, countPages(path)), (4, 10, 4))
+        self.assertEqual(os.listdir(os.path.dirname(source)), ["doc.pdf"])
+
+    def testSameNameFromDifferentFoldersDoesNotCollide(self) -> None:
+        first = os.path.join(self.tmpDir, "a", "doc.pdf")
+        second = os.path.join(self.tmpDir, "b", "doc.pdf")
+        writePdf(first, 10)
+        writePdf(second, 12)
+        firstPath = prepareMaterial(first, 2, self.outputDir)[0]
+        secondPath = prepareMaterial(second, 2, self.outputDir)[0]
+        self.assertNotEqual(firstPath, secondPath)
+        self.assertEqual(len(os.listdir(self.outputDir)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()